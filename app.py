@@ -1,133 +1,105 @@
 import streamlit as st
 import os
 import time
-import cv2
-import numpy as np
-from deepface import DeepFace
-import firebase_admin
-from firebase_admin import credentials, firestore
-import cohere
-import base64
-import pandas as pd
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from PIL import Image
-import pyautogui
+from contextlib import closing
 from datetime import datetime
-import plotly.graph_objects as go
-import plotly.express as px
-import pytz
+from sheets_sync import CandidateSync, iter_profile_pages
+from clients import get_firestore, get_sheets_service
+from candidate_index import CandidateIndex
+from snapshot_store import load_snapshot
+from reports import build_summary, render_summary_pdf, report_filename
+from question_cache import get_question_cache, question_signature
+from question_prefetch import get_question_prefetcher
+from llm_stream import stream_metrics
+from llm_backends import get_llm_backend
+from prompts import interview_questions_prompt, parse_interview_questions
 
 
+# Must be set before TensorFlow is first imported by DeepFace
 os.environ["TF_ENABLE_ONEDNN_OPTS"] = "0"
 
+# OpenCV, NumPy, Plotly and pytz (and DeepFace/TensorFlow for emotion detection) are
+# imported inside the code paths that use them, so the main dashboard renders without
+# paying for them on a cold start. See benchmarks/bench_import_time.py.
+
 
 # Initialize session state variables
 if "page" not in st.session_state:
     st.session_state["page"] = "main"
 if "candidates" not in st.session_state:
     st.session_state["candidates"] = []
+if "candidate_index" not in st.session_state:
+    st.session_state["candidate_index"] = CandidateIndex()
 if "recording_in_progress" not in st.session_state:
     st.session_state["recording_in_progress"] = False
 if "emotion_data" not in st.session_state:
-    st.session_state["emotion_data"] = []
+    # Columnar store of the emotion samples, appended to like the list it replaces
+    from emotion_series import EmotionSeries
+    st.session_state["emotion_data"] = EmotionSeries()
+
+
+# Firebase Initialization (the client is built once per process and reused on every rerun)
+FIREBASE_CREDENTIALS = (
+    # r"C:\Users\aadik\OneDrive\Documents\Desktop\finalhari.py\codewHari.py\assessai-44afc-firebase-adminsdk-fbsvc-4e13d0986d.json"
+     r"C:\Users\ROSHAN\Downloads\assessai-44afc-firebase-adminsdk-fbsvc-4e13d0986d.json"
+)  # Replace with your Firebase credentials path
+db = get_firestore(FIREBASE_CREDENTIALS)
 
 
-# Firebase Initialization
-if not firebase_admin._apps:
-    cred = credentials.Certificate(
-        # r"C:\Users\aadik\OneDrive\Documents\Desktop\finalhari.py\codewHari.py\assessai-44afc-firebase-adminsdk-fbsvc-4e13d0986d.json"
-         r"C:\Users\ROSHAN\Downloads\assessai-44afc-firebase-adminsdk-fbsvc-4e13d0986d.json"
-    )  # Replace with your Firebase credentials path
-    firebase_admin.initialize_app(cred)
-db = firestore.client()
+# Number of parallel Firestore batch commits used when syncing candidates
+SYNC_WORKERS = 4
 
+# Concurrent LLM requests used to prepare questions for synced candidates
+QUESTION_WORKERS = 4
 
-# Initialize Cohere
-COHERE_API_KEY = st.secrets["cohere"]["api_key"]
-co = cohere.Client(COHERE_API_KEY)
+
+# Question generation backend: Cohere, or a local model when LLM_BACKEND
+# (or backend in the [llm] secrets section) is "local"
+llm_settings = dict(st.secrets.get("llm", {}))
+if "cohere" in st.secrets:
+    llm_settings.setdefault("api_key", st.secrets["cohere"]["api_key"])
+llm = get_llm_backend(llm_settings)
 
 
 # Google Sheets Integration
 def setup_google_sheets_api():
-    # Set up Google Sheets API connection using service account
-    credentials = service_account.Credentials.from_service_account_file(
+    # Set up Google Sheets API connection using service account, cached per process
+    return get_sheets_service(
         # r"C:\Users\aadik\OneDrive\Documents\Desktop\finalhari.py\codewHari.py\moonlit-haven-452014-i4-248bff09d735.json",
         # # Replace with your file path
-        'C:\\Users\\ROSHAN\\Downloads\\moonlit-haven-452014-i4-248bff09d735.json',
-        scopes=['https://www.googleapis.com/auth/spreadsheets.readonly']
+        'C:\\Users\\ROSHAN\\Downloads\\moonlit-haven-452014-i4-248bff09d735.json'
     )
-    service = build('sheets', 'v4', credentials=credentials)
-    return service
 
-def fetch_sheet_data(service, spreadsheet_id):
+def fetch_sheet_data(service, spreadsheet_id, incremental=True):
     """Fetch data from Google Sheets"""
     try:
-        # Get the first sheet
-        sheet_metadata = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-        sheet_name = sheet_metadata['sheets'][0]['properties']['title']
-        
-        # Get all values from the sheet
-        result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range=sheet_name
-        ).execute()
+        progress = st.sidebar.progress(0.0, text="Reading candidate sheet...")
+        live_status = st.sidebar.empty()
+        sync = CandidateSync(db, incremental=incremental, max_workers=SYNC_WORKERS)
         
-        rows = result.get('values', [])
+        # Read the sheet page by page, storing and showing candidates as they arrive
+        candidates = []
+        candidate_index = CandidateIndex()
+        st.session_state["candidates"] = candidates
+        st.session_state["candidate_index"] = candidate_index
+        prefetcher = question_prefetcher()
+        for profiles, rows_read, total_rows in iter_profile_pages(service, spreadsheet_id):
+            sync.add(profiles)
+            # Questions are generated in the background while the rest of the sheet is read
+            prefetcher.submit(profiles)
+            candidates.extend(profiles)
+            candidate_index.add(profiles)
+            progress.progress(min(rows_read / max(total_rows, 1), 1.0), text=f"Read {rows_read} of {total_rows} rows")
+            if candidates:
+                live_status.caption(f"{len(candidates)} candidates loaded, latest: {candidates[-1]['name']}")
         
-        if not rows:
+        progress.empty()
+        live_status.empty()
+        if not candidates:
             st.error("No data found in the spreadsheet.")
             return []
-            
-        # Assume first row is the header
-        headers = rows[0]
-        
-        # Create a list of candidates
-        candidates = []
-        for row in rows[1:]:  # Skip header row
-            # Extend row with empty strings if it's shorter than headers
-            row_data = row + [''] * (len(headers) - len(row))
-            
-            # Find the exact indices for each column
-            name_idx = headers.index("Name") if "Name" in headers else -1
-            email_idx = headers.index("Email") if "Email" in headers else -1
-            edu_idx = -1
-            for i, h in enumerate(headers):
-                if "Education" in h:
-                    edu_idx = i
-                    break
-            role_idx = -1
-            for i, h in enumerate(headers):
-                if "Job role" in h:
-                    role_idx = i
-                    break
-            skills_idx = -1
-            for i, h in enumerate(headers):
-                if "Skills" in h:
-                    skills_idx = i
-                    break
-            exp_idx = -1
-            for i, h in enumerate(headers):
-                if "Years" in h and "experience" in h:
-                    exp_idx = i
-                    break
-            
-            # Create profile using found indices
-            profile_data = {
-                "name": row_data[name_idx] if name_idx >= 0 and name_idx < len(row_data) else "Unknown",
-                "email": row_data[email_idx] if email_idx >= 0 and email_idx < len(row_data) else "Unknown",
-                "education": row_data[edu_idx] if edu_idx >= 0 and edu_idx < len(row_data) else "Unknown",
-                "role": row_data[role_idx] if role_idx >= 0 and role_idx < len(row_data) else "Unknown",
-                "skills": row_data[skills_idx] if skills_idx >= 0 and skills_idx < len(row_data) else "Unknown",
-                "experience": row_data[exp_idx] if exp_idx >= 0 and exp_idx < len(row_data) else "Unknown"
-            }
-            
-            # Only add candidates with a name
-            if profile_data["name"] and profile_data["name"] != "Unknown":
-                # Store in Firebase
-                db.collection("candidates").document(profile_data["name"]).set(profile_data)
-                candidates.append(profile_data)
         
+        st.session_state["sync_report"] = sync.finish()
         return candidates
     except Exception as e:
         st.error(f"Error fetching spreadsheet data: {str(e)}")
@@ -144,27 +116,143 @@ def extract_spreadsheet_id(sheet_url):
         return match.group(1)
     return None
 
-    # Save the image with the analysis
-    if processed_image is not None:
-        # Encode the image to base64 for storage
-        _, buffer = cv2.imencode('.jpg', processed_image)
-        analysis["image"] = base64.b64encode(buffer).decode("utf-8")
-    
-    return analysis
-
-def generate_interview_questions(profile):
+def generate_interview_questions(profile, generate=None):
+    """Questions for a profile, generate(profile) is only called when the cache has none for the candidate"""
     if not profile:
         return ["Please select a candidate profile first."]
-    prompt = f"Generate five interview questions for a candidate applying as {profile.get('role', 'N/A')} with {profile.get('experience', 'N/A')} years of experience and skills in {profile.get('skills', 'N/A')}."
-    response = co.generate(
-        model="command",
-        prompt=prompt,
-        max_tokens=150,
-        temperature=0.7
+    # Candidates with the same role, experience band and skills share a pool of generated question sets
+    questions = get_question_cache().get_or_generate(profile, generate or request_interview_questions)
+    if questions:
+        store_interview_questions(profile, questions)
+    return questions
+
+def store_interview_questions(profile, questions):
+    """Keep prepared questions on the candidate's Firestore document"""
+    db.collection("candidates").document(profile["name"]).set(
+        {"questions": questions, "questions_signature": question_signature(profile)}, merge=True
+    )
+
+def load_interview_questions(profile):
+    """Questions stored on the candidate's Firestore document, unless the profile changed since"""
+    doc = db.collection("candidates").document(profile["name"]).get()
+    data = (doc.to_dict() or {}) if doc.exists else {}
+    if data.get("questions_signature") == question_signature(profile):
+        return data.get("questions")
+    return None
+
+def question_prefetcher():
+    return get_question_prefetcher(
+        request_interview_questions,
+        cache=get_question_cache(),
+        store=store_interview_questions,
+        max_workers=QUESTION_WORKERS
+    )
+
+def request_interview_questions(profile):
+    """Ask the LLM backend for five new interview questions"""
+    text = llm.generate(interview_questions_prompt(profile), max_tokens=150, temperature=0.7)
+    return parse_interview_questions(text)
+
+def stream_interview_questions(profile):
+    """Text of five new interview questions, chunk by chunk as it is generated"""
+    return llm.stream(interview_questions_prompt(profile), max_tokens=150, temperature=0.7)
+
+def show_streamed_questions(profile):
+    """Generate questions on the page as they are written, the parsed list replaces the streamed text"""
+    slot = st.empty()
+    # Closing the stream when Streamlit stops this run (the user navigated away) ends the request
+    with slot.container(), closing(stream_interview_questions(profile)) as stream:
+        text = st.write_stream(stream)
+    slot.empty()
+    questions = parse_interview_questions(text)
+    last = stream_metrics()["last"]
+    if last and last["first_token_ms"] is not None:
+        st.caption(f"First words after {last['first_token_ms']:.0f} ms, complete after {last['total_ms'] / 1000:.1f} s")
+    return questions
+
+def create_emotion_timeline(emotion_data, window=None, max_points=None, notes=None):
+    """Build the stress and emotion timeline figures from the recorded samples
+
+    Each trace is downsampled to max_points, so the figures stay the same size
+    however long the interview ran. window limits them to a (start, end)
+    timestamp range, a narrow enough window shows every sample. notes are
+    (timestamp, text) pairs marked on the stress timeline.
+    """
+    import pandas as pd
+    import plotly.graph_objects as go
+    from emotion_analysis import EMOTIONS
+    from downsample import POINT_BUDGET, lttb_indices, minmax_indices
+    
+    max_points = max_points or POINT_BUDGET
+    # An EmotionSeries exports its columns without copying, plain lists are still accepted
+    if hasattr(emotion_data, "to_frame"):
+        timeline_df = emotion_data.to_frame()
+    else:
+        timeline_df = pd.DataFrame(emotion_data)
+    if not timeline_df['timestamp'].is_monotonic_increasing:
+        timeline_df = timeline_df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+    
+    view = timeline_df
+    if window is not None:
+        first = timeline_df['timestamp'].searchsorted(window[0], side='left')
+        last = timeline_df['timestamp'].searchsorted(window[1], side='right')
+        view = timeline_df.iloc[first:last]
+    times = pd.to_datetime(view['timestamp'], unit='s').to_numpy()
+    
+    # Min/max buckets keep every stress spike, LTTB keeps the shape of the intensity curves
+    stress = view['stress_value'].to_numpy()
+    kept = minmax_indices(stress, max_points)
+    stress_fig = go.Figure(go.Scatter(
+        x=times[kept],
+        y=stress[kept],
+        mode='lines+markers' if len(kept) == len(stress) else 'lines',
+        name='Stress',
+        line=dict(color='crimson')
+    ))
+    if notes:
+        shown = [(t, text) for t, text in notes if window is None or window[0] <= t <= window[1]]
+        stress_fig.add_trace(go.Scatter(
+            x=pd.to_datetime([t for t, _ in shown], unit='s'),
+            y=[3.3] * len(shown),
+            mode='markers',
+            name='Notes',
+            marker=dict(symbol='triangle-down', size=10, color='royalblue'),
+            hovertext=[text if len(text) <= 80 else text[:77] + '...' for _, text in shown],
+            hoverinfo='x+text'
+        ))
+    stress_fig.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=30, b=20),
+        yaxis=dict(range=[0.5, 3.5], tickvals=[1, 2, 3], ticktext=['Low', 'Medium', 'High'])
     )
-    questions = response.generations[0].text.strip().split("\n")
-    questions = [q.strip() for q in questions if q.strip()]
-    return questions[:5]
+    
+    emotion_fig = None
+    emotions = [e for e in EMOTIONS if e in view.columns]
+    if emotions:
+        traces = []
+        for e in emotions:
+            values = view[e].to_numpy()
+            kept = lttb_indices(values, max_points)
+            traces.append(go.Scatter(x=times[kept], y=values[kept], mode='lines', name=e.capitalize()))
+        emotion_fig = go.Figure(traces)
+        emotion_fig.update_layout(height=350, margin=dict(l=20, r=20, t=30, b=20), yaxis_title='Intensity (%)')
+    
+    return stress_fig, emotion_fig, timeline_df
+
+def cached_emotion_timeline(emotion_data, window=None, notes_cache=None):
+    """create_emotion_timeline memoised on the data version, zoom window and notes version
+
+    Slider moves and note edits rerun the page without new samples, so they
+    reuse the figures built on an earlier run.
+    """
+    notes_key = (id(notes_cache), notes_cache.version) if notes_cache is not None else None
+    key = (getattr(emotion_data, "uid", id(emotion_data)), getattr(emotion_data, "version", len(emotion_data)), window, notes_key)
+    cached = st.session_state.get("timeline_figures")
+    if cached is None or cached[0] != key:
+        notes = notes_cache.items() if notes_cache is not None else None
+        cached = (key, create_emotion_timeline(emotion_data, window, notes=notes))
+        st.session_state["timeline_figures"] = cached
+    return cached[1]
 
 # Navigation functions
 def navigate_to_main():
@@ -190,6 +278,12 @@ sheet_url = st.sidebar.text_input(
     help="URL of the Google Sheet containing candidate information"
 )
 
+incremental_sync = st.sidebar.checkbox(
+    "Only sync changed profiles",
+    value=True,
+    help="Skip candidates whose sheet row has not changed since the last sync"
+)
+
 if st.sidebar.button("Sync Candidate Profiles"):
     if sheet_url:
         with st.spinner("Syncing profiles from Google Sheets..."):
@@ -201,10 +295,17 @@ if st.sidebar.button("Sync Candidate Profiles"):
                     st.sidebar.error("Invalid Google Sheets URL. Please check and try again.")
                 else:
                     service = setup_google_sheets_api()
-                    candidates = fetch_sheet_data(service, spreadsheet_id)
+                    candidates = fetch_sheet_data(service, spreadsheet_id, incremental=incremental_sync)
                     
                     if candidates:
                         st.sidebar.success(f"Successfully synced {len(candidates)} candidate profiles!")
+                        report = st.session_state.get("sync_report")
+                        if report:
+                            st.sidebar.caption(
+                                f"Added: {report['added']} | Updated: {report['updated']} | "
+                                f"Unchanged: {report['unchanged']} | "
+                                + (f"Removed: {report['removed']}" if report["removed"] else f"Missing from sheet: {report['missing']}")
+                            )
                         # Store the candidates in session state for display
                         st.session_state["candidates"] = candidates
                     else:
@@ -216,9 +317,16 @@ if st.sidebar.button("Sync Candidate Profiles"):
 
 # Display list of candidates
 st.sidebar.subheader("Available Candidates")
+candidate_index = st.session_state["candidate_index"]
 if st.session_state["candidates"]:
     
-    candidate_names = [candidate["name"] for candidate in st.session_state["candidates"] if candidate["name"] != "Unknown"]
+    search_query = st.sidebar.text_input("Search candidates", help="Filter by name, role or skills")
+    if search_query:
+        candidate_names = [candidate["name"] for candidate in candidate_index.search(search_query)]
+        if not candidate_names:
+            st.sidebar.info(f"No candidates match '{search_query}'.")
+    else:
+        candidate_names = candidate_index.names
     
     if candidate_names:
         selected_candidate = st.sidebar.selectbox(
@@ -227,7 +335,7 @@ if st.session_state["candidates"]:
             index=0
         )
         
-        selected_profile = next((c for c in st.session_state["candidates"] if c["name"] == selected_candidate), None)
+        selected_profile = candidate_index.get(selected_candidate)
         
         if selected_profile:
             st.session_state["current_profile"] = selected_profile
@@ -240,16 +348,47 @@ if st.session_state["candidates"]:
             st.sidebar.write(f"**Education:** {selected_profile.get('education', 'N/A')}")
             st.sidebar.write(f"**Skills:** {selected_profile.get('skills', 'N/A')}")
             st.sidebar.write(f"**Experience:** {selected_profile.get('experience', 'N/A')} years")
-    else:
+    elif not search_query:
         st.sidebar.info("No valid candidate names found in the data. Please check your Google Sheet format.")
 else:
     st.sidebar.info("No candidates synced yet. Click 'Sync Candidate Profiles' to fetch data from Google Sheets.")
 
+# A recording belongs to the candidate selected when it started, selecting someone else later does not move it.
+# Its samples go to the candidate's interview file for batch_reports.py as they are appended
+if "current_profile" in st.session_state and not st.session_state["recording_in_progress"] and len(st.session_state["emotion_data"]) == 0:
+    from emotion_series import interview_path
+    st.session_state["emotion_data"].candidate_name = st.session_state["current_profile"]["name"]
+    st.session_state["emotion_data"].record_to(interview_path(st.session_state["current_profile"]["name"]))
+
 # Main Page Content
 if st.session_state["page"] == "main":
     st.title("Expert/Neer to Peer Dashboard")
     
     # AI Interview Chatbot
+    profile = st.session_state.get("current_profile")
+    if profile:
+        st.subheader("Suggested Interview Questions")
+        prefetcher = question_prefetcher()
+        session_questions = st.session_state.setdefault("candidate_questions", {})
+        # Prefetched and session questions are both matched on the signature, an edited profile never shows the old set
+        question_key = (profile["name"], question_signature(profile))
+        questions = prefetcher.questions_for(profile) or session_questions.get(question_key)
+        if questions is None and question_key not in session_questions and prefetcher.status(profile["name"]) != "pending":
+            # Prepared by another app process or before a restart, read once per session
+            try:
+                questions = session_questions[question_key] = load_interview_questions(profile)
+            except Exception as e:
+                st.error(f"Error loading stored questions: {str(e)}")
+        if questions is None:
+            if prefetcher.status(profile["name"]) == "pending":
+                st.caption("Questions for this candidate are being prepared in the background.")
+            if st.button("Generate questions now"):
+                # Streams only when the candidate needs a new set, otherwise a cached one is listed at once
+                questions = generate_interview_questions(profile, show_streamed_questions)
+                if questions:
+                    session_questions[question_key] = questions
+        for question in questions or []:
+            st.markdown(question)
     
     # Digital Samba Video Conferencing Integration
     st.subheader("Video Interview Room")
@@ -275,6 +414,14 @@ if st.session_state["page"] == "main":
         st.warning("Please enter a valid meeting room link to start the video interview.")
     
 elif st.session_state["page"] == "analysis":
+    import plotly.graph_objects as go
+    import plotly.express as px
+    import pytz
+    from timeline_index import TimelineIndex
+    from emotion_series import DATA_DIR_IS_TEMPORARY
+    from report_charts import get_charts, prefetch_charts
+    from notes_cache import get_notes_cache
+    
     st.title("Video Analysis Dashboard")
     
     if not "emotion_data" in st.session_state or len(st.session_state["emotion_data"]) == 0:
@@ -282,8 +429,59 @@ elif st.session_state["page"] == "analysis":
         if st.button("Return to Interview Dashboard"):
             navigate_to_main()
     else:
+        # Live figures, kept up to date by EmotionSeries as samples arrive
+        interview_stats = st.session_state["emotion_data"].stats
+        current = interview_stats.current()
+        st.subheader("Current Stats")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Samples", interview_stats.count)
+        col2.metric("Average stress", f"{interview_stats.stress_sum / interview_stats.count:.2f}")
+        col3.metric(
+            f"Stress, last {current['window_s']}s",
+            f"{current['mean_stress']:.2f}" if current["count"] else "-",
+            f"{current['stress_peaks']} peaks",
+            delta_color="off"
+        )
+        col4.metric("Dominant emotion", interview_stats.dominant_emotion.capitalize())
+        
+        st.markdown("---")
+        
+        emotion_data = st.session_state["emotion_data"]
+        recorded_name = emotion_data.candidate_name
+        if DATA_DIR_IS_TEMPORARY:
+            st.caption("Interviews are recorded to the temp directory, set INTERVIEW_DATA_DIR to keep them for batch reports.")
+        if recorded_name:
+            # Draw the report charts in the background so the export button does not wait for them
+            prefetch_charts((recorded_name, emotion_data.uid, emotion_data.version), emotion_data)
+        
+        # Timestamp-sorted index over the samples, only new samples are added on each rerun
+        if "timeline_index" not in st.session_state:
+            st.session_state["timeline_index"] = TimelineIndex()
+        timeline = st.session_state["timeline_index"].sync(st.session_state["emotion_data"])
+        min_time, max_time = timeline.time_range()
+        
+        # Zooming into a stretch of the interview redraws it at full resolution
+        zoom_window = None
+        if min_time < max_time:
+            zoom_window = st.slider(
+                "Zoom timeline",
+                min_value=min_time,
+                max_value=max_time,
+                value=(min_time, max_time)
+            )
+            if zoom_window == (min_time, max_time):
+                zoom_window = None
+        
+        # All of the candidate's notes are read once per process, edits from other sessions arrive through its listener
+        notes_cache = None
+        if recorded_name:
+            try:
+                notes_cache = get_notes_cache(db, recorded_name)
+            except Exception as e:
+                st.error(f"Error loading notes: {str(e)}")
+        
         # Create timeline visualizations
-        stress_fig, emotion_fig, timeline_df = create_emotion_timeline(st.session_state["emotion_data"])
+        stress_fig, emotion_fig, _ = cached_emotion_timeline(st.session_state["emotion_data"], zoom_window, notes_cache)
         
         # Display the timeline visualization with spacing
         st.subheader("Stress Level Timeline")
@@ -298,7 +496,7 @@ elif st.session_state["page"] == "analysis":
             st.markdown("---")
         
         # Create a slider to navigate through the timeline
-        if 'timestamp' in timeline_df.columns and len(timeline_df) > 1:
+        if len(timeline) > 1 and min_time < max_time:
             st.subheader("Interview Timeline Navigator")
             
             # Convert Unix timestamps to IST
@@ -308,9 +506,6 @@ elif st.session_state["page"] == "analysis":
                 ist_time = utc_time.astimezone(ist_timezone)
                 return ist_time
 
-            min_time = int(timeline_df['timestamp'].min())
-            max_time = int(timeline_df['timestamp'].max())
-            
             # Get IST times for display
             min_time_ist = unix_to_ist(min_time)
             max_time_ist = unix_to_ist(max_time)
@@ -322,13 +517,21 @@ elif st.session_state["page"] == "analysis":
                 value=min_time
             )
             
-            # Find the closest data point
-            closest_point = timeline_df.iloc[(timeline_df['timestamp'] - selected_time).abs().argsort()[0]]
+            # Find the closest data point by binary search
+            closest_point = timeline.nearest(selected_time)
             
             # Display the data for this point with IST time
             selected_time_ist = unix_to_ist(selected_time)
             st.subheader(f"Analysis at {selected_time_ist.strftime('%H:%M:%S IST')}")
             
+            # Stress in the minute around this moment
+            window = timeline.window_stats(selected_time - 30, selected_time + 30)
+            if window["count"]:
+                st.caption(
+                    f"Surrounding minute: average stress {window['mean_stress']:.2f}, "
+                    f"{window['stress_peaks']} high-stress and {window['relaxed_moments']} relaxed samples"
+                )
+            
             st.markdown("---")
             
             col1, col2 = st.columns(2)
@@ -339,17 +542,13 @@ elif st.session_state["page"] == "analysis":
             
             with col1:
                 # Display the snapshot image if available with proper error handling
-                if "image" in closest_point and closest_point["image"]:
+                # Only the snapshot for the selected moment is read from the snapshot store,
+                # already a display-sized JPEG the browser shows without decoding it here
+                image_data = load_snapshot(closest_point)
+                if image_data:
                     try:
-                        image_data = base64.b64decode(closest_point["image"])
-                        image_array = np.frombuffer(image_data, np.uint8)
-                        image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
-                        if image is not None:
-                            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                            # FIXED LINE - replaced use_column_width with use_container_width
-                            st.image(image, caption="Candidate at this moment", use_container_width=True)
-                        else:
-                            st.warning("Could not decode image data")
+                        # FIXED LINE - replaced use_column_width with use_container_width
+                        st.image(image_data, caption="Candidate at this moment", use_container_width=True)
                     except Exception as e:
                         st.error(f"Error displaying image: {str(e)}")
                 else:
@@ -419,25 +618,20 @@ elif st.session_state["page"] == "analysis":
             # Notes and analysis section with proper error handling
             st.subheader("Expert Notes")
             
-            # Load any existing notes
-            if "current_profile" in st.session_state:
+            # Existing notes come from the notes cache, no Firestore read per slider move
+            if notes_cache is not None:
                 try:
-                    selected_name = st.session_state["current_profile"]["name"]
-                    doc_ref = db.collection("stress_analysis").document(selected_name).collection("notes").document(str(closest_point['timestamp']))
-                    doc = doc_ref.get()
-                    existing_notes = doc.to_dict().get('text', '') if doc.exists else ''
+                    existing_notes = notes_cache.get(closest_point['timestamp'])
                     
                     # Allow experts to add notes at this timestamp
                     notes = st.text_area("Add notes about this moment:", value=existing_notes, height=150)
                     
                     if st.button("Save Notes"):
-                                # Convert numpy.int64 to standard Python int
-                                timestamp_py_int = int(closest_point['timestamp'])
-                                doc_ref.set({'text': notes, 'timestamp': timestamp_py_int})
+                                notes_cache.save(closest_point['timestamp'], notes)
                                 st.success("Notes saved successfully!")
                 except Exception as e:
                                 st.error(f"Error loading/saving notes: {str(e)}")
-            else:
+            elif not recorded_name:
                                 st.warning("No candidate selected. Please select a candidate to add notes.")
 
             st.markdown("---")
@@ -449,130 +643,35 @@ elif st.session_state["page"] == "analysis":
             
             with col1:
                 if st.button("Generate Summary Report"):
-                    try:
-                        # Create a summary of the interview
-                        # Convert NumPy types to Python native types
-                        summary = {
-                            "candidate_name": st.session_state["current_profile"]["name"],
-                            "interview_date": datetime.fromtimestamp(timeline_df['timestamp'].min()).strftime('%Y-%m-%d'),
-                            "interview_duration": f"{float((timeline_df['timestamp'].max() - timeline_df['timestamp'].min()) / 60):.1f} minutes",
-                            "avg_stress_level": float(timeline_df['stress_value'].mean()),
-                            "max_stress_level": int(timeline_df['stress_value'].max()),
-                            "dominant_emotion": str(timeline_df['emotion'].mode()[0]) if 'emotion' in timeline_df.columns and not timeline_df['emotion'].empty else 'Unknown',
-                            "stress_peaks": int(len(timeline_df[timeline_df['stress_value'] == 3])),
-                            "relaxed_moments": int(len(timeline_df[timeline_df['stress_value'] == 1]))
-                        }
-                        
-                        # Store summary in Firebase
-                        db.collection("stress_analysis").document(st.session_state["current_profile"]["name"]).collection("reports").document("summary").set(summary)
-                        
-                        # Create PDF using ReportLab
-                        from reportlab.lib import colors
-                        from reportlab.lib.pagesizes import letter
-                        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-                        from reportlab.lib.styles import getSampleStyleSheet
-                        import tempfile
-                        import base64
-                        
-                        # Create a temporary file for the PDF
-                        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                            pdf_path = tmp_file.name
-                        
-                        # Create the PDF
-                        doc = SimpleDocTemplate(pdf_path, pagesize=letter)
-                        styles = getSampleStyleSheet()
-                        
-                        # Build the content
-                        content = []
-                        
-                        # Add title
-                        title_style = styles['Heading1']
-                        content.append(Paragraph(f"Interview Summary Report", title_style))
-                        content.append(Spacer(1, 12))
-                        
-                        # Add candidate info section
-                        content.append(Paragraph("Candidate Information", styles['Heading2']))
-                        content.append(Spacer(1, 6))
-                        
-                        # Create a table for candidate information
-                        candidate_data = [
-                            ["Candidate Name:", summary["candidate_name"]],
-                            ["Interview Date:", summary["interview_date"]],
-                            ["Interview Duration:", summary["interview_duration"]]
-                        ]
-                        
-                        candidate_table = Table(candidate_data, colWidths=[150, 300])
-                        candidate_table.setStyle(TableStyle([
-                            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                            ('FONTSIZE', (0, 0), (-1, -1), 10),
-                            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-                            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-                            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                        ]))
-                        content.append(candidate_table)
-                        content.append(Spacer(1, 12))
-                        
-                        # Add stress analysis section
-                        content.append(Paragraph("Stress Analysis", styles['Heading2']))
-                        content.append(Spacer(1, 6))
-                        
-                        # Create a table for stress analysis
-                        stress_data = [
-                            ["Average Stress Level:", f"{summary['avg_stress_level']:.2f}"],
-                            ["Maximum Stress Level:", str(summary['max_stress_level'])],
-                            ["Dominant Emotion:", summary["dominant_emotion"]],
-                            ["High Stress Moments:", str(summary["stress_peaks"])],
-                            ["Relaxed Moments:", str(summary["relaxed_moments"])]
-                        ]
-                        
-                        stress_table = Table(stress_data, colWidths=[150, 300])
-                        stress_table.setStyle(TableStyle([
-                            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                            ('FONTSIZE', (0, 0), (-1, -1), 10),
-                            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-                            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-                            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                        ]))
-                        content.append(stress_table)
-                        
-                        # Add analysis note
-                        content.append(Spacer(1, 24))
-                        note_style = styles['Normal']
-                        
-                        # Create a personalized analysis based on the data
-                        if summary['avg_stress_level'] > 2.5:
-                            analysis_note = f"{summary['candidate_name']} exhibited high stress levels throughout the interview. Consider providing more preparation or a more comfortable interview environment in the future."
-                        elif summary['avg_stress_level'] > 1.5:
-                            analysis_note = f"{summary['candidate_name']} showed moderate stress levels with some peaks during the interview. Overall handling was adequate."
-                        else:
-                            analysis_note = f"{summary['candidate_name']} maintained low stress levels throughout the interview, indicating good preparation and comfort with the process."
-                            
-                        content.append(Paragraph("Analysis Note:", styles['Heading3']))
-                        content.append(Paragraph(analysis_note, note_style))
-                        
-                        # Add timestamp for the report
-                        content.append(Spacer(1, 30))
-                        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        content.append(Paragraph(f"Report generated on: {timestamp}", styles['Italic']))
-                        
-                        # Build the PDF
-                        doc.build(content)
-                        
-                        # Create a download link for the PDF
-                        with open(pdf_path, "rb") as pdf_file:
-                            pdf_bytes = pdf_file.read()
-                            
-                        b64_pdf = base64.b64encode(pdf_bytes).decode('utf-8')
+                    if not recorded_name:
+                        st.warning("No candidate selected. Please select a candidate to generate a report.")
+                    else:
+                        try:
+                            # Create a summary of the interview from the running aggregates
+                            candidate_name = recorded_name
+                            summary = build_summary(candidate_name, st.session_state["emotion_data"].stats.summary())
                         
-                        # Generate download link
-                        href = f'<a href="data:application/pdf;base64,{b64_pdf}" download="{summary["candidate_name"]}_interview_summary.pdf">Download PDF Report</a>'
+                            # Store summary in Firebase
+                            db.collection("stress_analysis").document(candidate_name).collection("reports").document("summary").set(summary)
                         
-                        # Display a success message and download link
-                        st.success("Summary report generated and saved!")
-                        st.markdown(href, unsafe_allow_html=True)
+                            # Render the PDF in memory, unchanged interviews come from the chart and report caches
+                            emotion_data = st.session_state["emotion_data"]
+                            charts = get_charts((candidate_name, emotion_data.uid, emotion_data.version), emotion_data)
+                            st.session_state["summary_report"] = (candidate_name, report_filename(summary), render_summary_pdf(summary, charts))
+                            st.success("Summary report generated and saved!")
                         
-                    except Exception as e:
-                        st.error(f"Error generating summary report: {str(e)}")
-                        import traceback
-                        st.error(traceback.format_exc())
+                        except Exception as e:
+                            st.error(f"Error generating summary report: {str(e)}")
+                            import traceback
+                            st.error(traceback.format_exc())
+                
+                # Kept in session state so the download survives the rerun it triggers
+                report = st.session_state.get("summary_report")
+                if report and report[0] == recorded_name:
+                    st.download_button(
+                        "Download PDF Report",
+                        data=report[2],
+                        file_name=report[1],
+                        mime="application/pdf"
+                    )
                 
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""Headless summary reports for every candidate of a hiring round
+
+Loads each candidate's saved interview (see EmotionSeries.save), computes the
+summary and renders the PDF with its charts in a pool of worker processes,
+then stores the summaries in Firestore with batched commits.
+
+Usage: python batch_reports.py --all --out reports/ --workers 4
+       python batch_reports.py --candidates "Jane Doe" "John Roe" --no-firestore
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from emotion_series import DEFAULT_DATA_DIR, EmotionSeries, interview_path, saved_interviews
+from report_charts import build_charts
+from reports import build_summary, render_summary_pdf, report_filename
+from sheets_sync import BATCH_SIZE, load_fingerprints
+
+
+def report_for(candidate_name, data_path, out_dir):
+    """Summary of one saved interview with its PDF written to out_dir, runs in a worker process"""
+    start = time.perf_counter()
+    series = EmotionSeries.load(data_path)
+    summary = build_summary(candidate_name, series.stats.summary())
+    pdf = render_summary_pdf(summary, build_charts((candidate_name, data_path), series))
+    pdf_path = os.path.join(out_dir, report_filename(summary).replace(os.sep, "_"))
+    with open(pdf_path, "wb") as pdf_file:
+        pdf_file.write(pdf)
+    return {
+        "candidate_name": candidate_name,
+        "summary": summary,
+        "pdf_path": pdf_path,
+        "pdf_bytes": len(pdf),
+        "samples": len(series),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def _commit_summaries(db, chunk):
+    batch = db.batch()
+    for candidate_name, summary in chunk:
+        ref = db.collection("stress_analysis").document(candidate_name).collection("reports").document("summary")
+        batch.set(ref, summary)
+    batch.commit()
+    return len(chunk)
+
+
+def write_summaries(db, summaries, batch_size=BATCH_SIZE, max_workers=4):
+    """Store (candidate_name, summary) pairs in batched commits, returns the number written"""
+    chunks = [summaries[i:i + batch_size] for i in range(0, len(summaries), batch_size)]
+    if max_workers <= 1 or len(chunks) <= 1:
+        return sum(_commit_summaries(db, chunk) for chunk in chunks)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return sum(executor.map(lambda chunk: _commit_summaries(db, chunk), chunks))
+
+
+def resolve_candidates(names, data_dir, db=None):
+    """Saved interview path per requested candidate, plus the candidates without one
+
+    With no names, every candidate synced to Firestore is reported, or every
+    saved interview when there is no Firestore client.
+    """
+    if names is None:
+        if db is None:
+            return saved_interviews(data_dir), []
+        names = sorted(load_fingerprints(db))
+    found, missing = {}, []
+    for name in names:
+        path = interview_path(name, data_dir)
+        if os.path.exists(path):
+            found[name] = path
+        else:
+            missing.append(name)
+    return found, missing
+
+
+def run_batch(candidates, out_dir, db=None, workers=None, commit_workers=4, log=print):
+    """Render every report and store the summaries, returns throughput stats"""
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    results, failures = [], []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(report_for, name, path, out_dir): name
+            for name, path in candidates.items()
+        }
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                failures.append((futures[future], str(e)))
+                log(f"  {futures[future]}: failed, {e}")
+    render_s = time.perf_counter() - start
+
+    commit_start = time.perf_counter()
+    written = 0
+    if db is not None and results:
+        written = write_summaries(
+            db, [(r["candidate_name"], r["summary"]) for r in results], max_workers=commit_workers
+        )
+    commit_s = time.perf_counter() - commit_start
+
+    total_s = time.perf_counter() - start
+    samples = sum(r["samples"] for r in results)
+    return {
+        "reports": len(results),
+        "failed": len(failures),
+        "samples": samples,
+        "pdf_bytes": sum(r["pdf_bytes"] for r in results),
+        "summaries_written": written,
+        "render_s": render_s,
+        "commit_s": commit_s,
+        "total_s": total_s,
+        "reports_per_s": len(results) / total_s if total_s else 0.0,
+        "samples_per_s": samples / total_s if total_s else 0.0,
+        "mean_report_s": sum(r["seconds"] for r in results) / len(results) if results else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch interview summary reports")
+    who = parser.add_mutually_exclusive_group(required=True)
+    who.add_argument("--candidates", nargs="+", help="candidate names to report on")
+    who.add_argument("--candidates-file", help="file with one candidate name per line")
+    who.add_argument("--all", action="store_true", help="every candidate synced from the sheet")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="directory of recorded interviews, $INTERVIEW_DATA_DIR when set")
+    parser.add_argument("--out", default="reports", help="directory the PDFs are written to")
+    parser.add_argument("--workers", type=int, default=None, help="report processes, defaults to the CPU count")
+    parser.add_argument("--commit-workers", type=int, default=4, help="parallel Firestore batch commits")
+    parser.add_argument("--credentials", default=os.environ.get("FIREBASE_CREDENTIALS"),
+                        help="Firebase service account file, defaults to $FIREBASE_CREDENTIALS")
+    parser.add_argument("--no-firestore", action="store_true", help="only write the PDFs")
+    args = parser.parse_args()
+
+    db = None
+    if not args.no_firestore:
+        if not args.credentials:
+            parser.error("--credentials (or $FIREBASE_CREDENTIALS) is required unless --no-firestore is set")
+        from clients import get_firestore
+        db = get_firestore(args.credentials)
+
+    names = None
+    if args.candidates:
+        names = args.candidates
+    elif args.candidates_file:
+        with open(args.candidates_file, encoding="utf-8") as candidates_file:
+            names = [line.strip() for line in candidates_file if line.strip()]
+    candidates, missing = resolve_candidates(names, args.data_dir, db)
+    for name in missing:
+        print(f"  {name}: no saved interview in {args.data_dir}, skipped")
+    print(f"Generating {len(candidates)} report(s)...")
+
+    stats = run_batch(candidates, args.out, db, args.workers, args.commit_workers)
+    print(f"{stats['reports']} reports ({stats['failed']} failed, {len(missing)} without data) "
+          f"in {stats['total_s']:.1f}s: {stats['reports_per_s']:.1f} reports/s, "
+          f"{stats['samples_per_s']:,.0f} samples/s")
+    print(f"rendering {stats['render_s']:.1f}s (mean {stats['mean_report_s'] * 1000:.0f} ms per report), "
+          f"{stats['summaries_written']} summaries committed in {stats['commit_s']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""End-of-round reporting: one report at a time as on the analysis page versus batch_reports.run_batch
+
+The sequential path mirrors a click per candidate: pandas summary, charted
+PDF and one Firestore write each. The batch path uses a process pool and batched
+commits. Firestore is the in-process fake with a fixed round-trip latency.
+
+Usage: python benchmarks/bench_batch_reports.py --interviews 200 --samples 18000 --workers 4
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_emotion_series import entries
+from fakes import FakeFirestore
+
+import batch_reports
+import reports
+from emotion_series import EmotionSeries, interview_path
+from report_charts import build_charts
+from reports import build_summary, render_summary_pdf
+
+
+def sequential(candidates, out_dir, db):
+    for name, path in candidates.items():
+        series = EmotionSeries.load(path)
+        timeline_df = series.to_frame()
+        summary = build_summary(name, {
+            "started_at": int(timeline_df['timestamp'].min()),
+            "duration_s": int(timeline_df['timestamp'].max() - timeline_df['timestamp'].min()),
+            "avg_stress_level": float(timeline_df['stress_value'].mean()),
+            "max_stress_level": int(timeline_df['stress_value'].max()),
+            "dominant_emotion": str(timeline_df['emotion'].mode()[0]),
+            "stress_peaks": int(len(timeline_df[timeline_df['stress_value'] == 3])),
+            "relaxed_moments": int(len(timeline_df[timeline_df['stress_value'] == 1])),
+        })
+        db.collection("stress_analysis").document(name).collection("reports").document("summary").set(summary)
+        with open(os.path.join(out_dir, f"{name}.pdf"), "wb") as pdf_file:
+            pdf_file.write(render_summary_pdf(summary, build_charts((name, path), series)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--interviews", type=int, default=100)
+    parser.add_argument("--samples", type=int, default=18000, help="samples per interview, 18000 is 30 min at 10 fps")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--latency", type=float, default=0.05, help="Firestore round trip in seconds")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-batch-reports-")
+    try:
+        series = EmotionSeries()
+        series.extend(entries(args.samples))
+        candidates = {}
+        for i in range(args.interviews):
+            name = f"Candidate {i}"
+            candidates[name] = interview_path(name, os.path.join(workdir, "data"))
+            # Written the way the app records an interview
+            series.candidate_name = name
+            series.record_to(candidates[name])
+
+        db = FakeFirestore(latency=args.latency, keep_documents=False)
+        out_dir = os.path.join(workdir, "sequential")
+        os.makedirs(out_dir)
+        start = time.perf_counter()
+        sequential(candidates, out_dir, db)
+        sequential_s = time.perf_counter() - start
+        sequential_trips = db.round_trips
+
+        # Forked workers would otherwise inherit the PDFs the sequential run cached
+        reports._pdf_cache.clear()
+        db = FakeFirestore(latency=args.latency, keep_documents=False)
+        stats = batch_reports.run_batch(candidates, os.path.join(workdir, "batch"), db, args.workers)
+
+        print(f"{args.interviews} interviews x {args.samples} samples, {args.workers} worker(s), "
+              f"{args.latency * 1000:.0f} ms Firestore round trips")
+        print(f"sequential:  {sequential_s:7.2f}s  {args.interviews / sequential_s:6.1f} reports/s  "
+              f"{sequential_trips} round trips")
+        print(f"batch:       {stats['total_s']:7.2f}s  {stats['reports_per_s']:6.1f} reports/s  "
+              f"{db.round_trips} round trips  (render {stats['render_s']:.2f}s, commit {stats['commit_s']:.2f}s)")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
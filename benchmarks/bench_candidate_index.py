@@ -0,0 +1,49 @@
+"""Sidebar rerun cost against candidate count: list scans versus CandidateIndex
+
+Usage: python benchmarks/bench_candidate_index.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from candidate_index import CandidateIndex
+from fakes import synthetic_sheet
+from sheets_sync import build_profiles, resolve_columns
+
+
+def legacy_rerun(candidates, selected):
+    # What the sidebar did on every rerun before the index
+    candidate_names = [c["name"] for c in candidates if c["name"] != "Unknown"]
+    return candidate_names, next((c for c in candidates if c["name"] == selected), None)
+
+
+def legacy_search(candidates, query):
+    query = query.lower()
+    return [c for c in candidates if query in f"{c['name']} {c['role']} {c['skills']}".lower()]
+
+
+def per_call_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    print(f"{'candidates':>10} {'scan rerun':>12} {'index rerun':>12} {'scan search':>12} {'index search':>13} {'build':>10}")
+    for n in (1000, 10000, 50000, 100000):
+        rows = synthetic_sheet(n)
+        candidates = build_profiles(rows[1:], resolve_columns(rows[0]))
+        selected = candidates[-1]["name"]
+        build = per_call_us(lambda: CandidateIndex(candidates), 1)
+        index = CandidateIndex(candidates)
+        index.search("py")
+        print(f"{n:>10} "
+              f"{per_call_us(lambda: legacy_rerun(candidates, selected), 5):>10.0f}us "
+              f"{per_call_us(lambda: (index.names, index.get(selected)), 1000):>10.2f}us "
+              f"{per_call_us(lambda: legacy_search(candidates, 'ate 99'), 3):>10.0f}us "
+              f"{per_call_us(lambda: index.search('ate 99'), 20):>11.0f}us "
+              f"{build / 1000:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
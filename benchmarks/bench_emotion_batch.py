@@ -0,0 +1,69 @@
+"""Per-frame versus batched emotion inference throughput (CPU only)
+
+Also splits the per-frame cost into face detection, which stays per frame,
+and the emotion model, which is batched.
+
+Usage: python benchmarks/bench_emotion_batch.py --frames 100 --batch-sizes 1 5 10 25
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("TF_ENABLE_ONEDNN_OPTS", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_emotion_server import synthetic_frames
+from emotion_analysis import EMOTIONS, analyze_frame, analyze_frames, crop_face, detect_face, emotion_batch, warm_up
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 5, 10, 25])
+    parser.add_argument("--video", help="optional recorded clip to sample frames from instead of noise")
+    args = parser.parse_args()
+
+    if args.video:
+        import cv2
+
+        capture = cv2.VideoCapture(args.video)
+        frames = []
+        while len(frames) < args.frames:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            frames.append(frame)
+    else:
+        frames = synthetic_frames(args.frames)
+
+    warm_up()
+    analyze_frames(frames[:2])
+
+    start = time.perf_counter()
+    single = [analyze_frame(frame) for frame in frames]
+    baseline = len(frames) / (time.perf_counter() - start)
+    print(f"{'per-frame analyze':<22} {baseline:8.1f} frames/s")
+
+    start = time.perf_counter()
+    faces = [crop_face(frame, detect_face(frame)) for frame in frames]
+    detect_ms = (time.perf_counter() - start) * 1000 / len(frames)
+    start = time.perf_counter()
+    emotion_batch(faces)
+    model_ms = (time.perf_counter() - start) * 1000 / len(frames)
+    print(f"{'per frame':<22} detection {detect_ms:6.1f} ms, batched emotion model {model_ms:6.1f} ms")
+
+    for size in args.batch_sizes:
+        start = time.perf_counter()
+        batched = []
+        for i in range(0, len(frames), size):
+            batched.extend(analyze_frames(frames[i:i + size]))
+        fps = len(frames) / (time.perf_counter() - start)
+        agree = sum(a["emotion"] == b["emotion"] for a, b in zip(single, batched)) / len(frames)
+        drift = max(abs(a[e] - b[e]) for a, b in zip(single, batched) for e in EMOTIONS)
+        print(f"{f'batch of {size}':<22} {fps:8.1f} frames/s  x{fps / baseline:.1f}  "
+              f"dominant agreement {agree:.0%}, max score drift {drift:.1f} pts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Memory per sample and DataFrame export: emotion_data list of dicts versus EmotionSeries
+
+Usage: python benchmarks/bench_emotion_series.py --samples 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from emotion_analysis import EMOTIONS, build_analysis
+from emotion_series import EmotionSeries
+
+
+def entries(n, seed=0):
+    rng = random.Random(seed)
+    for i in range(n):
+        scores = {emotion: rng.random() * 100 for emotion in EMOTIONS}
+        entry = build_analysis(scores, 1700000000 + i // 5)
+        entry["image_ref"] = "%040x" % rng.getrandbits(160)
+        yield entry
+
+
+def main():
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=100000)
+    args = parser.parse_args()
+    n = args.samples
+
+    tracemalloc.start()
+    as_list = list(entries(n))
+    list_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    series = EmotionSeries()
+    for entry in entries(n):
+        series.append(entry)
+    series_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    pd.DataFrame(as_list)
+    list_frame = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    series.to_frame()
+    series_frame = (time.perf_counter() - start) * 1000
+
+    assert series[n // 2] == as_list[n // 2] or all(
+        abs(series[n // 2][e] - as_list[n // 2][e]) < 1e-4 for e in EMOTIONS
+    )
+    # Recording to disk as samples arrive, one append per sample like a live interview
+    with tempfile.TemporaryDirectory() as directory:
+        recorded = EmotionSeries(candidate_name="Jane Doe")
+        recorded.record_to(os.path.join(directory, "jane.samples"))
+        start = time.perf_counter()
+        for entry in as_list[:10000]:
+            recorded.append(entry)
+        record_us = (time.perf_counter() - start) * 1e6 / len(recorded)
+        file_bytes = os.path.getsize(recorded.path)
+        loaded = EmotionSeries.load(recorded.path)
+        assert loaded.candidate_name == "Jane Doe" and loaded[:] == recorded[:]
+
+    print(f"{n} samples")
+    print(f"list of dicts:  {list_bytes / n:7.0f} bytes/sample  DataFrame build {list_frame:8.1f} ms")
+    print(f"EmotionSeries:  {series_bytes / n:7.0f} bytes/sample  DataFrame export {series_frame:7.1f} ms")
+    print(f"recording to disk: {record_us:.1f} us per appended sample, {file_bytes / len(recorded):.0f} bytes/sample on disk")
+
+
+if __name__ == "__main__":
+    main()
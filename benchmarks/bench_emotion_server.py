@@ -0,0 +1,97 @@
+"""Emotion server throughput and latency against worker count (CPU only)
+
+Usage: python benchmarks/bench_emotion_server.py --frames 200 --clients 4
+       python benchmarks/bench_emotion_server.py --stub   # IPC and pool overhead only
+"""
+import argparse
+import os
+import secrets
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from emotion_analysis import analyze_frame, build_analysis, warm_up
+from emotion_server import EmotionClient, EmotionServer
+from local_service import percentiles
+
+
+# A fresh key per run, the server refuses to start without one
+AUTHKEY = secrets.token_bytes(32)
+
+
+def stub_analyze(frame, timestamp=None):
+    # Burns roughly the CPU time of one small-model inference without loading DeepFace
+    deadline = time.process_time() + 0.02
+    while time.process_time() < deadline:
+        pass
+    return build_analysis({"neutral": 90.0, "happy": 10.0}, timestamp)
+
+
+def stub_warm_up():
+    pass
+
+
+def synthetic_frames(count, size=(480, 640)):
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 255, (*size, 3), dtype=np.uint8)
+    return [np.roll(base, i, axis=1) for i in range(count)]
+
+
+def run(workers, frames, clients, stub):
+    server = EmotionServer(
+        ("127.0.0.1", 0),
+        AUTHKEY,
+        workers=workers,
+        queue_size=clients * 2,
+        queue_timeout=30,
+        analyze_fn=stub_analyze if stub else analyze_frame,
+        initializer=stub_warm_up if stub else warm_up,
+    )
+    server.warm()
+    server.start()
+    latencies = []
+    lock = threading.Lock()
+
+    def session(share):
+        client = EmotionClient(server.address, AUTHKEY)
+        for frame in share:
+            start = time.perf_counter()
+            client.analyze(frame)
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+        client.close()
+
+    threads = [threading.Thread(target=session, args=(frames[i::clients],)) for i in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    server.close()
+
+    p = percentiles(latencies)
+    print(f"{workers:>7} {len(frames) / elapsed:>10.1f} {p['p50']:>9.1f} {p['p90']:>9.1f} {p['p99']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=4, help="concurrent interview sessions")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--stub", action="store_true", help="replace DeepFace with a fixed CPU cost")
+    args = parser.parse_args()
+
+    frames = synthetic_frames(args.frames)
+    print(f"{args.frames} frames from {args.clients} concurrent sessions")
+    print(f"{'workers':>7} {'frames/s':>10} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}")
+    for workers in args.workers:
+        run(workers, frames, args.clients, args.stub)
+
+
+if __name__ == "__main__":
+    main()
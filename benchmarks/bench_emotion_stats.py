@@ -0,0 +1,89 @@
+"""Summary statistics: pandas batch computation over timeline_df versus the EmotionStats aggregates
+
+Also checks that both give exactly the same report figures, with timeline_df
+built from the entry dicts as app.py used to, including the tie-break of the
+dominant emotion, and that the rolling window matches a brute-force scan,
+exiting non-zero if they differ.
+
+Usage: python benchmarks/bench_emotion_stats.py --samples 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_emotion_series import entries
+from emotion_series import EmotionSeries
+
+
+def batch_summary(timeline_df):
+    # The report computation the accumulator replaces
+    return {
+        "started_at": int(timeline_df['timestamp'].min()),
+        "duration_s": int(timeline_df['timestamp'].max() - timeline_df['timestamp'].min()),
+        "avg_stress_level": float(timeline_df['stress_value'].mean()),
+        "max_stress_level": int(timeline_df['stress_value'].max()),
+        "dominant_emotion": str(timeline_df['emotion'].mode()[0]) if not timeline_df['emotion'].mode().empty else 'Unknown',
+        "stress_peaks": int(len(timeline_df[timeline_df['stress_value'] == 3])),
+        "relaxed_moments": int(len(timeline_df[timeline_df['stress_value'] == 1])),
+    }
+
+
+def brute_force_window(timeline_df, window):
+    latest = timeline_df['timestamp'].max()
+    recent = timeline_df[timeline_df['timestamp'] > latest - window]['stress_value']
+    return {
+        "count": len(recent),
+        "mean_stress": float(recent.sum() / len(recent)),
+        "stress_peaks": int((recent == 3).sum()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=100000)
+    args = parser.parse_args()
+
+    # Equal counts: the old report's mode() picked the alphabetically first emotion
+    tied = EmotionSeries()
+    tied.extend([{"timestamp": 1, "emotion": "sad"}, {"timestamp": 2, "emotion": "neutral"}])
+    assert tied.stats.dominant_emotion == batch_summary(pd.DataFrame(list(tied)))["dominant_emotion"] == "neutral"
+
+    series = EmotionSeries()
+    recorded = []
+    checkpoints = {1, 2, 10, 1000, args.samples // 3, args.samples}
+    for i, entry in enumerate(entries(args.samples), 1):
+        if i % 97 == 0:
+            entry["emotion"] = "unknown"
+        series.append(entry)
+        recorded.append(entry)
+        if i in checkpoints:
+            timeline_df = pd.DataFrame(recorded)
+            expected = batch_summary(timeline_df)
+            assert series.stats.summary() == expected, (i, series.stats.summary(), expected)
+            current = dict(series.stats.current())
+            current.pop("window_s")
+            assert current == brute_force_window(timeline_df, series.stats.window), i
+
+    timeline_df = series.to_frame()
+    start = time.perf_counter()
+    batch_summary(timeline_df)
+    batch_ms = (time.perf_counter() - start) * 1000
+    repeats = 10000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        series.stats.summary()
+        series.stats.current()
+    running_us = (time.perf_counter() - start) / repeats * 1e6
+
+    print(f"{args.samples} samples, summaries identical at {len(checkpoints)} checkpoints")
+    print(f"pandas batch summary:    {batch_ms:8.2f} ms")
+    print(f"EmotionStats summary:    {running_us:8.2f} us (with the rolling window)")
+
+
+if __name__ == "__main__":
+    main()
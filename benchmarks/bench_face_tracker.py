@@ -0,0 +1,78 @@
+"""Full per-frame face detection versus FaceTracker on recorded interview clips
+
+Usage: python benchmarks/bench_face_tracker.py clip1.mp4 [clip2.mp4 ...] --detect-every 10
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("TF_ENABLE_ONEDNN_OPTS", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_frame_sampler import read_video
+from emotion_analysis import build_analysis, crop_face, detect_face, emotion_batch, warm_up
+from face_tracker import FaceTracker
+
+
+def iou(a, b):
+    if a is None or b is None:
+        return float(a is b)
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    w = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    h = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = w * h
+    return inter / float(aw * ah + bw * bh - inter or 1)
+
+
+def full_detection(frames):
+    boxes, emotions = [], []
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        box = detect_face(frame)
+        scores = emotion_batch([crop_face(frame, box)])[0]
+        boxes.append(box)
+        emotions.append(build_analysis(scores, i)["emotion"])
+    return boxes, emotions, time.perf_counter() - start
+
+
+def tracked(frames, detect_every):
+    tracker = FaceTracker(detect_every=detect_every)
+    boxes, emotions = [], []
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        box = tracker.locate(frame)
+        scores = emotion_batch([crop_face(frame, box)])[0]
+        boxes.append(box)
+        emotions.append(build_analysis(scores, i)["emotion"])
+    return boxes, emotions, time.perf_counter() - start, tracker.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("videos", nargs="+")
+    parser.add_argument("--frames", type=int, default=600, help="frames read from each clip")
+    parser.add_argument("--detect-every", type=int, nargs="+", default=[5, 10, 30])
+    args = parser.parse_args()
+
+    warm_up()
+    for path in args.videos:
+        frames = read_video(path, args.frames)
+        if not frames:
+            print(f"{path}: no frames read")
+            continue
+        ref_boxes, ref_emotions, ref_time = full_detection(frames)
+        print(f"{os.path.basename(path)}: {len(frames)} frames")
+        print(f"  {'full detection':<18} {len(frames) / ref_time:7.1f} frames/s")
+        for k in args.detect_every:
+            boxes, emotions, elapsed, stats = tracked(frames, k)
+            mean_iou = sum(iou(a, b) for a, b in zip(ref_boxes, boxes)) / len(frames)
+            agree = sum(a == b for a, b in zip(ref_emotions, emotions)) / len(frames)
+            print(f"  {f'track, K={k}':<18} {len(frames) / elapsed:7.1f} frames/s  "
+                  f"x{ref_time / elapsed:.1f}  box IoU {mean_iou:.2f}  emotion agreement {agree:.0%}  "
+                  f"detections {stats['detection_ratio']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
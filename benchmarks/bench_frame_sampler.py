@@ -0,0 +1,76 @@
+"""Skip ratio and CPU saved by the adaptive frame sampler
+
+Usage: python benchmarks/bench_frame_sampler.py [--video interview.mp4] [--deepface]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_emotion_server import stub_analyze
+from emotion_analysis import analyze_frame
+from frame_sampler import AdaptiveSampler
+
+
+def synthetic_interview(count, fps=5, size=(480, 640)):
+    # Mostly still frames with sensor noise and a few seconds of movement
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    blocks = rng.integers(40, 200, (size[0] // 40, size[1] // 40, 3), dtype=np.uint8)
+    still = blocks.repeat(40, axis=0).repeat(40, axis=1)
+    frames = []
+    for i in range(count):
+        second = i // fps
+        shift = (i * 7) % size[1] if second % 20 in (5, 6, 13) else 0
+        frame = np.roll(still, shift, axis=1)
+        noise = rng.integers(-3, 4, frame.shape, dtype=np.int16)
+        frames.append(np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8))
+    return frames
+
+
+def read_video(path, limit):
+    import cv2
+
+    capture = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(frame)
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--video")
+    parser.add_argument("--deepface", action="store_true", help="use the real model instead of a fixed CPU cost")
+    args = parser.parse_args()
+
+    frames = read_video(args.video, args.frames) if args.video else synthetic_interview(args.frames)
+    analyze_fn = analyze_frame if args.deepface else stub_analyze
+
+    start = time.process_time()
+    for i, frame in enumerate(frames):
+        analyze_fn(frame, i)
+    every_frame = time.process_time() - start
+
+    sampler = AdaptiveSampler(analyze_fn=analyze_fn)
+    start = time.process_time()
+    timeline = [sampler.process(frame, i) for i, frame in enumerate(frames)]
+    sampled = time.process_time() - start
+
+    stats = sampler.stats()
+    assert [entry["timestamp"] for entry in timeline] == list(range(len(frames)))
+    print(f"{len(frames)} frames, analysed {stats['analysed']}, skipped {stats['skipped']} "
+          f"({stats['skip_ratio']:.0%}), final interval {stats['interval']}")
+    print(f"CPU every frame {every_frame:.2f}s, with sampler {sampled:.2f}s "
+          f"(estimated saving {stats['saved_s']:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
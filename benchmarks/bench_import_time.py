@@ -0,0 +1,113 @@
+"""Import-time profile of the modules app.py used to load at startup
+
+Runs each module in a fresh interpreter with -X importtime and reports its
+cumulative import cost, then compares the eager import set that app.py used
+to load on every cold start with the set it loads now, read from app.py's
+module-level imports.
+
+Usage: python benchmarks/bench_import_time.py [--top 15]
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Top-level imports of app.py before the heavy stack was deferred. from deepface
+# import DeepFace is the one that pulls in TensorFlow, import deepface alone does not
+EAGER_IMPORTS = [
+    "streamlit", "cv2", "numpy", "deepface.DeepFace", "firebase_admin.credentials",
+    "firebase_admin.firestore", "cohere", "base64", "pandas", "google.oauth2.service_account",
+    "googleapiclient.discovery", "PIL.Image", "pyautogui", "datetime", "plotly.graph_objects",
+    "plotly.express", "pytz",
+]
+
+# Client libraries imported inside the clients.py factories app.py calls at module level
+STARTUP_CLIENTS = ["firebase_admin.credentials", "firebase_admin.firestore", "cohere"]
+
+
+def startup_imports(path=os.path.join(ROOT, "app.py")):
+    """Modules app.py imports before the main dashboard renders
+
+    Module-level imports, including those in session state setup blocks, but
+    not the ones inside functions or in the branches of the other pages.
+    """
+    modules = []
+
+    def visit(nodes):
+        for node in nodes:
+            if isinstance(node, ast.Import):
+                modules.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and not node.level:
+                modules.append(node.module)
+            elif isinstance(node, ast.If):
+                visit(node.body)
+                # Only the main page runs on a cold start, skip the elif chain of the other pages
+                if "page" not in {n.value for n in ast.walk(node.test) if isinstance(n, ast.Constant)}:
+                    visit(node.orelse)
+            elif isinstance(node, (ast.With, ast.Try)):
+                visit(node.body)
+
+    with open(path, encoding="utf-8") as f:
+        visit(ast.parse(f.read()).body)
+    return list(dict.fromkeys(modules + STARTUP_CLIENTS))
+
+
+def import_profile(statement):
+    """Run an import in a fresh interpreter, returns {module: (self_us, cumulative_us, depth)}"""
+    env = dict(os.environ, TF_ENABLE_ONEDNN_OPTS="0", TF_CPP_MIN_LOG_LEVEL="3")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, cwd=ROOT, env=env
+    )
+    if result.returncode != 0:
+        return None
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Nested imports are indented by two spaces per level after the separator
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        profile[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return profile
+
+
+def total_ms(modules):
+    # Modules missing from this environment are skipped rather than failing the whole set
+    profile = import_profile("\n".join(f"try:\n    import {m}\nexcept ImportError:\n    pass" for m in modules))
+    if profile is None:
+        return None
+    # Only top-level entries add up to the wall time
+    return sum(cum for _, cum, depth in profile.values() if depth == 0) / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=15, help="number of slowest modules to list")
+    args = parser.parse_args()
+
+    print(f"{'module':<34} {'cumulative':>12}")
+    rows = []
+    for module in EAGER_IMPORTS:
+        profile = import_profile(f"import {module}")
+        if profile is None:
+            print(f"{module:<34} {'not installed':>12}")
+            continue
+        rows.append((module, profile.get(module, (0, 0))[1] / 1000))
+    for module, ms in sorted(rows, key=lambda r: -r[1])[:args.top]:
+        print(f"{module:<34} {ms:>10.0f}ms")
+
+    eager = total_ms(EAGER_IMPORTS)
+    startup = total_ms(startup_imports())
+    print()
+    print(f"eager app.py imports:   {'unavailable' if eager is None else f'{eager:.0f} ms'}")
+    print(f"deferred app.py imports: {'unavailable' if startup is None else f'{startup:.0f} ms'}")
+    if len(rows) < len(EAGER_IMPORTS):
+        print("(modules that are not installed are left out of both totals)")
+
+
+if __name__ == "__main__":
+    main()
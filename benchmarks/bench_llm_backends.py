@@ -0,0 +1,104 @@
+"""Question generation latency and throughput of the Cohere and local LLM backends
+
+Without endpoints the backends talk to local fake servers: the hosted one
+adds --wan-rtt per request and serves any number of requests at once, the
+local one has no network hop but generates --local-slots answers at a time
+at --local-token-delay per token, like a quantised model on a CPU. Pass
+--cohere-key and/or --local-url to measure real endpoints instead.
+
+Usage: python benchmarks/bench_llm_backends.py --requests 8 --concurrency 4
+       python benchmarks/bench_llm_backends.py --local-url http://127.0.0.1:11434 --local-model qwen2.5:1.5b-instruct-q4_K_M
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clients import get_cohere_http
+from fakes import FakeStreamingLLMServer
+
+from local_service import percentiles
+from llm_backends import CohereBackend, LocalBackend, get_llm_backend
+from prompts import interview_questions_prompt, parse_interview_questions
+
+
+PROFILE = {"name": "Jane Doe", "role": "Data Scientist", "experience": "3", "skills": "Python, SQL, TensorFlow"}
+
+
+def measure(backend, requests, concurrency):
+    prompt = interview_questions_prompt(PROFILE)
+    first_token, complete = [], []
+    for _ in range(requests):
+        start = time.perf_counter()
+        first = None
+        text = ""
+        for chunk in backend.stream(prompt, max_tokens=150, temperature=0.7):
+            if first is None:
+                first = time.perf_counter() - start
+            text += chunk
+        complete.append((time.perf_counter() - start) * 1000)
+        first_token.append(first * 1000)
+        assert len(parse_interview_questions(text)) == 5, text
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        texts = list(pool.map(lambda _: backend.generate(prompt, max_tokens=150, temperature=0.7), range(requests)))
+    wall = time.perf_counter() - start
+    return {
+        "first_token": percentiles(first_token),
+        "complete": percentiles(complete),
+        "per_s": requests / wall,
+        "chars_per_s": sum(map(len, texts)) / wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=8, help="generations per backend and phase")
+    parser.add_argument("--concurrency", type=int, default=4, help="parallel requests in the throughput phase")
+    parser.add_argument("--tokens", type=int, default=60, help="tokens per fake answer")
+    parser.add_argument("--wan-rtt", type=float, default=0.15, help="fake hosted API round trip in seconds")
+    parser.add_argument("--hosted-token-delay", type=float, default=0.015, help="fake hosted seconds per token")
+    parser.add_argument("--local-token-delay", type=float, default=0.03, help="fake local seconds per token")
+    parser.add_argument("--local-slots", type=int, default=1, help="answers the fake local model generates at once")
+    parser.add_argument("--cohere-key", default=os.environ.get("COHERE_API_KEY"), help="measure the real Cohere API")
+    parser.add_argument("--local-url", help="measure a real Ollama-compatible server")
+    parser.add_argument("--local-model", default=None, help="model name on the local server")
+    args = parser.parse_args()
+
+    servers = []
+    if args.cohere_key:
+        hosted = get_llm_backend({"backend": "cohere", "api_key": args.cohere_key})
+    else:
+        import cohere
+
+        server = FakeStreamingLLMServer(args.tokens, 0.2, args.hosted_token_delay, network_delay=args.wan_rtt)
+        servers.append(server)
+        hosted = CohereBackend(cohere.Client("fake-key", base_url=server.url), get_cohere_http("fake-key", server.url))
+    if args.local_url:
+        settings = {"backend": "local", "url": args.local_url}
+        if args.local_model:
+            settings["model"] = args.local_model
+        local = get_llm_backend(settings)
+    else:
+        server = FakeStreamingLLMServer(args.tokens, 0.1, args.local_token_delay, slots=args.local_slots)
+        servers.append(server)
+        local = LocalBackend(server.url, "fake-model")
+
+    print(f"{args.requests} question sets per backend, throughput at {args.concurrency} concurrent requests"
+          f"{'' if args.cohere_key and args.local_url else ' (fake servers)'}")
+    print(f"{'backend':8} {'first token p50/p90 ms':>24} {'complete p50/p90 ms':>22} {'sets/s':>8} {'chars/s':>9}")
+    for backend in (hosted, local):
+        result = measure(backend, args.requests, args.concurrency)
+        print(f"{backend.name:8} {result['first_token']['p50']:11.0f} /{result['first_token']['p90']:7.0f}"
+              f"   {result['complete']['p50']:11.0f} /{result['complete']['p90']:7.0f}"
+              f"   {result['per_s']:7.2f} {result['chars_per_s']:9.0f}")
+    for server in servers:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Scrubbing the timeline navigator: a Firestore get() per slider move versus NotesCache
+
+Also checks that saves write through, that a note written by another
+session reaches the cache through the change listener, and that sessions
+share one listener per candidate with a bounded number open per process.
+
+Usage: python benchmarks/bench_notes_cache.py --moves 300 --latency 0.05
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fakes import FakeFirestore
+
+import notes_cache
+from notes_cache import NotesCache, get_notes_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--moves", type=int, default=300, help="slider positions visited")
+    parser.add_argument("--notes", type=int, default=50, help="notes already stored for the candidate")
+    parser.add_argument("--latency", type=float, default=0.05, help="Firestore round trip in seconds")
+    args = parser.parse_args()
+
+    db = FakeFirestore(latency=0)
+    notes = db.collection("stress_analysis").document("Jane Doe").collection("notes")
+    start_time = 1700000000
+    for i in range(args.notes):
+        timestamp = start_time + i * 60
+        notes.document(str(timestamp)).set({"text": f"note {i}", "timestamp": timestamp})
+    rng = random.Random(0)
+    moves = [start_time + rng.randrange(args.notes * 60) for _ in range(args.moves)]
+    db.latency = args.latency
+
+    db.round_trips = 0
+    start = time.perf_counter()
+    for timestamp in moves:
+        doc = notes.document(str(timestamp)).get()
+        doc.to_dict().get('text', '') if doc.exists else ''
+    legacy_s = time.perf_counter() - start
+    legacy_trips = db.round_trips
+
+    db.round_trips = 0
+    start = time.perf_counter()
+    cache = NotesCache(db, "Jane Doe")
+    load_trips = db.round_trips
+    for timestamp in moves:
+        cache.get(timestamp)
+    cached_s = time.perf_counter() - start
+    scrub_trips = db.round_trips - load_trips
+
+    cache.save(start_time + 5, "saved from this session")
+    assert cache.get(start_time + 5) == "saved from this session"
+    notes.document(str(start_time)).set({"text": "edited elsewhere", "timestamp": start_time})
+    notes.document(str(start_time + 60)).delete()
+    assert cache.get(start_time) == "edited elsewhere"
+    assert cache.get(start_time + 60) == ""
+    assert len(cache.items()) == args.notes
+    cache.close()
+    assert not db.watchers, "closed cache kept its listener"
+
+    # Many sessions over more candidates than the shared cache keeps
+    sessions = [f"Candidate {i % (notes_cache.NOTES_CACHE_SIZE * 2)}" for i in range(200)]
+    shared = {name: get_notes_cache(db, name) for name in sessions[:notes_cache.NOTES_CACHE_SIZE]}
+    assert all(get_notes_cache(db, name) is shared[name] for name in shared), "sessions did not share the cache"
+    for name in sessions:
+        get_notes_cache(db, name)
+    open_watches = len(db.watchers)
+    assert open_watches == notes_cache.NOTES_CACHE_SIZE, open_watches
+
+    print(f"{args.moves} slider moves over {args.notes} notes, {args.latency * 1000:.0f} ms round trips")
+    print(f"get() per move: {legacy_s:7.2f}s  {legacy_trips} round trips")
+    print(f"NotesCache:     {cached_s:7.2f}s  {load_trips} round trips to load, {scrub_trips} while scrubbing")
+    print(f"write-through and listener updates verified, cache stats {cache.stats}")
+    print(f"{len(sessions)} sessions over {len(set(sessions))} candidates: {open_watches} listeners open")
+
+
+if __name__ == "__main__":
+    main()
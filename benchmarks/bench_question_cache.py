@@ -0,0 +1,87 @@
+"""Interview questions for a hiring round: a Cohere call per request versus QuestionCache
+
+Profiles follow a typical round, a few roles each hiring for a few skill
+sets. Every candidate is visited twice and must get the same questions on
+the second visit without another LLM call.
+
+Usage: python benchmarks/bench_question_cache.py --candidates 500 --latency 1.5
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fakes import FakeCohere
+
+from question_cache import QuestionCache, question_signature
+
+
+ROLE_SKILLS = {
+    "Data Scientist": ["Python, SQL, Pandas", "Python, TensorFlow, Statistics", "R, SQL, Tableau"],
+    "Backend Engineer": ["Java, Spring, SQL", "Go, Docker, Kubernetes", "Python, Django, PostgreSQL"],
+    "Frontend Engineer": ["React, TypeScript, CSS", "Vue, JavaScript, HTML"],
+    "ML Engineer": ["Python, PyTorch, Docker", "Python, TensorFlow, AWS"],
+    "DevOps Engineer": ["AWS, Terraform, Kubernetes", "Docker, Jenkins, Linux"],
+}
+
+
+def round_profiles(n, seed=0):
+    rng = random.Random(seed)
+    profiles = []
+    for i in range(n):
+        role = rng.choice(list(ROLE_SKILLS))
+        skills = [s.strip() for s in rng.choice(ROLE_SKILLS[role]).split(",")]
+        rng.shuffle(skills)
+        profiles.append({
+            "name": f"Candidate {i}",
+            "role": role if rng.random() < 0.7 else f"  {role.lower()} ",
+            "skills": ", ".join(skills),
+            "experience": str(rng.randint(0, 15)),
+        })
+    return profiles
+
+
+def request_questions(co, profile):
+    # Same call and parsing as app.request_interview_questions
+    prompt = f"Generate five interview questions for a candidate applying as {profile.get('role', 'N/A')} with {profile.get('experience', 'N/A')} years of experience and skills in {profile.get('skills', 'N/A')}."
+    response = co.generate(model="command", prompt=prompt, max_tokens=150, temperature=0.7)
+    questions = [q.strip() for q in response.generations[0].text.strip().split("\n") if q.strip()]
+    return questions[:5]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=1.5, help="seconds per Cohere generate call")
+    parser.add_argument("--variants", type=int, default=3)
+    args = parser.parse_args()
+
+    profiles = round_profiles(args.candidates)
+    requests = profiles + profiles
+    signatures = len({question_signature(p) for p in profiles})
+
+    co = FakeCohere(latency=0)
+    with tempfile.TemporaryDirectory(prefix="bench-questions-") as directory:
+        cache = QuestionCache(os.path.join(directory, "questions.sqlite3"), variants=args.variants)
+        first_visit = {}
+        for profile in requests:
+            questions = cache.get_or_generate(profile, lambda p: request_questions(co, p))
+            assert first_visit.setdefault(profile["name"], questions) == questions, "revisit got other questions"
+        stats = cache.stats()
+        cache.close()
+    assert stats["misses"] <= len(profiles), "a revisit generated again"
+
+    uncached_s = len(requests) * args.latency
+    cached_s = stats["misses"] * args.latency + stats["hit_s"]
+    print(f"{len(requests)} requests for {len(profiles)} candidates, {signatures} distinct signatures, "
+          f"{args.variants} variants each, {args.latency:.1f}s per LLM call")
+    print(f"no cache:      {len(requests)} LLM calls, {uncached_s / 60:6.1f} min waiting")
+    print(f"QuestionCache: {stats['misses']} LLM calls, {cached_s / 60:6.1f} min waiting, "
+          f"hit ratio {stats['hit_ratio']:.0%}, mean hit {stats['mean_hit_us']:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Questions ready when the expert opens a candidate: on-demand generation versus QuestionPrefetcher
+
+Syncs a round of candidates through the fake Cohere client, rate limited to
+a few concurrent requests, and has the expert open candidates one after
+another starting right after the sync. Reports how long the expert waits
+for questions with and without background pre-generation.
+
+Usage: python benchmarks/bench_question_prefetch.py --candidates 60 --latency 0.5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_question_cache import request_questions, round_profiles
+from fakes import FakeCohere
+
+from local_service import percentiles
+from question_cache import QuestionCache
+from question_prefetch import QuestionPrefetcher
+
+
+def expert_session(profiles, questions_for, fallback, think_time):
+    # The expert opens each candidate in turn and spends think_time on it
+    waits = []
+    for profile in profiles:
+        start = time.perf_counter()
+        if questions_for(profile) is None:
+            fallback(profile)
+        waits.append(time.perf_counter() - start)
+        time.sleep(think_time)
+    return waits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per Cohere generate call")
+    parser.add_argument("--rate-limit", type=int, default=4, help="concurrent calls the API key allows")
+    parser.add_argument("--workers", type=int, default=6)
+    parser.add_argument("--think", type=float, default=0.2, help="seconds the expert spends per candidate")
+    args = parser.parse_args()
+    profiles = round_profiles(args.candidates, seed=1)
+    with tempfile.TemporaryDirectory(prefix="bench-prefetch-") as workdir:
+        co = FakeCohere(latency=args.latency, max_concurrent=args.rate_limit)
+        cache = QuestionCache(os.path.join(workdir, "on-demand.sqlite3"))
+        on_demand = expert_session(
+            profiles, lambda p: None,
+            lambda p: cache.get_or_generate(p, lambda q: request_questions(co, q)), args.think
+        )
+        cache.close()
+
+        co = FakeCohere(latency=args.latency, max_concurrent=args.rate_limit)
+        cache = QuestionCache(os.path.join(workdir, "prefetch.sqlite3"))
+        stored = {}
+        prefetcher = QuestionPrefetcher(
+            lambda p: request_questions(co, p), cache=cache,
+            store=lambda p, q: stored.__setitem__(p["name"], q),
+            max_workers=args.workers, base_delay=0.1, max_delay=2.0
+        )
+        start = time.perf_counter()
+        prefetcher.submit(profiles)
+
+        def wait_for_prefetch(profile):
+            while prefetcher.status(profile["name"]) == "pending":
+                time.sleep(0.005)
+
+        prefetched = expert_session(
+            profiles, prefetcher.questions_for, wait_for_prefetch, args.think
+        )
+        prefetcher.join()
+        all_ready_s = time.perf_counter() - start
+        stats = prefetcher.stats()
+        # Opening a candidate on demand later gives the set the prefetcher picked for them
+        assert all(cache.get(p) == prefetcher.questions_for(p) for p in profiles), "variant differs on demand"
+        # A resync that changes a candidate's skills must not keep showing the old questions
+        edited = dict(profiles[0], skills="COBOL, Fortran")
+        prefetcher.submit([edited])
+        assert prefetcher.questions_for(profiles[0]) is None, "questions for the old profile still served"
+        prefetcher.join()
+        assert prefetcher.questions_for(edited) == cache.get(edited)
+        cache.close()
+
+    print(f"{args.candidates} candidates, {args.latency:.1f}s per call, {args.rate_limit} concurrent calls allowed, "
+          f"{args.workers} prefetch workers")
+    for label, waits in (("on demand", on_demand), ("prefetched", prefetched)):
+        p = percentiles(waits)
+        print(f"{label:>10}: expert waits {sum(waits):6.1f}s in total, p50 {p['p50'] * 1000:6.0f} ms, "
+              f"p90 {p['p90'] * 1000:6.0f} ms, ready on open {sum(w < 0.01 for w in waits) / len(waits):.0%}")
+    print(f"prefetch finished {all_ready_s:.1f}s after the sync: {stats['generated']} generated, "
+          f"{stats['cached']} from the cache, {stats['retries']} rate-limit retries, {stats['failed']} failed, "
+          f"{len(stored)} stored with the profile")
+
+
+if __name__ == "__main__":
+    main()
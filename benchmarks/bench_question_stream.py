@@ -0,0 +1,88 @@
+"""Time until interview questions appear: blocking generate() versus streaming tokens
+
+Runs the Cohere SDK and the streaming REST client against a local fake server
+that sends one token every --token-delay seconds after a --first-token delay.
+Also checks that closing a stream part way, as Streamlit does when the user
+navigates away, or setting its cancel event stops the server from generating the rest.
+
+Usage: python benchmarks/bench_question_stream.py --requests 10 --tokens 60
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from contextlib import closing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clients import get_cohere_http
+from fakes import FakeStreamingLLMServer
+
+from local_service import percentiles
+from llm_stream import cohere_stream, stream_metrics
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=10, help="generations of each kind")
+    parser.add_argument("--tokens", type=int, default=60, help="tokens per answer")
+    parser.add_argument("--first-token", type=float, default=0.3, help="seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds between later tokens")
+    args = parser.parse_args()
+
+    import cohere
+
+    server = FakeStreamingLLMServer(args.tokens, args.first_token, args.token_delay)
+    co = cohere.Client("fake-key", base_url=server.url)
+    http = get_cohere_http("fake-key", server.url)
+    prompt = "Generate five interview questions for a Data Scientist with 3 years of experience."
+
+    blocking = []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        text = co.generate(model="command", prompt=prompt, max_tokens=150).generations[0].text
+        blocking.append((time.perf_counter() - start) * 1000)
+
+    for _ in range(args.requests):
+        streamed = "".join(cohere_stream(http, prompt, max_tokens=150))
+        assert streamed == text, "streamed text differs from the blocking answer"
+    metrics = stream_metrics()
+
+    # The reader stops after three chunks, like a rerun interrupting st.write_stream
+    sent = server.tokens_sent
+    with closing(cohere_stream(http, prompt, max_tokens=150)) as stream:
+        for _, _ in zip(range(3), stream):
+            pass
+    assert wait_for(lambda: server.aborted == 1), "server kept streaming after the reader closed"
+    closed_tokens = server.tokens_sent - sent
+
+    sent = server.tokens_sent
+    cancel = threading.Event()
+    for i, _ in enumerate(cohere_stream(http, prompt, max_tokens=150, cancel=cancel)):
+        if i == 2:
+            cancel.set()
+    assert wait_for(lambda: server.aborted == 2), "server kept streaming after cancel was set"
+    cancelled_tokens = server.tokens_sent - sent
+    server.close()
+
+    first_token, total = metrics["first_token_ms"], metrics["total_ms"]
+    print(f"{args.requests} requests of {args.tokens} tokens, first after {args.first_token * 1000:.0f} ms, "
+          f"then every {args.token_delay * 1000:.0f} ms")
+    print(f"blocking generate():  text shown after p50 {percentiles(blocking)['p50']:7.0f} ms  p90 {percentiles(blocking)['p90']:7.0f} ms")
+    print(f"streaming first token:                p50 {first_token['p50']:7.0f} ms  p90 {first_token['p90']:7.0f} ms")
+    print(f"streaming complete:                   p50 {total['p50']:7.0f} ms  p90 {total['p90']:7.0f} ms")
+    print(f"closed after 3 chunks: server sent {closed_tokens} of {args.tokens} tokens; "
+          f"cancel event: {cancelled_tokens} of {args.tokens}")
+    print(f"stream outcomes: {stream_metrics()['complete']} complete, {stream_metrics()['cancelled']} cancelled")
+
+
+if __name__ == "__main__":
+    main()
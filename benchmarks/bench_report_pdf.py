@@ -0,0 +1,142 @@
+"""Summary report export: temp file plus base64 data URI versus the in-memory, hash-cached PDF
+
+Latency and peak Python memory per export over growing interview timelines,
+then the cost of the report charts and of exporting a charted report again,
+and how many background chart builds a live recording leaves queued.
+The legacy path recomputes the summary with pandas, writes the PDF to a
+NamedTemporaryFile(delete=False), reads it back and builds the data: link.
+
+Usage: python benchmarks/bench_report_pdf.py
+"""
+import base64
+import glob
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import report_charts
+import reports
+from bench_emotion_series import entries
+from emotion_analysis import EMOTIONS
+from emotion_series import EmotionSeries
+from emotion_stats import EmotionStats
+
+
+def synthetic_timeline(n, fps=10, seed=0):
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(rng.random((n, len(EMOTIONS)), dtype=np.float32) * 100, columns=EMOTIONS)
+    frame["emotion"] = pd.Categorical.from_codes(rng.integers(0, len(EMOTIONS), n), categories=EMOTIONS)
+    frame["stress_value"] = rng.integers(1, 4, n).astype(np.int8)
+    frame["timestamp"] = 1700000000 + np.arange(n) // fps
+    stats = EmotionStats()
+    for stress, code, timestamp in zip(frame["stress_value"].tolist(), frame["emotion"].cat.codes.tolist(),
+                                       frame["timestamp"].tolist()):
+        stats.add(stress, code, timestamp)
+    return frame, stats
+
+
+class ChartColumns:
+    """The EmotionSeries columns report_charts reads, taken from a timeline DataFrame"""
+
+    def __init__(self, timeline_df):
+        self.timestamps = timeline_df["timestamp"].to_numpy()
+        self.stress_values = timeline_df["stress_value"].to_numpy()
+        self.emotion_codes = timeline_df["emotion"].cat.codes.to_numpy()
+        self.scores = timeline_df[EMOTIONS].to_numpy()
+
+
+def legacy_export(timeline_df, name):
+    summary = reports.build_summary(name, {
+        "started_at": int(timeline_df['timestamp'].min()),
+        "duration_s": int(timeline_df['timestamp'].max() - timeline_df['timestamp'].min()),
+        "avg_stress_level": float(timeline_df['stress_value'].mean()),
+        "max_stress_level": int(timeline_df['stress_value'].max()),
+        "dominant_emotion": str(timeline_df['emotion'].mode()[0]),
+        "stress_peaks": int(len(timeline_df[timeline_df['stress_value'] == 3])),
+        "relaxed_moments": int(len(timeline_df[timeline_df['stress_value'] == 1])),
+    })
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf', prefix='bench-report-') as tmp_file:
+        pdf_path = tmp_file.name
+    reports._write_pdf(summary, pdf_path)
+    with open(pdf_path, "rb") as pdf_file:
+        pdf_bytes = pdf_file.read()
+    b64_pdf = base64.b64encode(pdf_bytes).decode('utf-8')
+    return f'<a href="data:application/pdf;base64,{b64_pdf}" download="{reports.report_filename(summary)}">Download PDF Report</a>'
+
+
+def buffered_export(stats, name):
+    summary = reports.build_summary(name, stats.summary())
+    return reports.render_summary_pdf(summary)
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, len(result)
+
+
+def main():
+    leftovers = os.path.join(tempfile.gettempdir(), "bench-report-*.pdf")
+    before = set(glob.glob(leftovers))
+    # Warm ReportLab's imports and font tables so neither path pays for them
+    buffered_export(synthetic_timeline(10)[1], "warm-up")
+
+    print(f"{'samples':>9} {'legacy':>9} {'peak':>9} {'page bytes':>11} "
+          f"{'buffered':>9} {'peak':>9} {'PDF bytes':>10} {'cached':>9}")
+    for n in (10**4, 10**5, 10**6):
+        timeline_df, stats = synthetic_timeline(n)
+        name = f"Candidate {n}"
+        legacy_ms, legacy_peak, legacy_size = measure(lambda: legacy_export(timeline_df, name))
+        buffered_ms, buffered_peak, pdf_size = measure(lambda: buffered_export(stats, name))
+        cached_ms, _, _ = measure(lambda: buffered_export(stats, name))
+        print(f"{n:>9} {legacy_ms:>7.1f}ms {legacy_peak / 1e6:>7.2f}MB {legacy_size:>11} "
+              f"{buffered_ms:>7.1f}ms {buffered_peak / 1e6:>7.2f}MB {pdf_size:>10} {cached_ms:>7.3f}ms")
+
+    # Charts are drawn once per interview by report_charts' background pool, then reused
+    timeline_df, stats = synthetic_timeline(10**5)
+    summary = reports.build_summary("Charted candidate", stats.summary())
+    start = time.perf_counter()
+    charts = report_charts.build_charts(("bench", 10**5), ChartColumns(timeline_df))
+    draw_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    charted_size = len(reports.render_summary_pdf(summary, charts))
+    first_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    reports.render_summary_pdf(summary, charts)
+    again_ms = (time.perf_counter() - start) * 1000
+    print(f"with charts at 100000 samples: drawing {draw_ms:.1f}ms (background), "
+          f"first export {first_ms:.1f}ms, repeat {again_ms:.3f}ms, {charted_size} bytes")
+
+    # Every rerun of a live recording asks for the charts of the newest version
+    series = EmotionSeries(candidate_name="Live candidate")
+    samples = entries(50 * 200)
+    futures = []
+    for _ in range(50):
+        series.extend(next(samples) for _ in range(200))
+        futures.append(report_charts.prefetch_charts((series.candidate_name, series.uid, series.version), series))
+    futures[-1].result()
+    built = sum(not future.cancelled() for future in futures)
+    assert EmotionSeries().uid != series.uid
+    print(f"live recording, 50 reruns with new samples: {built} chart builds run, "
+          f"{len(futures) - built} superseded builds cancelled")
+
+    left = set(glob.glob(leftovers)) - before
+    print(f"temp files left behind by the legacy path: {len(left)}")
+    for path in left:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Compare the per-row candidate sync with the batched, column-resolved pipeline
+
+Usage: python benchmarks/bench_sheet_sync.py --rows 10000 --latency 0.002
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fakes import FakeFirestore, FakeSheetsService, synthetic_sheet
+from sheets_sync import CandidateSync, build_profiles, iter_profile_pages, resolve_columns
+
+
+def sync_all(db, profiles, **kwargs):
+    # The app's write path: one CandidateSync fed all profiles at once
+    sync = CandidateSync(db, **kwargs)
+    sync.add(profiles)
+    return sync.finish()
+
+
+def legacy_sync(service, db, spreadsheet_id):
+    # The original fetch_sheet_data loop: header scan and one write per row
+    sheet_name = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()['sheets'][0]['properties']['title']
+    rows = service.spreadsheets().values().get(spreadsheetId=spreadsheet_id, range=sheet_name).execute().get('values', [])
+    headers = rows[0]
+    candidates = []
+    for row in rows[1:]:
+        row_data = row + [''] * (len(headers) - len(row))
+        columns = resolve_columns(headers)
+        profile_data = {f: row_data[i] if i >= 0 else "Unknown" for f, i in columns.items()}
+        if profile_data["name"] and profile_data["name"] != "Unknown":
+            db.collection("candidates").document(profile_data["name"]).set(profile_data)
+            candidates.append(profile_data)
+    return candidates
+
+
+def batched_sync(service, db, spreadsheet_id, max_workers):
+    sheet_name = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()['sheets'][0]['properties']['title']
+    rows = service.spreadsheets().values().get(spreadsheetId=spreadsheet_id, range=sheet_name).execute().get('values', [])
+    candidates = build_profiles(rows[1:], resolve_columns(rows[0]))
+    sync_all(db, candidates, incremental=False, max_workers=max_workers)
+    return candidates
+
+
+def delta_resync(rows, latency, changed):
+    # Full sync first, then edit a fraction of the rows and resync incrementally
+    db = FakeFirestore(latency)
+    columns = resolve_columns(rows[0])
+    sync_all(db, build_profiles(rows[1:], columns))
+    # Questions stored on a candidate whose row is edited must survive the resync
+    questions_doc = db.collection("candidates").document(rows[1][1])
+    questions_doc.set({"questions": ["Q1"]}, merge=True)
+    edited = [rows[0]] + [list(r) for r in rows[1:]]
+    for i in range(1, len(edited), max(1, len(edited) // max(1, changed))):
+        edited[i][6] = str(int(edited[i][6]) + 1)
+    db.round_trips = 0
+    start = time.perf_counter()
+    report = sync_all(db, build_profiles(edited[1:], columns))
+    elapsed = time.perf_counter() - start
+    assert questions_doc.get().to_dict().get("questions") == ["Q1"], "resync dropped the stored questions"
+    print(f"{'incremental resync':<28} {elapsed:8.2f}s  {report}  {db.round_trips} round trips")
+
+
+def streamed_sync(service, latency):
+    # Paged reads feeding the incremental writer, tracking first-page latency and peak memory
+    # Written documents are dropped so only the ingestion path is measured
+    db = FakeFirestore(latency, keep_documents=False)
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_page = None
+    count = 0
+    sync = CandidateSync(db)
+    for profiles, _, _ in iter_profile_pages(service, "bench"):
+        sync.add(profiles)
+        count += len(profiles)
+        if first_page is None:
+            first_page = time.perf_counter() - start
+    sync.finish()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{'paged streaming sync':<28} {elapsed:8.2f}s  first page after {first_page * 1000:.0f} ms, "
+          f"peak {peak / 2**20:.1f} MiB for {count} profiles")
+
+
+def full_read_memory(service):
+    tracemalloc.start()
+    rows = service.spreadsheets().values().get(spreadsheetId="bench", range=service.title).execute()["values"]
+    profiles = build_profiles(rows[1:], resolve_columns(rows[0]))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{'single-range read':<28} peak {peak / 2**20:.1f} MiB for {len(profiles)} profiles")
+
+
+def run(label, fn):
+    start = time.perf_counter()
+    db, count = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.2f}s  {count / elapsed:10.0f} rows/s  {db.round_trips:6d} round trips")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.002, help="simulated Firestore round trip in seconds")
+    parser.add_argument("--skip-legacy", action="store_true")
+    parser.add_argument("--changes", type=int, default=100, help="rows edited before the incremental resync")
+    args = parser.parse_args()
+
+    service = FakeSheetsService(synthetic_sheet(args.rows))
+
+    def legacy():
+        db = FakeFirestore(args.latency)
+        return db, len(legacy_sync(service, db, "bench"))
+
+    def batched(workers):
+        def fn():
+            db = FakeFirestore(args.latency)
+            return db, len(batched_sync(service, db, "bench", workers))
+        return fn
+
+    print(f"{args.rows} rows, {args.latency * 1000:.1f} ms per Firestore round trip")
+    if not args.skip_legacy:
+        run("per-row writes", legacy)
+    for workers in (1, 4, 8):
+        run(f"batched, {workers} worker(s)", batched(workers))
+    delta_resync(service.rows, args.latency, args.changes)
+    full_read_memory(service)
+    streamed_sync(service, args.latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Session memory and slider cost of inline base64 snapshots versus snapshot store references
+
+Also checks that retention keeps the store directory under its size limit.
+
+Usage: python benchmarks/bench_snapshot_store.py --minutes 60 --fps 5
+"""
+import argparse
+import base64
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from emotion_analysis import EMOTIONS
+from snapshot_store import SnapshotStore
+
+
+def jpeg_frames(count, size=(480, 640)):
+    import cv2
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    blocks = rng.integers(40, 200, (size[0] // 20, size[1] // 20, 3), dtype=np.uint8)
+    base = blocks.repeat(20, axis=0).repeat(20, axis=1)
+    for i in range(count):
+        frame = np.roll(base, i, axis=1)
+        yield cv2.imencode('.jpg', frame)[1].tobytes()
+
+
+def scrub_cost(frames, steps=200):
+    # Per-rerun work of the navigator before and after the display tier and LRU cache
+    import cv2
+    import numpy as np
+
+    encoded = [base64.b64encode(frame).decode("utf-8") for frame in frames[:20]]
+    start = time.perf_counter()
+    for i in range(steps):
+        image = cv2.imdecode(np.frombuffer(base64.b64decode(encoded[i % 20]), np.uint8), cv2.IMREAD_COLOR)
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    inline_ms = (time.perf_counter() - start) * 1000 / steps
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SnapshotStore(directory)
+        refs = []
+        for frame in frames[:20]:
+            refs.append(store.put_snapshot(cv2.imdecode(np.frombuffer(frame, np.uint8), cv2.IMREAD_COLOR)))
+        start = time.perf_counter()
+        for i in range(steps):
+            store.get(refs[i % 20])
+        store_ms = (time.perf_counter() - start) * 1000 / steps
+        store.close()
+    return inline_ms, store_ms
+
+
+def retention(frames, count, max_bytes=8 * 2**20, segment_bytes=2**20):
+    # Distinct snapshots for a whole interview written to a store capped at max_bytes
+    with tempfile.TemporaryDirectory() as directory:
+        store = SnapshotStore(directory, max_bytes=max_bytes, segment_bytes=segment_bytes, idle_grace=0)
+        refs = [store.put(frames[i % len(frames)] + i.to_bytes(4, "big")) for i in range(count)]
+        store.close()
+        on_disk = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        assert on_disk <= max_bytes + segment_bytes, on_disk
+        assert store.get(refs[-1]) is not None
+        kept = sum(store.get(ref) is not None for ref in refs[::max(1, count // 500)]) / len(refs[::max(1, count // 500)])
+    written = sum(len(frames[i % len(frames)]) + 4 for i in range(count))
+    return on_disk, written, kept
+
+
+def entry(i):
+    scores = {emotion: 100.0 / len(EMOTIONS) for emotion in EMOTIONS}
+    return dict(scores, emotion="neutral", stress_value=1, stress_level="Low", timestamp=1700000000 + i)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--fps", type=float, default=5)
+    args = parser.parse_args()
+    count = int(args.minutes * 60 * args.fps)
+    frames = list(jpeg_frames(min(count, 500)))
+
+    tracemalloc.start()
+    inline = []
+    for i in range(count):
+        inline.append(dict(entry(i), image=base64.b64encode(frames[i % len(frames)]).decode("utf-8")))
+    inline_bytes = tracemalloc.get_traced_memory()[0]
+    del inline
+    tracemalloc.stop()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SnapshotStore(directory)
+        refs = [store.put(frame) for frame in frames]
+        tracemalloc.start()
+        referenced = [dict(entry(i), image_ref=refs[i % len(refs)]) for i in range(count)]
+        ref_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for i in range(0, count, max(1, count // 200)):
+            store.get(referenced[i]["image_ref"])
+        fetch_ms = (time.perf_counter() - start) * 1000 / min(count, 200)
+        store.close()
+
+    scrub_inline, scrub_store = scrub_cost(frames)
+    retained, written, kept = retention(frames, count)
+
+    print(f"{count} samples, mean JPEG {sum(map(len, frames)) / len(frames) / 1024:.1f} KiB")
+    print(f"inline base64 emotion_data: {inline_bytes / 2**20:8.1f} MiB")
+    print(f"referenced emotion_data:    {ref_bytes / 2**20:8.1f} MiB  (x{inline_bytes / ref_bytes:.0f} smaller)")
+    print(f"slider fetch of one snapshot: {fetch_ms:.3f} ms")
+    print(f"scrub step, base64 + imdecode + cvtColor: {scrub_inline:.2f} ms")
+    print(f"scrub step, cached display-tier JPEG:     {scrub_store:.3f} ms")
+    print(f"retention: {written / 2**20:.1f} MiB written, {retained / 2**20:.1f} MiB kept on disk, "
+          f"{kept:.0%} of snapshots (the newest) still readable")
+
+
+if __name__ == "__main__":
+    main()
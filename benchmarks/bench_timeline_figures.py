@@ -0,0 +1,74 @@
+"""Timeline figure payload and build time: every raw sample versus the downsampled traces
+
+The payload is the JSON of the trace data the browser receives. With Plotly
+installed the real figures from create_emotion_timeline's downsampling are
+serialised, otherwise the x/y arrays alone are.
+
+Usage: python benchmarks/bench_timeline_figures.py --fps 10
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from downsample import POINT_BUDGET, lttb_indices, minmax_indices
+from emotion_analysis import EMOTIONS
+
+
+def synthetic_columns(n, fps, seed=0):
+    # Slowly drifting emotion intensities with a few short stress spikes
+    rng = np.random.default_rng(seed)
+    scores = np.abs(np.cumsum(rng.normal(scale=0.5, size=(n, len(EMOTIONS))), axis=0)) % 100
+    stress = np.clip(np.round(2 + np.cumsum(rng.normal(scale=0.05, size=n))), 1, 3).astype(np.int8)
+    stress[rng.integers(0, n, size=max(n // 5000, 1))] = 3
+    timestamps = 1700000000 + np.arange(n) // fps
+    return scores.astype(np.float32), stress, timestamps
+
+
+def payload_bytes(times, traces):
+    try:
+        import plotly.graph_objects as go
+    except ImportError:
+        return sum(len(json.dumps({"x": times[kept].astype(str).tolist(), "y": values[kept].tolist()}))
+                   for values, kept in traces)
+    figure = go.Figure([go.Scatter(x=times[kept], y=values[kept]) for values, kept in traces])
+    return len(figure.to_json())
+
+
+def build(scores, stress, timestamps, budget):
+    times = timestamps.astype("datetime64[s]")
+    traces = [(stress, minmax_indices(stress, budget) if budget else np.arange(len(stress)))]
+    for column in range(scores.shape[1]):
+        values = scores[:, column]
+        traces.append((values, lttb_indices(values, budget) if budget else np.arange(len(values))))
+    return times, traces
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fps", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'duration':>9} {'samples':>8} {'raw points':>11} {'raw JSON':>10} "
+          f"{'points':>7} {'JSON':>9} {'downsample':>11} {'peaks kept':>11}")
+    for minutes in (10, 30, 60, 120):
+        n = minutes * 60 * args.fps
+        scores, stress, timestamps = synthetic_columns(n, args.fps)
+        times, raw = build(scores, stress, timestamps, None)
+        start = time.perf_counter()
+        times, reduced = build(scores, stress, timestamps, POINT_BUDGET)
+        elapsed = time.perf_counter() - start
+        stress_values, kept = reduced[0]
+        peaks = bool((stress_values[kept] == 3).any())
+        print(f"{minutes:>7}min {n:>8} {sum(len(k) for _, k in raw):>11} "
+              f"{payload_bytes(times, raw) / 1e6:>8.1f}MB {sum(len(k) for _, k in reduced):>7} "
+              f"{payload_bytes(times, reduced) / 1e3:>7.0f}kB {elapsed * 1000:>9.1f}ms {'yes' if peaks else 'no':>11}")
+
+
+if __name__ == "__main__":
+    main()
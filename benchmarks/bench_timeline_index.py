@@ -0,0 +1,45 @@
+"""Navigator rerun latency: pandas argsort nearest lookup versus TimelineIndex
+
+Usage: python benchmarks/bench_timeline_index.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timeline_index import TimelineIndex
+
+
+def samples(n, fps=10, start=1700000000):
+    # Only the fields the lookup touches, 10 samples per second share a timestamp
+    return [{"timestamp": start + i // fps, "stress_value": 1 + i % 3} for i in range(n)]
+
+
+def per_call_ms(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1000
+
+
+def main():
+    import pandas as pd
+
+    print(f"{'samples':>9} {'argsort':>10} {'nearest':>10} {'window':>10} {'sync +1':>10}")
+    for n in (10**4, 10**5, 10**6):
+        data = samples(n)
+        timeline_df = pd.DataFrame(data)
+        target = data[n // 3]["timestamp"]
+        index = TimelineIndex(data)
+        legacy = per_call_ms(lambda: timeline_df.iloc[(timeline_df['timestamp'] - target).abs().argsort()[0]], 3)
+        nearest = per_call_ms(lambda: index.nearest(target), 1000)
+        window = per_call_ms(lambda: index.window_stats(target - 30, target + 30), 1000)
+
+        def append_one():
+            data.append({"timestamp": data[-1]["timestamp"] + 1, "stress_value": 2})
+            index.sync(data)
+        sync = per_call_ms(append_one, 100)
+        assert index.nearest(target) is data[(target - data[0]["timestamp"]) * 10]
+        print(f"{n:>9} {legacy:>8.2f}ms {nearest:>8.4f}ms {window:>8.4f}ms {sync:>8.4f}ms")
+
+
+if __name__ == "__main__":
+    main()
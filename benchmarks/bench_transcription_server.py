@@ -0,0 +1,141 @@
+"""Transcribing recorded answers: a process and model load per answer versus the transcription server
+
+A stub model stands in for Whisper: loading it takes --load seconds and
+transcribing burns --rtf seconds of CPU per second of audio. The legacy path
+starts a new process per answer, like `ollama run whisper`, which pays the
+load every time. The server loads once per worker and serves --clients
+concurrent candidates. Each transcript is checked against its answer.
+
+Usage: python benchmarks/bench_transcription_server.py --answers 12 --clients 3 --workers 2
+"""
+import argparse
+import functools
+import os
+import secrets
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from local_service import percentiles
+from speech_to_text import build_transcript, to_model_audio
+from transcription_server import TranscriptionClient, TranscriptionServer
+
+
+RECORD_RATE = 44100
+# A fresh key per run, the server refuses to start without one
+AUTHKEY = secrets.token_bytes(32)
+
+
+def stub_warm_up(load_s):
+    time.sleep(load_s)
+
+
+def stub_transcribe(audio, sample_rate, rtf):
+    start = time.perf_counter()
+    # The answer number is encoded in the first sample
+    answer = int(np.asarray(audio).ravel()[0])
+    samples = to_model_audio(audio, sample_rate)
+    audio_s = len(samples) / 16000
+    deadline = time.process_time() + audio_s * rtf
+    while time.process_time() < deadline:
+        pass
+    return build_transcript(f"answer {answer}", audio_s, (time.perf_counter() - start) * 1000)
+
+
+def recorded_answer(answer, seconds):
+    audio = np.random.default_rng(answer).integers(-3000, 3000, (int(seconds * RECORD_RATE), 1), dtype=np.int16)
+    audio[0, 0] = answer
+    return audio
+
+
+def one_shot(args):
+    # What the legacy path runs per answer: load the model, transcribe, exit
+    stub_warm_up(args.load)
+    print(stub_transcribe(recorded_answer(args.one_shot, args.seconds), RECORD_RATE, args.rtf)["text"])
+
+
+def run_sessions(answers, clients, transcribe):
+    latencies = []
+    mismatches = []
+    lock = threading.Lock()
+
+    def session(share):
+        for answer in share:
+            start = time.perf_counter()
+            text = transcribe(answer)
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+                if text != f"answer {answer}":
+                    mismatches.append((answer, text))
+
+    threads = [threading.Thread(target=session, args=(answers[i::clients],)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not mismatches, f"transcripts returned to the wrong answers: {mismatches[:3]}"
+    return time.perf_counter() - start, percentiles(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--answers", type=int, default=12)
+    parser.add_argument("--clients", type=int, default=3, help="candidates answering at the same time")
+    parser.add_argument("--workers", type=int, default=2, help="server model processes")
+    parser.add_argument("--seconds", type=float, default=10.0, help="length of each recorded answer")
+    parser.add_argument("--load", type=float, default=2.0, help="stub model load time in seconds")
+    parser.add_argument("--rtf", type=float, default=0.03, help="stub CPU seconds per second of audio")
+    parser.add_argument("--one-shot", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.one_shot is not None:
+        one_shot(args)
+        return
+
+    answers = list(range(1, args.answers + 1))
+
+    def legacy(answer):
+        command = [sys.executable, os.path.abspath(__file__), "--one-shot", str(answer),
+                   "--seconds", str(args.seconds), "--load", str(args.load), "--rtf", str(args.rtf)]
+        return subprocess.run(command, capture_output=True, text=True, check=True).stdout.strip()
+
+    legacy_s, legacy_p = run_sessions(answers, args.clients, legacy)
+
+    server = TranscriptionServer(
+        ("127.0.0.1", 0),
+        AUTHKEY,
+        workers=args.workers,
+        queue_timeout=60,
+        transcribe_fn=functools.partial(stub_transcribe, rtf=args.rtf),
+        initializer=functools.partial(stub_warm_up, args.load),
+    )
+    load_ms = server.warm()
+    server.start()
+    sessions = threading.local()
+
+    def persistent(answer):
+        if not hasattr(sessions, "client"):
+            sessions.client = TranscriptionClient(server.address, AUTHKEY)
+        return sessions.client.transcribe(recorded_answer(answer, args.seconds), RECORD_RATE)["text"]
+
+    server_s, server_p = run_sessions(answers, args.clients, persistent)
+    stats = server.stats()
+    server.close()
+
+    print(f"{args.answers} answers of {args.seconds:.0f}s from {args.clients} concurrent candidates, "
+          f"stub model loads in {args.load:.1f}s")
+    print(f"{'':22} {'answers/s':>10} {'p50 ms':>9} {'p90 ms':>9}")
+    print(f"{'process per answer':22} {args.answers / legacy_s:>10.2f} {legacy_p['p50']:>9.0f} {legacy_p['p90']:>9.0f}")
+    print(f"{'transcription server':22} {args.answers / server_s:>10.2f} {server_p['p50']:>9.0f} {server_p['p90']:>9.0f}")
+    print(f"server: model load {load_ms:.0f} ms once for {args.workers} workers, inference p50 "
+          f"{stats['inference']['p50']:.0f} ms, realtime factor {stats['realtime_factor']:.3f}, "
+          f"{stats['answers']} answers, {stats['errors']} errors, {stats['rejected']} rejected")
+
+
+if __name__ == "__main__":
+    main()
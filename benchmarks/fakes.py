@@ -0,0 +1,403 @@
+"""In-process stand-ins for the Google Sheets, Firestore and Cohere services used by the benchmarks"""
+import json
+import threading
+import time
+
+
+class _Request:
+    def __init__(self, fn, latency):
+        self._fn = fn
+        self._latency = latency
+
+    def execute(self):
+        time.sleep(self._latency)
+        return self._fn()
+
+
+class _Values:
+    def __init__(self, sheet):
+        self._sheet = sheet
+
+    def get(self, spreadsheetId, range):
+        return _Request(lambda: {"values": self._sheet.read(range)}, self._sheet.latency)
+
+
+class _Spreadsheets:
+    def __init__(self, sheet):
+        self._sheet = sheet
+
+    def get(self, spreadsheetId):
+        return _Request(self._sheet.metadata, self._sheet.latency)
+
+    def values(self):
+        return _Values(self._sheet)
+
+
+class FakeSheetsService:
+    """Serves a single in-memory sheet through the discovery-client call chain"""
+
+    def __init__(self, rows, title="Form Responses 1", latency=0.05):
+        self.rows = rows
+        self.title = title
+        self.latency = latency
+        self.calls = 0
+
+    def spreadsheets(self):
+        self.calls += 1
+        return _Spreadsheets(self)
+
+    def metadata(self):
+        return {"sheets": [{"properties": {
+            "title": self.title,
+            "gridProperties": {"rowCount": len(self.rows), "columnCount": len(self.rows[0])},
+        }}]}
+
+    def read(self, a1_range):
+        # Supports a bare sheet name and row ranges like 'Sheet'!2:1001
+        if "!" not in a1_range:
+            return [list(r) for r in self.rows]
+        rows = a1_range.split("!", 1)[1]
+        start, end = (int(part.strip("ABCDEFGHIJKLMNOPQRSTUVWXYZ") or 0) for part in rows.split(":"))
+        return [list(r) for r in self.rows[start - 1:end]]
+
+
+class _Snapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+    def get(self, field):
+        return self._data.get(field)
+
+
+class _ChangeType:
+    def __init__(self, name):
+        self.name = name
+
+
+class _Change:
+    def __init__(self, kind, snapshot):
+        self.type = _ChangeType(kind)
+        self.document = snapshot
+
+
+class _Watch:
+    def __init__(self, db, entry):
+        self._db = db
+        self._entry = entry
+
+    def unsubscribe(self):
+        with self._db._lock:
+            if self._entry in self._db.watchers:
+                self._db.watchers.remove(self._entry)
+
+
+class _Document:
+    def __init__(self, db, path):
+        self._db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name):
+        return _Collection(self._db, f"{self.path}/{name}")
+
+    def set(self, data, merge=False):
+        self._db.round_trip()
+        self._db.apply(self.path, data, merge)
+
+    def get(self):
+        self._db.round_trip()
+        return _Snapshot(self.id, self._db.docs.get(self.path))
+
+    def delete(self):
+        self._db.round_trip()
+        self._db.remove(self.path)
+
+
+class _Collection:
+    def __init__(self, db, path):
+        self._db = db
+        self.path = path
+
+    def document(self, doc_id):
+        return _Document(self._db, f"{self.path}/{doc_id}")
+
+    def select(self, fields):
+        return self
+
+    def _documents(self):
+        prefix = self.path + "/"
+        for path, data in list(self._db.docs.items()):
+            rest = path[len(prefix):]
+            if path.startswith(prefix) and "/" not in rest:
+                yield _Snapshot(rest, data)
+
+    def stream(self):
+        self._db.round_trip()
+        yield from self._documents()
+
+    def on_snapshot(self, callback):
+        # Like Firestore, the first callback lists every document as added
+        self._db.round_trip()
+        entry = (self.path, callback)
+        with self._db._lock:
+            self._db.watchers.append(entry)
+        documents = list(self._documents())
+        callback(documents, [_Change("ADDED", doc) for doc in documents], None)
+        return _Watch(self._db, entry)
+
+
+class _Batch:
+    def __init__(self, db):
+        self._db = db
+        self._writes = []
+
+    def set(self, ref, data, merge=False):
+        self._writes.append(("set", ref.path, data, merge))
+
+    def delete(self, ref):
+        self._writes.append(("delete", ref.path, None, False))
+
+    def commit(self):
+        if len(self._writes) > 500:
+            raise ValueError("A batch can contain at most 500 writes")
+        self._db.round_trip()
+        for op, path, data, merge in self._writes:
+            if op == "set":
+                self._db.apply(path, data, merge)
+            else:
+                self._db.remove(path)
+
+
+class FakeFirestore:
+    """Dictionary backed Firestore client that charges a fixed latency per round trip
+
+    Collection listeners are called synchronously on every write.
+    """
+
+    def __init__(self, latency=0.01, keep_documents=True):
+        self.latency = latency
+        self.keep_documents = keep_documents
+        self.docs = {}
+        self.watchers = []
+        self.round_trips = 0
+        self._lock = threading.Lock()
+
+    def round_trip(self):
+        with self._lock:
+            self.round_trips += 1
+        time.sleep(self.latency)
+
+    def apply(self, path, data, merge):
+        if not self.keep_documents:
+            return
+        with self._lock:
+            kind = "MODIFIED" if path in self.docs else "ADDED"
+            if merge and path in self.docs:
+                self.docs[path].update(data)
+            else:
+                self.docs[path] = dict(data)
+        self._notify(path, kind)
+
+    def remove(self, path):
+        with self._lock:
+            if self.docs.pop(path, None) is None:
+                return
+        self._notify(path, "REMOVED")
+
+    def _notify(self, path, kind):
+        parent, doc_id = path.rsplit("/", 1)
+        snapshot = _Snapshot(doc_id, self.docs.get(path))
+        with self._lock:
+            callbacks = [callback for watched, callback in self.watchers if watched == parent]
+        for callback in callbacks:
+            callback(None, [_Change(kind, snapshot)], None)
+
+    def collection(self, name):
+        return _Collection(self, name)
+
+    def batch(self):
+        return _Batch(self)
+
+
+class _Generation:
+    def __init__(self, text):
+        self.text = text
+
+
+class _GenerateResponse:
+    def __init__(self, text):
+        self.generations = [_Generation(text)]
+
+
+class TooManyRequestsError(Exception):
+    status_code = 429
+
+
+class FakeCohere:
+    """Cohere client whose generate() sleeps for a fixed latency and returns numbered questions
+
+    With max_concurrent set, calls beyond that many in flight fail with a 429
+    like a rate-limited API key.
+    """
+
+    def __init__(self, latency=1.5, max_concurrent=None):
+        self.latency = latency
+        self.max_concurrent = max_concurrent
+        self.calls = 0
+        self.rejected = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def generate(self, model, prompt, max_tokens=150, temperature=0.7, **kwargs):
+        with self._lock:
+            if self.max_concurrent is not None and self._in_flight >= self.max_concurrent:
+                self.rejected += 1
+                raise TooManyRequestsError("rate limit exceeded")
+            self._in_flight += 1
+            self.calls += 1
+            call = self.calls
+        try:
+            time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        return _GenerateResponse("\n".join(f"{i}. Question {i} ({call}) about: {prompt[-60:]}" for i in range(1, 6)))
+
+
+class FakeStreamingLLMServer:
+    """Local HTTP server answering Cohere's /v1/generate and Ollama's /api/generate
+
+    Each answer waits network_delay seconds (a WAN round trip), sends its
+    first token after first_token_delay and each later one after
+    token_delay, so a blocking call waits for all of them. With slots set,
+    at most that many answers are generated at once, like a local model
+    sharing one CPU. Streams are newline-delimited JSON events in each API's
+    format. aborted counts streams whose client disconnected early.
+    """
+
+    def __init__(self, tokens=60, first_token_delay=0.3, token_delay=0.02, network_delay=0.0, slots=None):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.tokens = tokens
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.network_delay = network_delay
+        self.requests = 0
+        self.tokens_sent = 0
+        self.aborted = 0
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(slots) if slots else None
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("content-length", 0))) or b"{}")
+                cohere = self.path.rstrip("/").endswith("/v1/generate")
+                if not cohere and not self.path.rstrip("/").endswith("/api/generate"):
+                    self.send_error(404)
+                    return
+                with fake._lock:
+                    fake.requests += 1
+                time.sleep(fake.network_delay)
+                if fake._slots is not None:
+                    fake._slots.acquire()
+                try:
+                    self._answer(body, cohere)
+                finally:
+                    if fake._slots is not None:
+                        fake._slots.release()
+
+            def _answer(self, body, cohere):
+                words = fake.words(body.get("prompt", ""))
+                if not body.get("stream"):
+                    time.sleep(fake.first_token_delay + fake.token_delay * (len(words) - 1))
+                    if cohere:
+                        payload = {"id": "fake", "generations": [{"id": "fake-0", "text": "".join(words)}]}
+                    else:
+                        payload = {"model": body.get("model"), "response": "".join(words), "done": True}
+                    self._send(json.dumps(payload).encode())
+                    return
+                self.send_response(200)
+                self.send_header("content-type", "application/stream+json" if cohere else "application/x-ndjson")
+                self.end_headers()
+                try:
+                    for i, word in enumerate(words):
+                        time.sleep(fake.first_token_delay if i == 0 else fake.token_delay)
+                        if cohere:
+                            event = {"event_type": "text-generation", "text": word, "is_finished": False}
+                        else:
+                            event = {"model": body.get("model"), "response": word, "done": False}
+                        self.wfile.write(json.dumps(event).encode() + b"\n")
+                        self.wfile.flush()
+                        with fake._lock:
+                            fake.tokens_sent += 1
+                    if cohere:
+                        end = {"event_type": "stream-end", "is_finished": True, "finish_reason": "COMPLETE"}
+                    else:
+                        end = {"model": body.get("model"), "response": "", "done": True}
+                    self.wfile.write(json.dumps(end).encode() + b"\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    with fake._lock:
+                        fake.aborted += 1
+
+            def _send(self, payload):
+                self.send_response(200)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def words(self, prompt):
+        """The tokens of the answer, five numbered questions whatever the prompt"""
+        per_question = max(self.tokens // 5, 1)
+        words = []
+        for i in range(self.tokens):
+            if i % per_question:
+                words.append(f" word{i}")
+            else:
+                words.append(("\n" if i else "") + f"{i // per_question + 1}.")
+        return words
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def synthetic_sheet(n_rows, seed=0):
+    """Build a candidate sheet shaped like the Google Form export"""
+    import random
+
+    rng = random.Random(seed)
+    roles = ["Data Scientist", "Backend Engineer", "Frontend Engineer", "ML Engineer", "DevOps Engineer"]
+    skills = ["Python", "SQL", "React", "Docker", "Kubernetes", "TensorFlow", "Java", "AWS", "Go"]
+    degrees = ["B.Tech", "M.Tech", "B.Sc", "MCA", "PhD"]
+    headers = [
+        "Timestamp", "Name", "Email", "Highest Education", "Job role applied for",
+        "Skills (comma separated)", "Years of experience",
+    ]
+    rows = [headers]
+    for i in range(n_rows):
+        rows.append([
+            f"2025-03-{1 + i % 28:02d} 10:00:00",
+            f"Candidate {i}",
+            f"candidate{i}@example.com",
+            rng.choice(degrees),
+            rng.choice(roles),
+            ", ".join(rng.sample(skills, 3)),
+            str(rng.randint(0, 15)),
+        ])
+    return rows
@@ -1,25 +1,23 @@
 import streamlit as st
-import cohere
-import firebase_admin
-from firebase_admin import credentials, firestore
 import sounddevice as sd
 import numpy as np
-import tempfile
-import wave
-import subprocess
+from contextlib import closing
+from clients import get_firestore
+from llm_backends import get_llm_backend
+from prompts import first_question_prompt, follow_up_prompt
+from local_service import ServerBusy
+from transcription_server import TranscriptionClient
 
 # =====================================
-# ✅ Prevent Firebase Duplicate Error
+# ✅ Shared Clients (built once per process, reused on every rerun)
 # =====================================
-if not firebase_admin._apps:
-    cred = credentials.Certificate(r"codewHari.py/candidate-questionnaire-cf5eb-firebase-adminsdk-fbsvc-b9a07fb07f.json")
-    firebase_admin.initialize_app(cred)
+FIREBASE_CREDENTIALS = r"codewHari.py/candidate-questionnaire-cf5eb-firebase-adminsdk-fbsvc-b9a07fb07f.json"
 
 # Initialize Firestore Database
-db = firestore.client()
+db = get_firestore(FIREBASE_CREDENTIALS)
 
-# Initialize Cohere API
-co = cohere.Client("lKVIZVpT7eR2zBWCIKd8COlPP11XBF5HEppuhPuE")
+# Initialize the question generator, Cohere unless LLM_BACKEND=local selects a model on this machine
+llm = get_llm_backend({"api_key": "lKVIZVpT7eR2zBWCIKd8COlPP11XBF5HEppuhPuE"})
 
 # =====================================
 # ✅ Streamlit UI
@@ -54,29 +52,13 @@ with st.form("candidate_profile_form"):
         st.success("✅ Profile Submitted Successfully!")
 
         # =====================================
-        # ✅ Generate Question Using Cohere
+        # ✅ Generate Question Using The LLM Backend
         # =====================================
-        prompt = f"""
-        I am conducting a job interview for the role of '{job_role}'.
-        The candidate has the following profile:
-        - Name: {name}
-        - Education: {education}
-        - Job Role: {job_role}
-        - Skills: {skills}
-        - Work Experience: {work_experience}
-        
-        Please generate the first interview question specifically tailored to the candidate's profile.
-        """
-        response = co.generate(
-            model='command',
-            prompt=prompt,
-            max_tokens=200
-        )
-        question = response.generations[0].text
-
-        # ✅ Display The Question
+        prompt = first_question_prompt(name, education, job_role, skills, work_experience)
+        # ✅ Display The Question as it is generated
         st.write("🤖 AI Generated Interview Question:")
-        st.write(f"**Q: {question}**")
+        with closing(llm.stream(prompt, max_tokens=200)) as stream:
+            question = st.write_stream(stream)
 
 
         # =====================================
@@ -96,51 +78,39 @@ with st.form("candidate_profile_form"):
             audio_data = sd.rec(int(duration * sample_rate), samplerate=sample_rate, channels=channels, dtype=np.int16)
             sd.wait()
 
-            # Save audio to a temporary WAV file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_wav_file:
-                with wave.open(temp_wav_file.name, 'wb') as wf:
-                    wf.setnchannels(channels)
-                    wf.setsampwidth(2)
-                    wf.setframerate(sample_rate)
-                    wf.writeframes(audio_data.tobytes())
-
-                st.success("✅ Recording Finished!")
+            st.success("✅ Recording Finished!")
 
             # =====================================
-            # ✅ Convert Speech To Text Using Whisper (Ollama)
+            # ✅ Convert Speech To Text Using The Local Whisper Server
             # =====================================
             st.write("📝 Converting Speech To Text...")
 
-            # Run Whisper locally using Ollama
-            command = f'ollama run whisper {temp_wav_file.name}'
-            result = subprocess.run(command, shell=True, capture_output=True, text=True)
-
-            # Extract transcription text from output
-            transcript = result.stdout.strip()
+            # The server keeps the model loaded, start it with: python transcription_server.py
+            # (TRANSCRIPTION_SERVER_AUTHKEY must be set to the same secret here and there)
+            try:
+                if "transcriber" not in st.session_state:
+                    st.session_state["transcriber"] = TranscriptionClient()
+                transcript = st.session_state["transcriber"].transcribe(audio_data, sample_rate)["text"]
+            except ServerBusy:
+                st.warning("The transcription server is busy, please record your answer again.")
+                st.stop()
+            except OSError:
+                st.error("The transcription server is not running.")
+                st.stop()
+            except RuntimeError as e:
+                st.error(f"Transcription failed: {e}")
+                st.stop()
 
             # ✅ Display Transcription
             st.write("📝 Candidate's Answer:")
             st.write(transcript)
 
             # =====================================
-            # ✅ Generate Follow-up Question Using Cohere
+            # ✅ Generate Follow-up Question Using The LLM Backend
             # =====================================
             st.write("🤔 Generating Follow-up Question...")
 
-            follow_up_prompt = f"""
-            I am an AI interviewer conducting a job interview.
-            The candidate answered: '{transcript}'
-            Based on their answer, generate a highly relevant follow-up question that:
-            - Is clear and professional.
-            - Relates to the candidate's past work experience or technical skills.
-            - Can assess their problem-solving or leadership skills.
-            """
-            follow_up_response = co.generate(
-                model='command',
-                prompt=follow_up_prompt,
-                max_tokens=200
-            )
-
-            follow_up_question = follow_up_response.generations[0].text
             st.write("🤖 AI Follow-up Question:")
-            st.write(f"**Q: {follow_up_question}**")
+            # Leaving the page closes the stream and ends the generation
+            with closing(llm.stream(follow_up_prompt(transcript), max_tokens=200)) as stream:
+                follow_up_question = st.write_stream(stream)
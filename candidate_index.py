@@ -0,0 +1,104 @@
+import bisect
+import re
+
+
+SEARCH_FIELDS = ["name", "role", "skills"]
+
+_TOKEN_SPLIT = re.compile(r"[\s,;/|]+")
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class CandidateIndex:
+    """Lookup structure for the sidebar candidate selector
+
+    Keeps name/email maps for O(1) selection, a sorted token list for prefix
+    search and a trigram index for substring search over name, role and skills.
+    Profiles can be added page by page while a sync is still running.
+    """
+
+    def __init__(self, profiles=None):
+        self.profiles = []
+        self.names = []
+        self.by_name = {}
+        self.by_email = {}
+        self._haystacks = []
+        self._tokens = []
+        self._tokens_sorted = True
+        self._trigrams = {}
+        if profiles:
+            self.add(profiles)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, profiles):
+        """Index a page of profiles"""
+        for profile in profiles:
+            name = profile.get("name", "Unknown")
+            if name == "Unknown":
+                continue
+            position = len(self.profiles)
+            self.profiles.append(profile)
+            self.names.append(name)
+            # The first profile with a name wins, like the previous linear scan
+            self.by_name.setdefault(name, profile)
+            email = profile.get("email", "Unknown")
+            if email and email != "Unknown":
+                self.by_email.setdefault(email.lower(), profile)
+
+            haystack = " ".join(str(profile.get(field, "")) for field in SEARCH_FIELDS).lower()
+            self._haystacks.append(haystack)
+            for token in set(_TOKEN_SPLIT.split(haystack)):
+                if token:
+                    self._tokens.append((token, position))
+            for gram in _trigrams(haystack):
+                self._trigrams.setdefault(gram, []).append(position)
+        # Sorting is deferred until the next prefix search
+        self._tokens_sorted = False
+
+    def get(self, key):
+        """Profile for a candidate name or email, or None"""
+        profile = self.by_name.get(key)
+        if profile is None and key:
+            profile = self.by_email.get(key.lower())
+        return profile
+
+    def _prefix_positions(self, prefix):
+        if not self._tokens_sorted:
+            self._tokens.sort()
+            self._tokens_sorted = True
+        start = bisect.bisect_left(self._tokens, (prefix,))
+        positions = set()
+        for token, position in self._tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            positions.add(position)
+        return positions
+
+    def _substring_positions(self, text):
+        postings = [self._trigrams.get(gram, ()) for gram in _trigrams(text)]
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        # Trigram hits can still be false positives, confirm against the text
+        return {position for position in candidates if text in self._haystacks[position]}
+
+    def search(self, query, limit=50):
+        """Profiles whose name, role or skills match the query, in sheet order
+
+        Short queries match word prefixes, longer ones any substring.
+        """
+        text = query.strip().lower()
+        if not text:
+            return self.profiles[:limit]
+        if len(text) < 3:
+            positions = self._prefix_positions(text)
+        else:
+            positions = self._substring_positions(text)
+        return [self.profiles[position] for position in sorted(positions)[:limit]]
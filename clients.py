@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+
+
+# Process-wide client cache shared by every Streamlit session and rerun
+_clients = {}
+_metrics = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+SHEETS_SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
+COHERE_API_URL = "https://api.cohere.com"
+
+
+def _label(kind, key):
+    # Never expose secrets such as API keys in the metrics
+    if kind.startswith("cohere"):
+        return kind
+    return f"{kind}:{os.path.basename(key)}"
+
+
+def _get_or_create(kind, key, factory):
+    start = time.perf_counter()
+    client = _clients.get((kind, key))
+    if client is None:
+        with _lock:
+            client = _clients.get((kind, key))
+            if client is None:
+                client = factory()
+                _clients[(kind, key)] = client
+                _metrics[_label(kind, key)] = {
+                    "cold_ms": (time.perf_counter() - start) * 1000,
+                    "warm_hits": 0,
+                    "last_warm_us": None,
+                }
+                return client
+    stats = _metrics[_label(kind, key)]
+    stats["warm_hits"] += 1
+    stats["last_warm_us"] = (time.perf_counter() - start) * 1e6
+    return client
+
+
+def client_metrics():
+    """Cold construction time and warm lookup counts for every cached client"""
+    return {name: dict(stats) for name, stats in _metrics.items()}
+
+
+def get_firebase_app(credentials_path):
+    """Firebase app for a service-account file, initialised once per process"""
+    def factory():
+        import firebase_admin
+        from firebase_admin import credentials
+
+        # The app may already exist if this module was reloaded by Streamlit
+        try:
+            return firebase_admin.get_app(credentials_path)
+        except ValueError:
+            return firebase_admin.initialize_app(credentials.Certificate(credentials_path), name=credentials_path)
+    return _get_or_create("firebase", credentials_path, factory)
+
+
+def get_firestore(credentials_path):
+    """Firestore client sharing one gRPC channel across sessions"""
+    def factory():
+        from firebase_admin import firestore
+        return firestore.client(app=get_firebase_app(credentials_path))
+    return _get_or_create("firestore", credentials_path, factory)
+
+
+def get_auth(credentials_path):
+    """Firebase Auth client bound to the app for this credentials file"""
+    def factory():
+        from firebase_admin import auth
+        return auth.Client(get_firebase_app(credentials_path))
+    return _get_or_create("auth", credentials_path, factory)
+
+
+def get_cohere(api_key):
+    """Cohere client reusing its HTTP connection pool between calls"""
+    def factory():
+        import cohere
+        return cohere.Client(api_key)
+    return _get_or_create("cohere", api_key, factory)
+
+
+def get_cohere_http(api_key, base_url=COHERE_API_URL):
+    """HTTP client for streaming from Cohere's REST API, one connection pool per key"""
+    def factory():
+        import httpx
+        return httpx.Client(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=httpx.Timeout(300, connect=10)
+        )
+    return _get_or_create("cohere_http", (api_key, base_url), factory)
+
+
+def _thread_http(credentials):
+    # httplib2 connections are not thread-safe, so each thread keeps its own
+    # authorised connection pool while the parsed discovery document is shared
+    import google_auth_httplib2
+    import httplib2
+
+    pools = getattr(_local, "sheets_http", None)
+    if pools is None:
+        pools = _local.sheets_http = {}
+    http = pools.get(id(credentials))
+    if http is None:
+        http = pools[id(credentials)] = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+    return http
+
+
+def get_sheets_service(credentials_path):
+    """Google Sheets service built once per process from the service-account file"""
+    def factory():
+        from google.oauth2 import service_account
+        from googleapiclient.discovery import build
+        from googleapiclient.http import HttpRequest
+
+        credentials = service_account.Credentials.from_service_account_file(
+            credentials_path,
+            scopes=SHEETS_SCOPES
+        )
+
+        def request_builder(http, *args, **kwargs):
+            return HttpRequest(_thread_http(credentials), *args, **kwargs)
+
+        return build(
+            'sheets', 'v4',
+            http=_thread_http(credentials),
+            requestBuilder=request_builder,
+            cache_discovery=False
+        )
+    return _get_or_create("sheets", credentials_path, factory)
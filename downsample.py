@@ -0,0 +1,59 @@
+import numpy as np
+
+
+# Points per trace sent to the browser, whatever the interview length
+POINT_BUDGET = 2000
+
+
+def minmax_indices(values, budget=POINT_BUDGET):
+    """Positions of the minimum and maximum of each bucket, plus both end points
+
+    Keeps every spike of a step-like series such as the stress level, at most
+    budget + 2 positions are returned in ascending order.
+    """
+    values = np.asarray(values)
+    n = len(values)
+    if n <= budget:
+        return np.arange(n)
+    buckets = max((budget - 2) // 2, 1)
+    size = -(-n // buckets)
+    # Pad with the last value so the buckets form a rectangular block
+    padded = np.concatenate([values, np.repeat(values[-1:], buckets * size - n)]).reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    lows = offsets + padded.argmin(axis=1)
+    highs = offsets + padded.argmax(axis=1)
+    positions = np.concatenate([[0, n - 1], np.minimum(lows, n - 1), np.minimum(highs, n - 1)])
+    return np.unique(positions)
+
+
+def lttb_indices(values, budget=POINT_BUDGET, x=None):
+    """Largest-Triangle-Three-Buckets selection of budget positions
+
+    Each bucket keeps the point that forms the largest triangle with the point
+    kept from the previous bucket and the mean of the next one, which preserves
+    the visual shape of a smooth series. x defaults to the sample position.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n <= budget or budget < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+    # budget - 2 buckets between the first and last point, which are always kept
+    edges = np.linspace(1, n - 1, budget - 1).astype(np.int64)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(values[:n - 1], edges[:-1]) / counts
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], values[-1])
+
+    selected = np.empty(budget, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(budget - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        ax, ay = x[previous], values[previous]
+        area = np.abs((ax - mean_x[bucket]) * (values[lo:hi] - ay)
+                      - (ax - x[lo:hi]) * (mean_y[bucket] - ay))
+        previous = lo + int(area.argmax())
+        selected[bucket + 1] = previous
+    return selected
@@ -0,0 +1,132 @@
+import time
+
+from snapshot_store import get_snapshot_store
+
+
+EMOTIONS = ['angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral']
+
+# Dominant emotion mapped to the stress scale shown on the timeline
+STRESS_BY_EMOTION = {
+    'angry': 3,
+    'fear': 3,
+    'disgust': 3,
+    'sad': 2,
+    'surprise': 2,
+    'happy': 1,
+    'neutral': 1,
+}
+STRESS_LEVELS = {1: "Low", 2: "Medium", 3: "High"}
+
+DETECTOR_BACKEND = "opencv"
+
+
+def warm_up(detector_backend=DETECTOR_BACKEND):
+    """Load the emotion and face detector models so the first frame is not slowed down"""
+    from deepface import DeepFace
+
+    DeepFace.build_model(model_name="Emotion", task="facial_attribute")
+    DeepFace.build_model(model_name=detector_backend, task="face_detector")
+
+
+def build_analysis(scores, timestamp=None, processed_image=None):
+    """Build an emotion_data entry from the seven DeepFace emotion scores"""
+    analysis = {emotion: float(scores.get(emotion, 0.0)) for emotion in EMOTIONS}
+    dominant = max(EMOTIONS, key=analysis.get)
+    stress_value = STRESS_BY_EMOTION[dominant]
+    analysis["emotion"] = dominant
+    analysis["stress_value"] = stress_value
+    analysis["stress_level"] = STRESS_LEVELS[stress_value]
+    analysis["timestamp"] = int(timestamp if timestamp is not None else time.time())
+
+    # Save the image out of band, pre-rendered at display size,
+    # the entry only keeps a reference to it
+    if processed_image is not None:
+        analysis["image_ref"] = get_snapshot_store().put_snapshot(processed_image)
+
+    return analysis
+
+
+def analyze_frame(frame, timestamp=None, detector_backend=DETECTOR_BACKEND):
+    """Run DeepFace emotion analysis on a BGR frame"""
+    from deepface import DeepFace
+
+    result = DeepFace.analyze(
+        frame,
+        actions=["emotion"],
+        detector_backend=detector_backend,
+        enforce_detection=False,
+        silent=True
+    )
+    if isinstance(result, list):
+        result = result[0]
+    return build_analysis(result["emotion"], timestamp, frame)
+
+
+def detect_face(frame, detector_backend=DETECTOR_BACKEND):
+    """Bounding box (x, y, w, h) of the most confident face in a frame, or None"""
+    from deepface import DeepFace
+
+    faces = DeepFace.extract_faces(
+        frame,
+        detector_backend=detector_backend,
+        enforce_detection=False,
+        align=False
+    )
+    # Without a detection DeepFace reports the whole frame with zero confidence
+    faces = [f for f in faces if f.get("confidence")]
+    if not faces:
+        return None
+    # Keep the most confident face, the candidate is the one facing the camera
+    area = max(faces, key=lambda f: f["confidence"])["facial_area"]
+    return tuple(max(0, int(area[k])) for k in ("x", "y", "w", "h"))
+
+
+def crop_face(frame, box):
+    """Crop a bounding box out of a frame, falling back to the whole frame"""
+    if box is None:
+        return frame
+    x, y, w, h = box
+    face = frame[y:y + h, x:x + w]
+    return face if face.size else frame
+
+
+def emotion_batch(faces):
+    """Emotion scores for a list of BGR face crops with a single model call
+
+    Mirrors the preprocessing of DeepFace's emotion model (48x48 grayscale,
+    scaled to [0, 1]) and returns one {emotion: percent} dict per face.
+    """
+    import cv2
+    import numpy as np
+    from deepface import DeepFace
+
+    model = DeepFace.build_model(model_name="Emotion", task="facial_attribute")
+    batch = np.empty((len(faces), 48, 48, 1), dtype=np.float32)
+    for i, face in enumerate(faces):
+        gray = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY)
+        batch[i, :, :, 0] = cv2.resize(gray, (48, 48)) / 255.0
+    predictions = np.asarray(model.model(batch, training=False))
+    predictions = 100 * predictions / predictions.sum(axis=1, keepdims=True)
+    return [dict(zip(EMOTIONS, map(float, row))) for row in predictions]
+
+
+def analyze_frames(frames, timestamps=None, detector_backend=DETECTOR_BACKEND):
+    """Batched emotion analysis, returns one emotion_data entry per frame in input order
+
+    All face crops go through the emotion model as one NumPy batch. Faces are
+    still located frame by frame: DeepFace's detectors, the default OpenCV
+    Haar cascade included, take one image per call and their cost grows with
+    the pixels scanned, so batching frames would not save any detection work.
+    Frames are detected in parallel by the emotion server's worker processes
+    instead.
+    """
+    if not frames:
+        return []
+    if timestamps is None:
+        timestamps = [None] * len(frames)
+    faces = [crop_face(frame, detect_face(frame, detector_backend)) for frame in frames]
+    scores = emotion_batch(faces)
+    return [
+        build_analysis(frame_scores, timestamp, frame)
+        for frame_scores, timestamp, frame in zip(scores, timestamps, frames)
+    ]
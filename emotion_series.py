@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import uuid
+
+import numpy as np
+
+from emotion_analysis import EMOTIONS, STRESS_LEVELS
+from emotion_stats import EmotionStats
+
+
+_EMOTION_CODES = {emotion: code for code, emotion in enumerate(EMOTIONS)}
+_NO_REF = b""
+_COLUMNS = ("_scores", "_stress", "_emotion", "_timestamps", "_image_refs")
+# One sample as appended to a recording file, after a JSON header line
+_RECORD = np.dtype([
+    ("scores", "<f4", (len(EMOTIONS),)), ("stress", "i1"), ("emotion", "i1"),
+    ("timestamps", "<i8"), ("image_refs", "S20"),
+])
+
+# Where each candidate's samples are recorded for batch reporting. Point
+# INTERVIEW_DATA_DIR at durable storage in production, the temp directory
+# fallback does not survive a reboot or a temp cleaner
+DATA_DIR_IS_TEMPORARY = "INTERVIEW_DATA_DIR" not in os.environ
+DEFAULT_DATA_DIR = os.environ.get(
+    "INTERVIEW_DATA_DIR",
+    os.path.join(tempfile.gettempdir(), "assessai-interviews")
+)
+
+
+class EmotionSeries:
+    """Columnar container for emotion samples, a drop-in for the emotion_data list
+
+    Each sample costs 7 float32 scores, an int8 stress value, an int8 dominant
+    emotion code, an int64 timestamp and a 20-byte snapshot digest (58 bytes)
+    instead of a dict with a dozen string keys. Arrays grow by doubling, and the
+    accessors return views, so pandas/NumPy exports do not copy the data.
+    Indexing still yields the familiar entry dicts, built on demand, and the
+    running summary aggregates are kept in stats. candidate_name is the
+    candidate the samples were recorded for. uid identifies this series for
+    caches keyed on (uid, version), unlike id() it is never reused. After
+    record_to(path), samples are appended to that file as they arrive.
+    """
+
+    def __init__(self, capacity=256, stats_window=60, candidate_name=None):
+        self._size = 0
+        self.version = 0
+        self.candidate_name = candidate_name
+        self.uid = uuid.uuid4().hex
+        self.path = None
+        self._recorded = 0
+        self.stats = EmotionStats(stats_window)
+        self._scores = np.zeros((capacity, len(EMOTIONS)), dtype=np.float32)
+        self._stress = np.zeros(capacity, dtype=np.int8)
+        self._emotion = np.zeros(capacity, dtype=np.int8)
+        self._timestamps = np.zeros(capacity, dtype=np.int64)
+        self._image_refs = np.zeros(capacity, dtype="S20")
+
+    def __len__(self):
+        return self._size
+
+    def _grow(self, size):
+        capacity = len(self._timestamps)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in _COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def _add(self, entry):
+        i = self._size
+        self._grow(i + 1)
+        self._scores[i] = [entry.get(emotion, 0.0) for emotion in EMOTIONS]
+        self._stress[i] = entry.get("stress_value", 0)
+        self._emotion[i] = _EMOTION_CODES.get(entry.get("emotion"), -1)
+        self._timestamps[i] = entry["timestamp"]
+        self._image_refs[i] = bytes.fromhex(entry["image_ref"]) if entry.get("image_ref") else _NO_REF
+        self.stats.add(self._stress[i], self._emotion[i], self._timestamps[i])
+        self._size += 1
+        self.version += 1
+
+    def append(self, entry):
+        """Add one emotion_data entry as produced by build_analysis"""
+        self._add(entry)
+        self._record()
+
+    def extend(self, entries):
+        for entry in entries:
+            self._add(entry)
+        self._record()
+
+    def record_to(self, path):
+        """Keep path up to date with the samples, replacing an earlier recording there
+
+        Samples held so far are written at once and later ones appended as they
+        arrive, a few dozen bytes each. The file is only created with the first
+        sample. Pass None to stop recording.
+        """
+        self.path = path
+        self._recorded = 0
+        self._record()
+
+    def _record(self):
+        if self.path is None or self._recorded == self._size:
+            return
+        rows = np.empty(self._size - self._recorded, dtype=_RECORD)
+        for name in _COLUMNS:
+            rows[name.lstrip("_")] = getattr(self, name)[self._recorded:self._size]
+        if self._recorded:
+            mode, data = "ab", rows.tobytes()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            header = json.dumps({"candidate_name": self.candidate_name or ""}) + "\n"
+            mode, data = "wb", header.encode("utf-8") + rows.tobytes()
+        with open(self.path, mode) as recording:
+            recording.write(data)
+        self._recorded = self._size
+
+    def _row(self, i):
+        entry = dict(zip(EMOTIONS, map(float, self._scores[i])))
+        code = int(self._emotion[i])
+        stress_value = int(self._stress[i])
+        entry["emotion"] = EMOTIONS[code] if code >= 0 else "unknown"
+        entry["stress_value"] = stress_value
+        entry["stress_level"] = STRESS_LEVELS.get(stress_value, "Unknown")
+        entry["timestamp"] = int(self._timestamps[i])
+        if self._image_refs[i]:
+            entry["image_ref"] = self._image_refs[i].hex()
+        return entry
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self._row(i) for i in range(*key.indices(self._size))]
+        if key < 0:
+            key += self._size
+        if not 0 <= key < self._size:
+            raise IndexError("EmotionSeries index out of range")
+        return self._row(key)
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self._row(i)
+
+    @property
+    def scores(self):
+        """(n, 7) float32 view of the emotion scores, columns in EMOTIONS order"""
+        return self._scores[:self._size]
+
+    @property
+    def stress_values(self):
+        return self._stress[:self._size]
+
+    @property
+    def emotion_codes(self):
+        return self._emotion[:self._size]
+
+    @property
+    def timestamps(self):
+        return self._timestamps[:self._size]
+
+    def to_frame(self):
+        """DataFrame over the series, the score block and numeric columns are not copied"""
+        import pandas as pd
+
+        frame = pd.DataFrame(self.scores, columns=EMOTIONS, copy=False)
+        frame["emotion"] = pd.Categorical.from_codes(self.emotion_codes, categories=EMOTIONS)
+        frame["stress_value"] = self.stress_values
+        frame["timestamp"] = self.timestamps
+        return frame
+
+    def save(self, path, candidate_name=None):
+        """Write the samples to an .npz file, replacing it atomically"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        columns = {name.lstrip("_"): getattr(self, name)[:self._size] for name in _COLUMNS}
+        with tempfile.NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as tmp_file:
+            np.savez(tmp_file, candidate_name=np.array(candidate_name or self.candidate_name or ""), **columns)
+        os.replace(tmp_file.name, path)
+
+    @classmethod
+    def load(cls, path, stats_window=60):
+        """Series written by save() or record_to(), its stats are rebuilt from the columns"""
+        candidate_name, columns = _read(path)
+        size = len(columns["timestamps"])
+        series = cls(capacity=max(size, 256), stats_window=stats_window, candidate_name=candidate_name or None)
+        for name in _COLUMNS:
+            getattr(series, name)[:size] = columns[name.lstrip("_")]
+        series._size = size
+        series.version = size
+        series.stats.extend(series.stress_values, series.emotion_codes, series.timestamps)
+        return series
+
+
+def interview_path(candidate_name, directory=DEFAULT_DATA_DIR):
+    """File holding a candidate's saved interview, the name is hashed so any name is a valid file name"""
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "_", candidate_name).strip("_")[:40]
+    digest = hashlib.sha1(candidate_name.encode("utf-8")).hexdigest()[:10]
+    return os.path.join(directory, f"{slug}-{digest}.samples")
+
+
+def _read(path, header_only=False):
+    # Candidate name and columns of a recording file or an .npz written by save()
+    with open(path, "rb") as saved:
+        if saved.read(2) == b"PK":
+            saved.seek(0)
+            with np.load(saved) as npz:
+                name = str(npz["candidate_name"])
+                return name, None if header_only else {column.lstrip("_"): npz[column.lstrip("_")] for column in _COLUMNS}
+        saved.seek(0)
+        name = json.loads(saved.readline())["candidate_name"]
+        if header_only:
+            return name, None
+        data = saved.read()
+    # A record torn by a crash mid-write is dropped
+    rows = np.frombuffer(data, dtype=_RECORD, count=len(data) // _RECORD.itemsize)
+    return name, {field: rows[field] for field in _RECORD.names}
+
+
+def saved_interviews(directory=DEFAULT_DATA_DIR):
+    """Candidate name and path of every interview saved in a directory"""
+    interviews = {}
+    if not os.path.isdir(directory):
+        return interviews
+    for entry in sorted(os.listdir(directory)):
+        if entry.endswith((".samples", ".npz")):
+            path = os.path.join(directory, entry)
+            interviews[_read(path, header_only=True)[0]] = path
+    return interviews
@@ -0,0 +1,103 @@
+"""Long-lived local emotion analysis service
+
+Loads the DeepFace models once per worker process and analyses frames sent by
+any number of Streamlit sessions over a local socket.
+
+Usage: python emotion_server.py --workers 2 --port 6010
+"""
+import argparse
+import os
+
+from emotion_analysis import analyze_frame, analyze_frames, warm_up
+from local_service import LocalClient, LocalServer, load_authkey, percentiles
+
+
+DEFAULT_ADDRESS = ("127.0.0.1", int(os.environ.get("EMOTION_SERVER_PORT", 6010)))
+AUTHKEY_ENV = "EMOTION_SERVER_AUTHKEY"
+
+
+class EmotionServer(LocalServer):
+    """Analyses frames on a warm process pool, each worker holding its own copy of the DeepFace models
+
+    At most queue_size frames or batches are admitted at once, see LocalServer.
+    """
+
+    name = "Emotion server"
+    authkey_env = AUTHKEY_ENV
+    operations = ("analyze", "analyze_batch", "stats")
+
+    def __init__(self, address=DEFAULT_ADDRESS, authkey=None, workers=2, queue_size=32,
+                 queue_timeout=1.0, analyze_fn=analyze_frame, analyze_batch_fn=analyze_frames,
+                 initializer=warm_up):
+        super().__init__(address, authkey, workers, queue_size, queue_timeout, initializer)
+        self.analyze_fn = analyze_fn
+        self.analyze_batch_fn = analyze_batch_fn
+        self._counts["frames"] = 0
+
+    def _analyze(self, fn, *args, frames=1):
+        result, latency_ms = self._run(fn, *args)
+        with self._stats_lock:
+            self._counts["frames"] += frames
+            # Every frame of a batch waits for the whole batch
+            self._latencies.extend([latency_ms] * frames)
+        return result
+
+    def analyze(self, frame, timestamp=None):
+        return self._analyze(self.analyze_fn, frame, timestamp)
+
+    def analyze_batch(self, frames, timestamps=None):
+        # A batch takes one queue slot and one worker, so it is not split across processes
+        return self._analyze(self.analyze_batch_fn, frames, timestamps, frames=len(frames))
+
+    def stats(self):
+        """Frame counts and per-frame latency percentiles in milliseconds"""
+        stats = super().stats()
+        with self._stats_lock:
+            latencies = list(self._latencies)
+        stats.update(percentiles(latencies))
+        return stats
+
+
+class EmotionClient(LocalClient):
+    """Connection to a running EmotionServer, one per Streamlit session"""
+
+    authkey_env = AUTHKEY_ENV
+
+    def __init__(self, address=DEFAULT_ADDRESS, authkey=None):
+        super().__init__(address, authkey)
+
+    def analyze(self, frame, timestamp=None):
+        """Emotion analysis for one BGR frame, same shape as analyze_frame"""
+        return self._call("analyze", (frame, timestamp))
+
+    def analyze_batch(self, frames, timestamps=None):
+        """Emotion analysis for a list of frames, results come back in input order"""
+        return self._call("analyze_batch", (frames, timestamps))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local DeepFace emotion analysis server")
+    parser.add_argument("--host", default=DEFAULT_ADDRESS[0])
+    parser.add_argument("--port", type=int, default=DEFAULT_ADDRESS[1])
+    parser.add_argument("--workers", type=int, default=2, help="model processes, each holding its own copy of the models")
+    parser.add_argument("--queue-size", type=int, default=32, help="frames admitted at once before callers wait")
+    args = parser.parse_args()
+    try:
+        authkey = load_authkey(AUTHKEY_ENV)
+    except RuntimeError as e:
+        parser.error(str(e))
+
+    server = EmotionServer((args.host, args.port), authkey, workers=args.workers, queue_size=args.queue_size)
+    print(f"Loading models in {args.workers} worker(s)...")
+    server.warm()
+    print(f"Emotion server listening on {args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
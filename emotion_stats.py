@@ -0,0 +1,127 @@
+import collections
+
+import numpy as np
+
+from emotion_analysis import EMOTIONS
+
+
+_EMOTION_CODES = {emotion: code for code, emotion in enumerate(EMOTIONS)}
+
+
+class EmotionStats:
+    """Running interview aggregates, updated in O(1) as each emotion sample arrives
+
+    Keeps the sample count, stress sum and maximum, a per-emotion histogram,
+    the stress peak (3) and relaxed (1) counts and the first/last timestamp,
+    which is everything the summary report needs. A deque of the last window
+    seconds backs the rolling "current stats". Samples are expected in time
+    order, as they are recorded.
+    """
+
+    def __init__(self, window=60):
+        self.window = window
+        self.count = 0
+        self.stress_sum = 0
+        self.max_stress = None
+        self.stress_peaks = 0
+        self.relaxed_moments = 0
+        self.histogram = [0] * len(EMOTIONS)
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self._recent = collections.deque()
+        self._recent_sum = 0
+        self._recent_peaks = 0
+
+    def add(self, stress_value, emotion_code, timestamp):
+        """Account for one sample, emotion_code indexes EMOTIONS (-1 when unknown)"""
+        stress_value = int(stress_value)
+        timestamp = int(timestamp)
+        self.count += 1
+        self.stress_sum += stress_value
+        if self.max_stress is None or stress_value > self.max_stress:
+            self.max_stress = stress_value
+        if stress_value == 3:
+            self.stress_peaks += 1
+        elif stress_value == 1:
+            self.relaxed_moments += 1
+        if emotion_code >= 0:
+            self.histogram[emotion_code] += 1
+        if self.first_timestamp is None or timestamp < self.first_timestamp:
+            self.first_timestamp = timestamp
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+
+        self._remember(timestamp, stress_value)
+        self._expire()
+
+    def _remember(self, timestamp, stress_value):
+        self._recent.append((timestamp, stress_value))
+        self._recent_sum += stress_value
+        self._recent_peaks += stress_value == 3
+
+    def _expire(self):
+        cutoff = self.last_timestamp - self.window
+        while self._recent and self._recent[0][0] <= cutoff:
+            _, expired = self._recent.popleft()
+            self._recent_sum -= expired
+            self._recent_peaks -= expired == 3
+
+    def extend(self, stress_values, emotion_codes, timestamps):
+        """Account for a block of samples given as columns, same result as add() on each"""
+        stress_values = np.asarray(stress_values, dtype=np.int64)
+        emotion_codes = np.asarray(emotion_codes, dtype=np.int64)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if not len(stress_values):
+            return
+        self.count += len(stress_values)
+        self.stress_sum += int(stress_values.sum())
+        self.max_stress = max(int(stress_values.max()), self.max_stress if self.max_stress is not None else -1)
+        self.stress_peaks += int((stress_values == 3).sum())
+        self.relaxed_moments += int((stress_values == 1).sum())
+        counts = np.bincount(emotion_codes[emotion_codes >= 0], minlength=len(EMOTIONS))
+        self.histogram = [total + int(count) for total, count in zip(self.histogram, counts)]
+        first, last = int(timestamps.min()), int(timestamps.max())
+        self.first_timestamp = first if self.first_timestamp is None else min(first, self.first_timestamp)
+        self.last_timestamp = last if self.last_timestamp is None else max(last, self.last_timestamp)
+
+        # Only samples inside the window of the new last timestamp can stay in it
+        recent = timestamps > self.last_timestamp - self.window
+        for timestamp, stress_value in zip(timestamps[recent].tolist(), stress_values[recent].tolist()):
+            self._remember(timestamp, stress_value)
+        self._expire()
+
+    def add_entry(self, entry):
+        """Account for an emotion_data entry dict"""
+        self.add(entry.get("stress_value", 0), _EMOTION_CODES.get(entry.get("emotion"), -1), entry["timestamp"])
+
+    @property
+    def dominant_emotion(self):
+        """Most frequent emotion, on a tie the alphabetically first like pandas mode() on the emotion column"""
+        most = max(self.histogram)
+        if not most:
+            return "Unknown"
+        return min(emotion for emotion, count in zip(EMOTIONS, self.histogram) if count == most)
+
+    def summary(self):
+        """Interview-wide figures for the summary report, as plain Python types"""
+        if not self.count:
+            return None
+        return {
+            "started_at": self.first_timestamp,
+            "duration_s": self.last_timestamp - self.first_timestamp,
+            "avg_stress_level": self.stress_sum / self.count,
+            "max_stress_level": self.max_stress,
+            "dominant_emotion": self.dominant_emotion,
+            "stress_peaks": self.stress_peaks,
+            "relaxed_moments": self.relaxed_moments,
+        }
+
+    def current(self):
+        """Stress over the last window seconds of the recording"""
+        count = len(self._recent)
+        return {
+            "window_s": self.window,
+            "count": count,
+            "mean_stress": self._recent_sum / count if count else None,
+            "stress_peaks": self._recent_peaks,
+        }
@@ -0,0 +1,96 @@
+import time
+
+from emotion_analysis import DETECTOR_BACKEND, build_analysis, crop_face, detect_face, emotion_batch
+
+
+TEMPLATE_SIZE = (48, 48)
+
+
+def _create_tracker():
+    import cv2
+
+    # KCF is the fastest but only ships with opencv-contrib, MIL is always available
+    for factory in ("TrackerKCF_create", "legacy.TrackerKCF_create", "TrackerMIL_create"):
+        owner = cv2
+        for part in factory.split("."):
+            owner = getattr(owner, part, None)
+            if owner is None:
+                break
+        if owner is not None:
+            return owner()
+    raise RuntimeError("This OpenCV build has no object tracker")
+
+
+class FaceTracker:
+    """Face ROI tracking between periodic full detections
+
+    The detector runs on the first frame, every detect_every frames and whenever
+    tracking confidence falls below min_confidence. In between, an OpenCV
+    tracker follows the face box. Confidence is the normalised correlation of
+    the tracked crop with the crop from the last detection, because OpenCV
+    trackers only report success or failure.
+    """
+
+    def __init__(self, detect_every=10, min_confidence=0.4, detector_backend=DETECTOR_BACKEND):
+        self.detect_every = detect_every
+        self.min_confidence = min_confidence
+        self.detector_backend = detector_backend
+        self._tracker = None
+        self._template = None
+        self._since_detection = 0
+        self._stats = {"frames": 0, "detections": 0, "tracked": 0, "lost": 0, "locate_s": 0.0}
+
+    def _template_of(self, face):
+        import cv2
+
+        gray = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY) if face.ndim == 3 else face
+        return cv2.resize(gray, TEMPLATE_SIZE)
+
+    def _confidence(self, face):
+        import cv2
+
+        score = cv2.matchTemplate(self._template_of(face), self._template, cv2.TM_CCOEFF_NORMED)
+        return float(score.max())
+
+    def _detect(self, frame):
+        self._stats["detections"] += 1
+        self._since_detection = 0
+        box = detect_face(frame, self.detector_backend)
+        if box is None:
+            self._tracker = None
+            return None
+        self._tracker = _create_tracker()
+        self._tracker.init(frame, box)
+        self._template = self._template_of(crop_face(frame, box))
+        return box
+
+    def locate(self, frame):
+        """Face box (x, y, w, h) for this frame, or None when no face is visible"""
+        start = time.perf_counter()
+        self._stats["frames"] += 1
+        self._since_detection += 1
+        box = None
+        if self._tracker is not None and self._since_detection < self.detect_every:
+            ok, tracked = self._tracker.update(frame)
+            if ok:
+                tracked = tuple(max(0, int(v)) for v in tracked)
+                if self._confidence(crop_face(frame, tracked)) >= self.min_confidence:
+                    box = tracked
+                    self._stats["tracked"] += 1
+            if box is None:
+                self._stats["lost"] += 1
+        if box is None:
+            box = self._detect(frame)
+        self._stats["locate_s"] += time.perf_counter() - start
+        return box
+
+    def analyze(self, frame, timestamp=None):
+        """Emotion analysis of the tracked face, same entry shape as analyze_frame"""
+        scores = emotion_batch([crop_face(frame, self.locate(frame))])[0]
+        return build_analysis(scores, timestamp, frame)
+
+    def stats(self):
+        stats = dict(self._stats)
+        stats["detection_ratio"] = stats["detections"] / max(stats["frames"], 1)
+        stats["mean_locate_ms"] = stats["locate_s"] * 1000 / max(stats["frames"], 1)
+        return stats
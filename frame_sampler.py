@@ -0,0 +1,78 @@
+import time
+
+from emotion_analysis import analyze_frame
+
+
+class AdaptiveSampler:
+    """Change-detection stage in front of the emotion analysis
+
+    Each frame is reduced to a tiny grayscale thumbnail and compared with the
+    last analysed one. Near-duplicates reuse the previous result with their own
+    timestamp, so emotion_data keeps one entry per frame. While the candidate
+    sits still the number of frames that may be skipped in a row doubles up to
+    max_interval. Any motion above motion_threshold resets it to min_interval.
+    """
+
+    def __init__(self, analyze_fn=analyze_frame, threshold=3.0, motion_threshold=12.0,
+                 min_interval=1, max_interval=16, size=(32, 32)):
+        self.analyze_fn = analyze_fn
+        self.threshold = threshold
+        self.motion_threshold = motion_threshold
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.size = size
+        self.interval = min_interval
+        self._last_signature = None
+        self._last_result = None
+        self._skipped_in_row = 0
+        self._stats = {"frames": 0, "analysed": 0, "skipped": 0, "analysis_s": 0.0, "filter_s": 0.0}
+
+    def _signature(self, frame):
+        import cv2
+
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        return cv2.resize(gray, self.size, interpolation=cv2.INTER_AREA).astype("int16")
+
+    def process(self, frame, timestamp=None):
+        """Return the emotion_data entry for a frame, analysing it only if it changed"""
+        timestamp = int(timestamp if timestamp is not None else time.time())
+        start = time.perf_counter()
+        signature = self._signature(frame)
+        if self._last_signature is None:
+            difference = float("inf")
+        else:
+            difference = float(abs(signature - self._last_signature).mean())
+        self._stats["filter_s"] += time.perf_counter() - start
+        self._stats["frames"] += 1
+
+        if difference >= self.motion_threshold:
+            self.interval = self.min_interval
+
+        if (self._last_result is not None and difference < self.threshold
+                and self._skipped_in_row < self.interval):
+            self._skipped_in_row += 1
+            self._stats["skipped"] += 1
+            return dict(self._last_result, timestamp=timestamp)
+
+        # Still frames let the sampler back off further on the next stretch
+        if difference < self.threshold:
+            self.interval = min(self.interval * 2, self.max_interval)
+        self._skipped_in_row = 0
+
+        start = time.perf_counter()
+        result = self.analyze_fn(frame, timestamp)
+        self._stats["analysis_s"] += time.perf_counter() - start
+        self._stats["analysed"] += 1
+        self._last_signature = signature
+        self._last_result = result
+        return result
+
+    def stats(self):
+        """Skip ratio and the analysis time saved, estimated from the mean cost per analysed frame"""
+        stats = dict(self._stats)
+        frames = max(stats["frames"], 1)
+        mean_cost = stats["analysis_s"] / max(stats["analysed"], 1)
+        stats["skip_ratio"] = stats["skipped"] / frames
+        stats["interval"] = self.interval
+        stats["saved_s"] = stats["skipped"] * mean_cost - stats["filter_s"]
+        return stats
@@ -0,0 +1,109 @@
+import json
+import os
+import urllib.error
+import urllib.request
+
+from clients import get_cohere, get_cohere_http
+from llm_stream import GenerationError, cohere_stream, timed_stream
+
+
+# The deployment's backend, "cohere" (hosted) or "local" (a model served on this machine)
+DEFAULT_BACKEND = os.environ.get("LLM_BACKEND", "cohere")
+DEFAULT_LOCAL_URL = os.environ.get("LOCAL_LLM_URL", "http://127.0.0.1:11434")
+# A small quantised instruct model answers five questions in seconds on a laptop CPU
+DEFAULT_LOCAL_MODEL = os.environ.get("LOCAL_LLM_MODEL", "qwen2.5:1.5b-instruct-q4_K_M")
+
+
+class CohereBackend:
+    """Generations from Cohere's hosted generate endpoint"""
+
+    name = "cohere"
+
+    def __init__(self, client, http, model="command"):
+        self.client = client
+        self.http = http
+        self.model = model
+
+    def generate(self, prompt, max_tokens=200, temperature=None):
+        """The whole completion of a prompt"""
+        options = {} if temperature is None else {"temperature": temperature}
+        response = self.client.generate(model=self.model, prompt=prompt, max_tokens=max_tokens, **options)
+        return response.generations[0].text
+
+    def stream(self, prompt, max_tokens=200, temperature=None, cancel=None):
+        """The completion chunk by chunk, see llm_stream.timed_stream"""
+        options = {} if temperature is None else {"temperature": temperature}
+        return cohere_stream(self.http, prompt, max_tokens, self.model, cancel, **options)
+
+
+class LocalBackend:
+    """Generations from a model on this machine behind an Ollama-compatible /api/generate
+
+    No request leaves the box, so interview rooms keep working without an
+    outbound network. keep_alive asks the server to keep the model loaded
+    between questions instead of reading it from disk again.
+    """
+
+    name = "local"
+
+    def __init__(self, url=DEFAULT_LOCAL_URL, model=DEFAULT_LOCAL_MODEL, timeout=120, keep_alive="30m"):
+        self.url = url.rstrip("/")
+        self.model = model
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+
+    def _open(self, prompt, max_tokens, temperature, stream):
+        options = {"num_predict": max_tokens}
+        if temperature is not None:
+            options["temperature"] = temperature
+        body = {"model": self.model, "prompt": prompt, "stream": stream, "options": options,
+                "keep_alive": self.keep_alive}
+        request = urllib.request.Request(
+            f"{self.url}/api/generate", data=json.dumps(body).encode("utf-8"),
+            headers={"content-type": "application/json"}
+        )
+        try:
+            return urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            raise GenerationError(
+                f"Local model failed with HTTP {e.code}: {e.read()[:200].decode('utf-8', 'replace')}",
+                e.code, e.headers
+            ) from e
+
+    def generate(self, prompt, max_tokens=200, temperature=None):
+        """The whole completion of a prompt"""
+        with self._open(prompt, max_tokens, temperature, False) as response:
+            return json.loads(response.read()).get("response", "")
+
+    def _chunks(self, prompt, max_tokens, temperature):
+        with self._open(prompt, max_tokens, temperature, True) as response:
+            for line in response:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event.get("error"):
+                    raise GenerationError(f"Generation failed: {event['error']}")
+                yield event.get("response", "")
+                if event.get("done"):
+                    return
+
+    def stream(self, prompt, max_tokens=200, temperature=None, cancel=None):
+        """The completion chunk by chunk, see llm_stream.timed_stream"""
+        return timed_stream(self._chunks(prompt, max_tokens, temperature), cancel)
+
+
+def get_llm_backend(settings=None):
+    """The generation backend configured for this deployment
+
+    settings, such as the [llm] section of the Streamlit secrets, override
+    the LLM_BACKEND, LOCAL_LLM_URL and LOCAL_LLM_MODEL environment variables.
+    The cohere backend needs an api_key.
+    """
+    settings = dict(settings or {})
+    backend = settings.get("backend", DEFAULT_BACKEND)
+    if backend == "cohere":
+        api_key = settings["api_key"]
+        return CohereBackend(get_cohere(api_key), get_cohere_http(api_key), settings.get("model", "command"))
+    if backend == "local":
+        return LocalBackend(settings.get("url", DEFAULT_LOCAL_URL), settings.get("model", DEFAULT_LOCAL_MODEL))
+    raise ValueError(f"Unknown LLM backend {backend!r}, expected 'cohere' or 'local'")
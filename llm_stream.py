@@ -0,0 +1,127 @@
+import collections
+import json
+import threading
+import time
+
+from local_service import percentiles
+
+
+class StreamMetrics:
+    """Time to first token and total latency of streamed generations
+
+    Latencies are kept for the last window streams. A stream is complete when
+    the model finished, cancelled when the reader stopped early (the user
+    navigated away or cancel was set) and failed when the request raised.
+    """
+
+    def __init__(self, window=500):
+        self._lock = threading.Lock()
+        self._first_token = collections.deque(maxlen=window)
+        self._total = collections.deque(maxlen=window)
+        self._counts = {"complete": 0, "cancelled": 0, "failed": 0, "chunks": 0}
+        self.last = None
+
+    def record(self, outcome, first_token_s, total_s, chunks):
+        with self._lock:
+            self._counts[outcome] += 1
+            self._counts["chunks"] += chunks
+            if first_token_s is not None:
+                self._first_token.append(first_token_s * 1000)
+            if outcome == "complete":
+                self._total.append(total_s * 1000)
+            self.last = {
+                "outcome": outcome,
+                "first_token_ms": first_token_s * 1000 if first_token_s is not None else None,
+                "total_ms": total_s * 1000,
+                "chunks": chunks,
+            }
+
+    def summary(self):
+        with self._lock:
+            summary = dict(self._counts)
+            summary["first_token_ms"] = percentiles(list(self._first_token))
+            summary["total_ms"] = percentiles(list(self._total))
+            summary["last"] = self.last
+        return summary
+
+
+_metrics = StreamMetrics()
+
+
+def stream_metrics():
+    """Process-wide latency summary of every stream read through timed_stream"""
+    return _metrics.summary()
+
+
+def timed_stream(chunks, cancel=None, metrics=None):
+    """Yield the non-empty text chunks of a stream, recording time to first token
+
+    Stops when cancel (a threading.Event) is set. Whether it ends, is
+    cancelled or is closed by its reader, the underlying stream is closed so
+    an abandoned request does not keep generating tokens.
+    """
+    metrics = metrics or _metrics
+    start = time.perf_counter()
+    first_token_s = None
+    count = 0
+    outcome = "cancelled"
+    try:
+        for chunk in chunks:
+            if cancel is not None and cancel.is_set():
+                break
+            if not chunk:
+                continue
+            if first_token_s is None:
+                first_token_s = time.perf_counter() - start
+            count += 1
+            yield chunk
+        else:
+            outcome = "complete"
+    except Exception:
+        outcome = "failed"
+        raise
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+        metrics.record(outcome, first_token_s, time.perf_counter() - start, count)
+
+
+class GenerationError(RuntimeError):
+    """A streamed generation the API rejected or aborted, status_code and headers as the server sent them"""
+
+    def __init__(self, message, status_code=None, headers=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def _cohere_chunks(http, prompt, max_tokens, model, **kwargs):
+    # The SDK's generate_stream swallows GeneratorExit, so closing it does not
+    # end the request. The documented streaming endpoint is called directly
+    # instead, leaving the with block closes the response and its connection.
+    body = dict(kwargs, prompt=prompt, model=model, max_tokens=max_tokens, stream=True)
+    with http.stream("POST", "v1/generate", json=body) as response:
+        if response.status_code >= 300:
+            response.read()
+            raise GenerationError(
+                f"Generation failed with HTTP {response.status_code}: {response.text[:200]}",
+                response.status_code, response.headers
+            )
+        for line in response.iter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            kind = event.get("event_type")
+            if kind == "text-generation":
+                yield event.get("text", "")
+            elif kind == "stream-error":
+                raise GenerationError(f"Generation failed: {event.get('err')}")
+
+
+def cohere_stream(http, prompt, max_tokens=200, model="command", cancel=None, **kwargs):
+    """Text of a Cohere generation, chunk by chunk as the tokens arrive
+
+    http is an httpx client for the Cohere API, see clients.get_cohere_http.
+    """
+    return timed_stream(_cohere_chunks(http, prompt, max_tokens, model, **kwargs), cancel)
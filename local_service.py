@@ -0,0 +1,195 @@
+"""Shared plumbing of the long-lived local model servers and their clients
+
+A server keeps its models warm in a process pool and answers any number of
+Streamlit sessions over an authenticated multiprocessing connection.
+"""
+import collections
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.connection import Client, Listener
+
+
+class ServerBusy(Exception):
+    """Raised when the server's request queue is full"""
+
+
+def load_authkey(env):
+    """Secret shared by a server and its clients, read from the environment
+
+    The Listener unpickles whatever an authenticated client sends, so there
+    is deliberately no default key.
+    """
+    key = os.environ.get(env)
+    if not key:
+        raise RuntimeError(
+            f"Set {env} to a random secret shared by the server and its clients, "
+            "e.g. python -c \"import secrets; print(secrets.token_hex(32))\""
+        )
+    return key.encode()
+
+
+def _worker_pid(delay):
+    # Runs after the worker's initializer, so the pid it returns has its models loaded.
+    # Lingering briefly lets every worker pick up one of the warm-up tasks
+    time.sleep(delay)
+    return os.getpid()
+
+
+def percentiles(samples, points=(50, 90, 99)):
+    """Nearest-rank percentiles of a list of latencies"""
+    if not samples:
+        return {f"p{p}": None for p in points}
+    ordered = sorted(samples)
+    return {f"p{p}": ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] for p in points}
+
+
+class LocalServer:
+    """Accepts requests over a multiprocessing Listener and runs them on a warm process pool
+
+    Subclasses name the methods clients may call in operations. At most
+    queue_size requests are admitted at once (running or waiting for a
+    worker), further ones wait up to queue_timeout seconds and then get a
+    busy error, so callers degrade instead of piling up latency.
+    """
+
+    name = "Local server"
+    authkey_env = None
+    operations = ("stats",)
+
+    def __init__(self, address, authkey=None, workers=2, queue_size=32, queue_timeout=1.0, initializer=None):
+        self.address = address
+        self.authkey = authkey or load_authkey(self.authkey_env)
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=initializer)
+        self.load_ms = None
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._latencies = collections.deque(maxlen=10000)
+        self._counts = {"errors": 0, "rejected": 0}
+        self._stats_lock = threading.Lock()
+        self._listener = None
+        self._closed = threading.Event()
+
+    def warm(self, timeout=600):
+        """Block until every worker process has loaded its models, returns the time it took in milliseconds"""
+        start = time.perf_counter()
+        ready = set()
+        while len(ready) < self.workers:
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError(f"Only {len(ready)} of {self.workers} workers loaded their models")
+            futures = [self.pool.submit(_worker_pid, 0.05) for _ in range(self.workers)]
+            ready.update(future.result() for future in futures)
+        self.load_ms = (time.perf_counter() - start) * 1000
+        return self.load_ms
+
+    def _run(self, fn, *args):
+        """fn(*args) on a worker once a queue slot is free, returns its result and the latency in milliseconds"""
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._stats_lock:
+                self._counts["rejected"] += 1
+            raise ServerBusy(f"{self.name} queue is full")
+        start = time.perf_counter()
+        try:
+            result = self.pool.submit(fn, *args).result()
+        except Exception:
+            with self._stats_lock:
+                self._counts["errors"] += 1
+            raise
+        finally:
+            self._slots.release()
+        return result, (time.perf_counter() - start) * 1000
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._counts)
+        stats["load_ms"] = self.load_ms
+        stats["workers"] = self.workers
+        return stats
+
+    def _handle(self, conn):
+        with conn:
+            while not self._closed.is_set():
+                try:
+                    op, payload = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    if op in self.operations:
+                        reply = ("ok", getattr(self, op)(*(payload or ())))
+                    else:
+                        reply = ("error", f"Unknown operation: {op}")
+                except ServerBusy as e:
+                    reply = ("busy", str(e))
+                except Exception as e:
+                    reply = ("error", str(e))
+                conn.send(reply)
+
+    def _accept_loop(self):
+        while not self._closed.is_set():
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                break
+            # One thread per Streamlit session, the process pool does the heavy lifting
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _bind(self):
+        self._listener = Listener(self.address, authkey=self.authkey)
+        # Resolves port 0 to the port actually bound
+        self.address = self._listener.address
+
+    def serve_forever(self):
+        self._bind()
+        self._accept_loop()
+
+    def start(self):
+        """Serve from a background thread, returns once the socket is listening"""
+        self._bind()
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self
+
+    def close(self):
+        self._closed.set()
+        if self._listener is not None:
+            self._listener.close()
+        self.pool.shutdown(cancel_futures=True)
+
+
+class LocalClient:
+    """Connection to a running LocalServer, one per Streamlit session"""
+
+    authkey_env = None
+
+    def __init__(self, address, authkey=None):
+        self.address = address
+        self.authkey = authkey or load_authkey(self.authkey_env)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _call(self, op, payload=None):
+        with self._lock:
+            if self._conn is None:
+                self._conn = Client(self.address, authkey=self.authkey)
+            try:
+                self._conn.send((op, payload))
+                status, result = self._conn.recv()
+            except (EOFError, OSError):
+                # Reconnect on the next call if the server was restarted
+                self._conn = None
+                raise
+        if status == "busy":
+            raise ServerBusy(result)
+        if status != "ok":
+            raise RuntimeError(result)
+        return result
+
+    def stats(self):
+        return self._call("stats")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,9 +1,8 @@
 import streamlit as st
-import firebase_admin
-from firebase_admin import credentials, auth
 import time
 import webbrowser
 import os  # For opening URLs
+from clients import get_auth
 
 # Set up page configuration
 st.set_page_config(
@@ -41,10 +40,8 @@ st.markdown(
 with st.container():
     st.title("🤖 AI Mock Interview System")
 
-# Initialize Firebase Admin SDK
-if not firebase_admin._apps:
-    cred = credentials.Certificate(r"C:\Users\ROSHAN\Downloads\finalhari.py\finalhari.py\codewHari.py\mock-20306-firebase-adminsdk-fbsvc-e03a8e8956.json")
-    firebase_admin.initialize_app(cred)
+# Initialize Firebase Admin SDK (cached per process)
+auth = get_auth(r"C:\Users\ROSHAN\Downloads\finalhari.py\finalhari.py\codewHari.py\mock-20306-firebase-adminsdk-fbsvc-e03a8e8956.json")
 
 # Page Routing
 if 'page' not in st.session_state:
@@ -1,10 +1,9 @@
 
 import streamlit as st
-import firebase_admin
-from firebase_admin import credentials, auth
 import time
 import webbrowser
 import os
+from clients import get_auth
 
 # Set up page configuration
 st.set_page_config(
@@ -141,13 +140,11 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# Initialize Firebase Admin SDK
-if not firebase_admin._apps:
-    try:
-        cred = credentials.Certificate(r"C:\Users\ROSHAN\Downloads\finalhari.py\finalhari.py\codewHari.py\mock-20306-firebase-adminsdk-fbsvc-e03a8e8956.json")
-        firebase_admin.initialize_app(cred)
-    except Exception as e:
-        st.error(f"Error initializing Firebase: {e}")
+# Initialize Firebase Admin SDK (cached per process)
+try:
+    auth = get_auth(r"C:\Users\ROSHAN\Downloads\finalhari.py\finalhari.py\codewHari.py\mock-20306-firebase-adminsdk-fbsvc-e03a8e8956.json")
+except Exception as e:
+    st.error(f"Error initializing Firebase: {e}")
 
 # Page state management
 if 'page' not in st.session_state:
@@ -0,0 +1,114 @@
+import collections
+import threading
+
+
+# Candidates whose notes stay loaded and watched in this process
+NOTES_CACHE_SIZE = 16
+
+_caches = collections.OrderedDict()
+_lock = threading.Lock()
+
+class NotesCache:
+    """Expert notes of one candidate, keyed by the timestamp of the moment they describe
+
+    All notes are read with a single collection query. Saves write through to
+    Firestore and to the cache. A Firestore change listener applies edits made
+    from other sessions, so moving the timeline slider never waits on the
+    network. version changes whenever the notes do.
+    """
+
+    def __init__(self, db, candidate_name, listen=True):
+        self.candidate_name = candidate_name
+        self.collection = db.collection("stress_analysis").document(candidate_name).collection("notes")
+        self.version = 0
+        self.stats = {"queries": 0, "reads": 0, "writes": 0, "remote_changes": 0}
+        self._notes = {}
+        self._lock = threading.Lock()
+        self._watch = None
+        self._load()
+        if listen:
+            self._watch = self.collection.on_snapshot(self._on_snapshot)
+
+    @staticmethod
+    def _timestamp(doc_id, data):
+        return int(data.get("timestamp", doc_id))
+
+    def _load(self):
+        notes = {}
+        for doc in self.collection.stream():
+            data = doc.to_dict() or {}
+            notes[self._timestamp(doc.id, data)] = data.get("text", "")
+        with self._lock:
+            self._notes = notes
+            self.stats["queries"] += 1
+            self.version += 1
+
+    def _on_snapshot(self, snapshot, changes, read_time):
+        # Runs on the listener's thread, the first call replays the notes already loaded
+        with self._lock:
+            changed = False
+            for change in changes:
+                data = change.document.to_dict() or {}
+                timestamp = self._timestamp(change.document.id, data)
+                if change.type.name == "REMOVED":
+                    changed |= self._notes.pop(timestamp, None) is not None
+                elif self._notes.get(timestamp) != data.get("text", ""):
+                    self._notes[timestamp] = data.get("text", "")
+                    changed = True
+            if changed:
+                self.stats["remote_changes"] += 1
+                self.version += 1
+
+    def get(self, timestamp, default=""):
+        """Note text for a moment, served from memory"""
+        with self._lock:
+            self.stats["reads"] += 1
+            return self._notes.get(int(timestamp), default)
+
+    def save(self, timestamp, text):
+        """Store a note in Firestore and in the cache"""
+        timestamp = int(timestamp)
+        self.collection.document(str(timestamp)).set({"text": text, "timestamp": timestamp})
+        with self._lock:
+            self.stats["writes"] += 1
+            if self._notes.get(timestamp) != text:
+                self._notes[timestamp] = text
+                self.version += 1
+
+    def items(self):
+        """(timestamp, text) of every non-empty note, in time order"""
+        with self._lock:
+            return sorted((timestamp, text) for timestamp, text in self._notes.items() if text)
+
+    def close(self):
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+
+def get_notes_cache(db, candidate_name):
+    """Process-wide NotesCache of a candidate, shared by every session viewing them
+
+    Sessions end without notice, so they never own a listener. The least
+    recently viewed candidates beyond NOTES_CACHE_SIZE are closed, which
+    caps the number of open Firestore watches per process.
+    """
+    with _lock:
+        cache = _caches.get(candidate_name)
+        if cache is not None:
+            _caches.move_to_end(candidate_name)
+            return cache
+    cache = NotesCache(db, candidate_name)
+    with _lock:
+        # Another session may have loaded the same candidate meanwhile
+        if candidate_name in _caches:
+            cache.close()
+            _caches.move_to_end(candidate_name)
+            return _caches[candidate_name]
+        _caches[candidate_name] = cache
+        evicted = []
+        while len(_caches) > NOTES_CACHE_SIZE:
+            evicted.append(_caches.popitem(last=False)[1])
+    for old in evicted:
+        old.close()
+    return cache
@@ -0,0 +1,39 @@
+"""Prompt templates shared by the dashboard and the candidate page, whatever LLM backend answers them"""
+
+
+def interview_questions_prompt(profile):
+    """Five questions for a synced candidate profile (role, experience, skills)"""
+    return f"Generate five interview questions for a candidate applying as {profile.get('role', 'N/A')} with {profile.get('experience', 'N/A')} years of experience and skills in {profile.get('skills', 'N/A')}."
+
+
+def parse_interview_questions(text, count=5):
+    questions = text.strip().split("\n")
+    questions = [q.strip() for q in questions if q.strip()]
+    return questions[:count]
+
+
+def first_question_prompt(name, education, job_role, skills, work_experience):
+    """Opening question for the profile a candidate submitted"""
+    return f"""
+        I am conducting a job interview for the role of '{job_role}'.
+        The candidate has the following profile:
+        - Name: {name}
+        - Education: {education}
+        - Job Role: {job_role}
+        - Skills: {skills}
+        - Work Experience: {work_experience}
+
+        Please generate the first interview question specifically tailored to the candidate's profile.
+        """
+
+
+def follow_up_prompt(transcript):
+    """Follow-up question on the candidate's transcribed answer"""
+    return f"""
+            I am an AI interviewer conducting a job interview.
+            The candidate answered: '{transcript}'
+            Based on their answer, generate a highly relevant follow-up question that:
+            - Is clear and professional.
+            - Relates to the candidate's past work experience or technical skills.
+            - Can assess their problem-solving or leadership skills.
+            """
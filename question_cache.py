@@ -0,0 +1,209 @@
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+
+
+DEFAULT_PATH = os.environ.get(
+    "QUESTION_CACHE_PATH",
+    os.path.join(tempfile.gettempdir(), "assessai-questions.sqlite3")
+)
+
+# Years of experience are grouped so that 3 and 4 years share questions, (upper bound, label)
+EXPERIENCE_BUCKETS = [(2, "0-1"), (5, "2-4"), (10, "5-9"), (None, "10+")]
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def _normalise(text):
+    return re.sub(r"[^a-z0-9+#.]+", " ", str(text).lower()).strip()
+
+
+def experience_bucket(experience):
+    match = re.search(r"\d+(\.\d+)?", str(experience))
+    if not match:
+        return _normalise(experience) or "unknown"
+    years = float(match.group())
+    for bound, label in EXPERIENCE_BUCKETS:
+        if bound is None or years < bound:
+            return label
+
+
+def question_signature(profile):
+    """Cache key of a profile: normalised role, experience bucket and sorted skill set"""
+    skills = {_normalise(skill) for skill in re.split(r"[,;/|\n]", str(profile.get("skills", "")))}
+    return "|".join([
+        _normalise(profile.get("role", "")),
+        experience_bucket(profile.get("experience", "")),
+        ",".join(sorted(skill for skill in skills if skill)),
+    ])
+
+
+class QuestionCache:
+    """Persistent cache of generated interview questions keyed by question_signature
+
+    Up to variants question sets are kept per signature: the first candidates
+    with a signature get newly generated sets, later ones a stored set picked
+    by name. The set each candidate got is recorded, so candidates with the
+    same profile do not all hear the same questions and a revisited candidate
+    gets the same set again without another generation.
+    Sets expire after ttl seconds and the least recently used signatures are
+    evicted beyond max_keys. SQLite lets several Streamlit processes share it.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, ttl=7 * 24 * 3600, max_keys=2000, variants=3):
+        self.path = path
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.variants = variants
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # last_used updates on every hit, WAL keeps the cache consistent without an fsync per commit
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS questions ("
+            " signature TEXT, variant INTEGER, questions TEXT, created REAL, last_used REAL,"
+            " PRIMARY KEY (signature, variant))"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS assignments ("
+            " signature TEXT, candidate TEXT, variant INTEGER, PRIMARY KEY (signature, candidate))"
+        )
+        self._db.commit()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0, "hit_s": 0.0, "generate_s": 0.0}
+
+    def _live_variants(self, signature, now):
+        rows = self._db.execute(
+            "SELECT variant, questions, created FROM questions WHERE signature = ?", (signature,)
+        ).fetchall()
+        live = [(variant, questions) for variant, questions, created in rows if now - created < self.ttl]
+        if len(live) < len(rows):
+            self._stats["expired"] += len(rows) - len(live)
+            expired = [(signature, variant) for variant, _, created in rows if now - created >= self.ttl]
+            self._db.executemany("DELETE FROM questions WHERE signature = ? AND variant = ?", expired)
+            self._db.executemany("DELETE FROM assignments WHERE signature = ? AND variant = ?", expired)
+            self._db.commit()
+        return live
+
+    def _lookup(self, profile, pick):
+        # The candidate's own set, or with pick a live one chosen by name, which becomes theirs
+        start = time.perf_counter()
+        signature = question_signature(profile)
+        candidate = str(profile.get("name", ""))
+        now = time.time()
+        with self._lock:
+            live = dict(self._live_variants(signature, now))
+            row = self._db.execute(
+                "SELECT variant FROM assignments WHERE signature = ? AND candidate = ?", (signature, candidate)
+            ).fetchone()
+            if row is not None and row[0] in live:
+                variant = row[0]
+            elif pick and live:
+                variants = sorted(live)
+                variant = variants[zlib.crc32(candidate.encode("utf-8")) % len(variants)]
+                self._db.execute("INSERT OR REPLACE INTO assignments VALUES (?, ?, ?)", (signature, candidate, variant))
+            else:
+                return None
+            self._db.execute(
+                "UPDATE questions SET last_used = ? WHERE signature = ? AND variant = ?", (now, signature, variant)
+            )
+            self._db.commit()
+            self._stats["hits"] += 1
+            self._stats["hit_s"] += time.perf_counter() - start
+        return json.loads(live[variant])
+
+    def get(self, profile):
+        """The question set the profile's candidate was given, else a stored one for its signature, or None"""
+        return self._lookup(profile, pick=True)
+
+    def put(self, profile, questions, replace=True):
+        """Store a newly generated question set as the candidate's, replacing the oldest variant when the pool is full
+
+        Without replace a full pool is left as it is, returns whether the set was stored.
+        """
+        signature = question_signature(profile)
+        now = time.time()
+        with self._lock:
+            live = {variant for variant, _ in self._live_variants(signature, now)}
+            free = [variant for variant in range(self.variants) if variant not in live]
+            if free:
+                variant = free[0]
+            elif not replace:
+                return False
+            else:
+                variant = self._db.execute(
+                    "SELECT variant FROM questions WHERE signature = ? ORDER BY created LIMIT 1", (signature,)
+                ).fetchone()[0]
+            # Candidates given the replaced set are picked a new one on their next visit
+            self._db.execute("DELETE FROM assignments WHERE signature = ? AND variant = ?", (signature, variant))
+            self._db.execute(
+                "INSERT OR REPLACE INTO questions VALUES (?, ?, ?, ?, ?)",
+                (signature, variant, json.dumps(questions), now, now)
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO assignments VALUES (?, ?, ?)",
+                (signature, str(profile.get("name", "")), variant)
+            )
+            self._evict()
+            self._db.commit()
+        return True
+
+    def _evict(self):
+        keys = self._db.execute("SELECT COUNT(DISTINCT signature) FROM questions").fetchone()[0]
+        if keys <= self.max_keys:
+            return
+        stale = self._db.execute(
+            "SELECT signature FROM questions GROUP BY signature ORDER BY MAX(last_used) LIMIT ?",
+            (keys - self.max_keys,)
+        ).fetchall()
+        self._db.executemany("DELETE FROM questions WHERE signature = ?", stale)
+        self._db.executemany("DELETE FROM assignments WHERE signature = ?", stale)
+        self._stats["evicted"] += len(stale)
+
+    def pool_full(self, profile):
+        with self._lock:
+            return len(self._live_variants(question_signature(profile), time.time())) >= self.variants
+
+    def get_or_generate(self, profile, generate):
+        """Questions for a profile, calling generate(profile) only for a new candidate while the variant pool is not full"""
+        questions = self._lookup(profile, pick=self.pool_full(profile))
+        if questions is None:
+            start = time.perf_counter()
+            questions = generate(profile)
+            with self._lock:
+                self._stats["misses"] += 1
+                self._stats["generate_s"] += time.perf_counter() - start
+            # Concurrent generations for the signature may have filled the pool meanwhile,
+            # the candidates already given those sets keep them
+            if questions and not self.put(profile, questions, replace=False):
+                questions = self._lookup(profile, pick=True) or questions
+        return questions
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        requests = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / requests if requests else 0.0
+        stats["mean_hit_us"] = stats["hit_s"] * 1e6 / max(stats["hits"], 1)
+        stats["mean_generate_ms"] = stats["generate_s"] * 1000 / max(stats["misses"], 1)
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def get_question_cache():
+    """Process-wide cache at the default path"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = QuestionCache()
+    return _default_cache
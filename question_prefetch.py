@@ -0,0 +1,196 @@
+import queue
+import random
+import threading
+import time
+
+from question_cache import question_signature
+
+
+def is_rate_limited(error):
+    """Whether an LLM client error is a 429 / rate limit response"""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    name = type(error).__name__.lower()
+    return status == 429 or "toomanyrequests" in name or "ratelimit" in name or "rate limit" in str(error).lower()
+
+
+def retry_after(error):
+    """Seconds the server asked us to wait, if it said so"""
+    headers = getattr(error, "headers", None) or getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class QuestionPrefetcher:
+    """Generates interview questions for synced candidates in the background
+
+    Profiles wait in a bounded queue served by max_workers threads. Requests
+    in flight start at max_workers, halve on every rate-limit response and
+    grow back by one after as many successes. Rate-limited calls are retried
+    with exponential backoff and jitter, honouring Retry-After. Profiles that
+    do not fit in the queue are left to be generated on demand. Results are
+    kept per candidate name and handed to store(profile, questions). A
+    candidate whose role, experience or skills change is queued again.
+    """
+
+    def __init__(self, generate, cache=None, store=None, max_workers=4, max_pending=2000,
+                 max_retries=5, base_delay=1.0, max_delay=30.0):
+        self.generate = generate
+        self.cache = cache
+        self.store = store
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._slots = threading.Condition()
+        self._limit = max_workers
+        self._in_flight = 0
+        self._successes = 0
+        self._state = {}
+        self._signatures = {}
+        self._results = {}
+        self._threads = []
+        self._stats = {"queued": 0, "dropped": 0, "generated": 0, "cached": 0, "failed": 0,
+                       "retries": 0, "backoff_s": 0.0, "generate_s": 0.0}
+
+    def _start(self):
+        while len(self._threads) < self.max_workers:
+            thread = threading.Thread(target=self._work, name=f"question-prefetch-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, profiles):
+        """Queue question generation for profiles not already ready or pending, returns how many were queued"""
+        queued = 0
+        with self._lock:
+            self._start()
+            for profile in profiles:
+                name = profile["name"]
+                signature = question_signature(profile)
+                if self._state.get(name) in ("pending", "ready") and self._signatures.get(name) == signature:
+                    continue
+                try:
+                    self._queue.put_nowait(profile)
+                except queue.Full:
+                    self._stats["dropped"] += 1
+                    continue
+                self._state[name] = "pending"
+                self._signatures[name] = signature
+                # Questions for an earlier version of the profile no longer apply
+                self._results.pop(name, None)
+                queued += 1
+            self._stats["queued"] += queued
+        return queued
+
+    def _call(self, profile):
+        with self._slots:
+            self._slots.wait_for(lambda: self._in_flight < self._limit)
+            self._in_flight += 1
+        try:
+            result = self.generate(profile)
+        except Exception as e:
+            with self._slots:
+                if is_rate_limited(e):
+                    self._limit = max(1, self._limit // 2)
+                    self._successes = 0
+            raise
+        else:
+            with self._slots:
+                self._successes += 1
+                if self._successes >= self._limit and self._limit < self.max_workers:
+                    self._limit += 1
+                    self._successes = 0
+            return result
+        finally:
+            with self._slots:
+                self._in_flight -= 1
+                self._slots.notify_all()
+
+    def _generate_with_retry(self, profile):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self._call(profile)
+            except Exception as e:
+                if attempt == self.max_retries or not is_rate_limited(e):
+                    raise
+                delay = retry_after(e) or min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+                with self._lock:
+                    self._stats["retries"] += 1
+                    self._stats["backoff_s"] += delay
+                time.sleep(delay)
+
+    def _work(self):
+        while True:
+            profile = self._queue.get()
+            name = profile["name"]
+            generated = []
+
+            def generate(profile):
+                start = time.perf_counter()
+                questions = self._generate_with_retry(profile)
+                generated.append(time.perf_counter() - start)
+                return questions
+
+            try:
+                # The cache decides whether this candidate needs a new set or gets its stored one
+                if self.cache is not None:
+                    questions = self.cache.get_or_generate(profile, generate)
+                else:
+                    questions = generate(profile)
+                source = "generated" if generated else "cached"
+                with self._lock:
+                    self._stats["generate_s"] += sum(generated)
+                if self.store is not None:
+                    self.store(profile, questions)
+                with self._lock:
+                    # A newer profile for this candidate may have been queued meanwhile
+                    if self._signatures.get(name) == question_signature(profile):
+                        self._results[name] = (question_signature(profile), questions)
+                        self._state[name] = "ready"
+                    self._stats[source] += 1
+            except Exception:
+                with self._lock:
+                    if self._signatures.get(name) == question_signature(profile):
+                        self._state[name] = "failed"
+                    self._stats["failed"] += 1
+            finally:
+                self._queue.task_done()
+
+    def status(self, name):
+        """Candidate state: pending, ready, failed, or None when it was never queued"""
+        with self._lock:
+            return self._state.get(name)
+
+    def questions_for(self, profile):
+        """Questions prepared for this version of the profile, or None"""
+        with self._lock:
+            signature, questions = self._results.get(profile["name"], (None, None))
+        return questions if signature == question_signature(profile) else None
+
+    def join(self):
+        """Wait until every queued profile has been processed"""
+        self._queue.join()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = sum(state == "pending" for state in self._state.values())
+        stats["concurrency"] = self._limit
+        return stats
+
+
+_default_prefetcher = None
+_default_lock = threading.Lock()
+
+
+def get_question_prefetcher(generate, cache=None, store=None, max_workers=4):
+    """Process-wide prefetcher, the arguments of the first call configure it"""
+    global _default_prefetcher
+    if _default_prefetcher is None:
+        with _default_lock:
+            if _default_prefetcher is None:
+                _default_prefetcher = QuestionPrefetcher(generate, cache, store, max_workers)
+    return _default_prefetcher
@@ -0,0 +1,180 @@
+import collections
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from downsample import lttb_indices, minmax_indices
+from emotion_analysis import EMOTIONS
+
+
+# Points per line in the PDF charts, far more than a 450pt wide chart can show
+CHART_POINTS = 400
+CHART_WIDTH = 450
+CHART_HEIGHT = 150
+CHART_CACHE_SIZE = 32
+
+_COLORS = ["#d62728", "#8c564b", "#9467bd", "#2ca02c", "#1f77b4", "#ff7f0e", "#7f7f7f"]
+
+_executor = None
+_cache = collections.OrderedDict()
+# Latest key queued for each interview, keys differ from it only in the trailing data version
+_latest = {}
+_lock = threading.Lock()
+
+
+class ReportCharts:
+    """Vector charts for one interview's report, identified by key"""
+
+    def __init__(self, key, drawings):
+        self.key = key
+        self.drawings = drawings
+
+
+def chart_data(timestamps, stress_values, emotion_codes, scores, points=CHART_POINTS):
+    """Downsampled lines and the emotion histogram plotted by the charts, from the series columns"""
+    order = np.argsort(timestamps, kind="stable")
+    timestamps = timestamps[order]
+    minutes = (timestamps - timestamps[0]) / 60.0 if len(timestamps) else timestamps.astype(np.float64)
+    stress = stress_values[order].astype(np.float64)
+    kept = minmax_indices(stress, points)
+    data = {
+        "stress": list(zip(minutes[kept].tolist(), stress[kept].tolist())),
+        "emotions": {},
+        "distribution": np.bincount(emotion_codes[emotion_codes >= 0], minlength=len(EMOTIONS)).tolist(),
+    }
+    scores = scores[order]
+    for column, emotion in enumerate(EMOTIONS):
+        values = scores[:, column].astype(np.float64)
+        kept = lttb_indices(values, points)
+        data["emotions"][emotion] = list(zip(minutes[kept].tolist(), values[kept].tolist()))
+    return data
+
+
+def _line_chart(lines, y_min, y_max, y_steps=None, y_labels=None):
+    from reportlab.graphics.charts.legends import Legend
+    from reportlab.graphics.charts.lineplots import LinePlot
+    from reportlab.graphics.shapes import Drawing, String
+    from reportlab.lib import colors
+
+    drawing = Drawing(CHART_WIDTH, CHART_HEIGHT + 30)
+    plot = LinePlot()
+    plot.x, plot.y = 45, 32
+    plot.width, plot.height = CHART_WIDTH - (140 if len(lines) > 1 else 60), CHART_HEIGHT - 15
+    plot.data = [points or [(0, y_min)] for _, points in lines]
+    for i, (name, _) in enumerate(lines):
+        plot.lines[i].strokeColor = colors.HexColor(_COLORS[i % len(_COLORS)] if len(lines) > 1 else "#dc143c")
+        plot.lines[i].strokeWidth = 0.8
+    plot.xValueAxis.valueMin = 0
+    plot.xValueAxis.labelTextFormat = "%d"
+    for axis in (plot.xValueAxis, plot.yValueAxis):
+        axis.labels.fontName = "Helvetica"
+        axis.labels.fontSize = 7
+    plot.yValueAxis.valueMin, plot.yValueAxis.valueMax = y_min, y_max
+    if y_steps:
+        plot.yValueAxis.valueSteps = y_steps
+    if y_labels:
+        plot.yValueAxis.labelTextFormat = lambda value: y_labels.get(round(value), "")
+    drawing.add(plot)
+    drawing.add(String(plot.x + plot.width / 2, 4, "Minutes into the interview",
+                       fontName="Helvetica", fontSize=8, textAnchor="middle"))
+
+    if len(lines) > 1:
+        legend = Legend()
+        legend.x, legend.y = plot.x + plot.width + 15, plot.y + plot.height
+        legend.fontName = "Helvetica"
+        legend.fontSize = 7
+        legend.columnMaximum = len(lines)
+        legend.alignment = "right"
+        legend.colorNamePairs = [(plot.lines[i].strokeColor, name.capitalize()) for i, (name, _) in enumerate(lines)]
+        drawing.add(legend)
+    return drawing
+
+
+def _distribution_chart(histogram):
+    from reportlab.graphics.charts.legends import Legend
+    from reportlab.graphics.charts.piecharts import Pie
+    from reportlab.graphics.shapes import Drawing
+    from reportlab.lib import colors
+
+    drawing = Drawing(CHART_WIDTH, CHART_HEIGHT + 30)
+    shown = [(emotion, count) for emotion, count in zip(EMOTIONS, histogram) if count]
+    if not shown:
+        return drawing
+    total = sum(count for _, count in shown)
+    pie = Pie()
+    pie.x, pie.y = 60, 15
+    pie.width = pie.height = CHART_HEIGHT
+    pie.data = [count for _, count in shown]
+    for i, (emotion, _) in enumerate(shown):
+        pie.slices[i].fillColor = colors.HexColor(_COLORS[EMOTIONS.index(emotion)])
+        pie.slices[i].strokeColor = colors.white
+    drawing.add(pie)
+
+    legend = Legend()
+    legend.x, legend.y = pie.x + pie.width + 60, pie.y + pie.height - 10
+    legend.fontName = "Helvetica"
+    legend.fontSize = 8
+    legend.columnMaximum = len(EMOTIONS)
+    legend.alignment = "right"
+    legend.colorNamePairs = [
+        (pie.slices[i].fillColor, f"{emotion.capitalize()}  {count / total:.0%}")
+        for i, (emotion, count) in enumerate(shown)
+    ]
+    drawing.add(legend)
+    return drawing
+
+
+def build_charts(key, series):
+    """Stress timeline, emotion timeline and emotion distribution drawings of an EmotionSeries"""
+    return _build_charts(key, series.timestamps, series.stress_values, series.emotion_codes, series.scores)
+
+
+def _build_charts(key, timestamps, stress_values, emotion_codes, scores):
+    data = chart_data(timestamps, stress_values, emotion_codes, scores)
+    return ReportCharts(key, [
+        ("Stress Level Timeline", _line_chart(
+            [("stress", data["stress"])], 0.5, 3.5, [1, 2, 3], {1: "Low", 2: "Medium", 3: "High"}
+        )),
+        ("Emotion Intensity Timeline", _line_chart(list(data["emotions"].items()), 0, 100)),
+        ("Emotion Distribution", _distribution_chart(data["distribution"])),
+    ])
+
+
+def prefetch_charts(key, series):
+    """Start building the charts of an interview in the background, returns their future
+
+    Charts are cached by key, so the same interview is only drawn once per
+    process. The last element of key is the data version, a build queued for
+    an older version of the same interview that has not started yet is
+    cancelled, so a live recording never has more than one build waiting.
+    """
+    global _executor
+    with _lock:
+        future = _cache.get(key)
+        # A failed build is retried rather than cached
+        if future is not None and not (future.done() and (future.cancelled() or future.exception() is not None)):
+            _cache.move_to_end(key)
+            return future
+        superseded = _latest.get(key[:-1])
+        if superseded is not None and superseded != key and superseded in _cache and _cache[superseded].cancel():
+            del _cache[superseded]
+        _latest[key[:-1]] = key
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="report-charts")
+        # Copy the columns now, the series may grow while the charts are drawn
+        future = _executor.submit(
+            _build_charts, key, series.timestamps.copy(), series.stress_values.copy(),
+            series.emotion_codes.copy(), series.scores.copy()
+        )
+        _cache[key] = future
+        if len(_cache) > CHART_CACHE_SIZE:
+            evicted, _ = _cache.popitem(last=False)
+            if _latest.get(evicted[:-1]) == evicted:
+                del _latest[evicted[:-1]]
+    return future
+
+
+def get_charts(key, series, timeout=None):
+    """Charts of an interview, waiting for the background build if it is still running"""
+    return prefetch_charts(key, series).result(timeout)
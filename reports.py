@@ -0,0 +1,126 @@
+import collections
+import hashlib
+import io
+import json
+import threading
+from datetime import datetime
+
+
+# Rendered PDFs kept per process, keyed by the hash of the summary they show
+PDF_CACHE_SIZE = 32
+
+_pdf_cache = collections.OrderedDict()
+_pdf_lock = threading.Lock()
+
+
+def build_summary(candidate_name, interview_stats):
+    """Report summary from the EmotionStats.summary() figures of an interview"""
+    return {
+        "candidate_name": candidate_name,
+        "interview_date": datetime.fromtimestamp(interview_stats["started_at"]).strftime('%Y-%m-%d'),
+        "interview_duration": f"{interview_stats['duration_s'] / 60:.1f} minutes",
+        "avg_stress_level": interview_stats["avg_stress_level"],
+        "max_stress_level": interview_stats["max_stress_level"],
+        "dominant_emotion": interview_stats["dominant_emotion"],
+        "stress_peaks": interview_stats["stress_peaks"],
+        "relaxed_moments": interview_stats["relaxed_moments"]
+    }
+
+
+def summary_key(summary):
+    """Content hash of a summary, identical summaries render identical reports"""
+    return hashlib.sha1(json.dumps(summary, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def report_filename(summary):
+    return f"{summary['candidate_name']}_interview_summary.pdf"
+
+
+def _analysis_note(summary):
+    # Create a personalized analysis based on the data
+    if summary['avg_stress_level'] > 2.5:
+        return f"{summary['candidate_name']} exhibited high stress levels throughout the interview. Consider providing more preparation or a more comfortable interview environment in the future."
+    elif summary['avg_stress_level'] > 1.5:
+        return f"{summary['candidate_name']} showed moderate stress levels with some peaks during the interview. Overall handling was adequate."
+    return f"{summary['candidate_name']} maintained low stress levels throughout the interview, indicating good preparation and comfort with the process."
+
+
+def _write_pdf(summary, output, charts=None):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    doc = SimpleDocTemplate(output, pagesize=letter)
+    styles = getSampleStyleSheet()
+    table_style = TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ])
+
+    content = [Paragraph("Interview Summary Report", styles['Heading1']), Spacer(1, 12)]
+
+    content.append(Paragraph("Candidate Information", styles['Heading2']))
+    content.append(Spacer(1, 6))
+    candidate_table = Table([
+        ["Candidate Name:", summary["candidate_name"]],
+        ["Interview Date:", summary["interview_date"]],
+        ["Interview Duration:", summary["interview_duration"]]
+    ], colWidths=[150, 300])
+    candidate_table.setStyle(table_style)
+    content.append(candidate_table)
+    content.append(Spacer(1, 12))
+
+    content.append(Paragraph("Stress Analysis", styles['Heading2']))
+    content.append(Spacer(1, 6))
+    stress_table = Table([
+        ["Average Stress Level:", f"{summary['avg_stress_level']:.2f}"],
+        ["Maximum Stress Level:", str(summary['max_stress_level'])],
+        ["Dominant Emotion:", summary["dominant_emotion"]],
+        ["High Stress Moments:", str(summary["stress_peaks"])],
+        ["Relaxed Moments:", str(summary["relaxed_moments"])]
+    ], colWidths=[150, 300])
+    stress_table.setStyle(table_style)
+    content.append(stress_table)
+
+    content.append(Spacer(1, 24))
+    content.append(Paragraph("Analysis Note:", styles['Heading3']))
+    content.append(Paragraph(_analysis_note(summary), styles['Normal']))
+
+    if charts is not None:
+        from reportlab.platypus import KeepTogether
+
+        for title, drawing in charts.drawings:
+            content.append(Spacer(1, 18))
+            content.append(KeepTogether([Paragraph(title, styles['Heading2']), drawing]))
+
+    content.append(Spacer(1, 30))
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    content.append(Paragraph(f"Report generated on: {timestamp}", styles['Italic']))
+
+    doc.build(content)
+
+
+def render_summary_pdf(summary, charts=None):
+    """PDF bytes of the summary report, rendered in memory
+
+    charts are the ReportCharts of the interview, see report_charts. Reports
+    are cached by summary_key and the charts' key, so asking again for an
+    unchanged interview returns the bytes rendered the first time.
+    """
+    key = summary_key(summary) if charts is None else f"{summary_key(summary)}:{charts.key!r}"
+    with _pdf_lock:
+        data = _pdf_cache.get(key)
+        if data is not None:
+            _pdf_cache.move_to_end(key)
+            return data
+    buffer = io.BytesIO()
+    _write_pdf(summary, buffer, charts)
+    data = buffer.getvalue()
+    with _pdf_lock:
+        _pdf_cache[key] = data
+        if len(_pdf_cache) > PDF_CACHE_SIZE:
+            _pdf_cache.popitem(last=False)
+    return data
@@ -0,0 +1,178 @@
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Firestore rejects batches with more than 500 writes
+BATCH_SIZE = 500
+
+# Rows requested per Sheets API call when streaming a sheet
+PAGE_SIZE = 1000
+
+PROFILE_FIELDS = ["name", "email", "education", "role", "skills", "experience"]
+
+
+def _find_column(headers, *keywords):
+    for i, h in enumerate(headers):
+        if all(k in h for k in keywords):
+            return i
+    return -1
+
+
+def resolve_columns(headers):
+    """Map each profile field to its column index in the header row (-1 if missing)"""
+    return {
+        "name": headers.index("Name") if "Name" in headers else -1,
+        "email": headers.index("Email") if "Email" in headers else -1,
+        "education": _find_column(headers, "Education"),
+        "role": _find_column(headers, "Job role"),
+        "skills": _find_column(headers, "Skills"),
+        "experience": _find_column(headers, "Years", "experience"),
+    }
+
+
+def build_profiles(rows, columns):
+    """Build candidate profiles column-wise from the data rows of a sheet"""
+    field_values = []
+    for field in PROFILE_FIELDS:
+        idx = columns[field]
+        if idx < 0:
+            field_values.append(["Unknown"] * len(rows))
+        else:
+            # Short rows are padded with empty strings, as Sheets trims trailing blanks
+            field_values.append([row[idx] if idx < len(row) else "" for row in rows])
+
+    profiles = []
+    for values in zip(*field_values):
+        profile = dict(zip(PROFILE_FIELDS, values))
+        # Only keep candidates with a name
+        if profile["name"] and profile["name"] != "Unknown":
+            profiles.append(profile)
+    return profiles
+
+
+def profile_fingerprint(profile):
+    """Content hash of a profile, used to detect rows that changed since the last sync"""
+    payload = json.dumps([profile.get(field, "") for field in PROFILE_FIELDS], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _latest_by_name(profiles):
+    # Documents are keyed by name, the last row wins just like sequential writes did
+    latest = {}
+    for profile in profiles:
+        latest.pop(profile["name"], None)
+        latest[profile["name"]] = profile
+    return list(latest.values())
+
+
+def _commit_chunk(db, chunk):
+    batch = db.batch()
+    collection = db.collection("candidates")
+    for doc_id, data in chunk:
+        if data is None:
+            batch.delete(collection.document(doc_id))
+        else:
+            # Merged so fields stored by others, like the prepared questions, survive a resync
+            batch.set(collection.document(doc_id), data, merge=True)
+    batch.commit()
+    return len(chunk)
+
+
+def _commit(db, writes, batch_size, max_workers):
+    chunks = [writes[i:i + batch_size] for i in range(0, len(writes), batch_size)]
+    if max_workers <= 1 or len(chunks) <= 1:
+        return sum(_commit_chunk(db, chunk) for chunk in chunks)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return sum(executor.map(lambda chunk: _commit_chunk(db, chunk), chunks))
+
+
+def load_fingerprints(db):
+    """Read the stored fingerprint of every candidate document in a single query"""
+    docs = db.collection("candidates").select(["fingerprint"]).stream()
+    return {doc.id: (doc.to_dict() or {}).get("fingerprint") for doc in docs}
+
+
+class CandidateSync:
+    """Writes pages of profiles to Firestore as they arrive and keeps the running sync counts
+
+    The report compares the sheet with the stored fingerprints in both modes,
+    with incremental set only profiles added or changed since the last sync
+    are written. Candidates that are no longer in the sheet are counted as
+    missing, and only deleted from Firestore (counted as removed) when prune
+    is set.
+    """
+
+    def __init__(self, db, incremental=True, batch_size=BATCH_SIZE, max_workers=1, prune=False):
+        self.db = db
+        self.incremental = incremental
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.prune = prune
+        self.stored = load_fingerprints(db)
+        self.seen = set()
+        self.report = {"added": 0, "updated": 0, "unchanged": 0, "missing": 0, "removed": 0}
+
+    def add(self, profiles):
+        """Write one page of profiles, returns the number of documents written"""
+        writes = []
+        for profile in _latest_by_name(profiles):
+            doc_id = profile["name"]
+            fingerprint = profile_fingerprint(profile)
+            # A name repeated later in the sheet overwrites the earlier row but is counted once
+            if doc_id not in self.seen:
+                self.seen.add(doc_id)
+                if doc_id not in self.stored:
+                    self.report["added"] += 1
+                elif self.stored[doc_id] != fingerprint:
+                    self.report["updated"] += 1
+                else:
+                    self.report["unchanged"] += 1
+            if self.incremental and self.stored.get(doc_id) == fingerprint:
+                continue
+            self.stored[doc_id] = fingerprint
+            writes.append((doc_id, dict(profile, fingerprint=fingerprint)))
+        return _commit(self.db, writes, self.batch_size, self.max_workers)
+
+    def finish(self):
+        """Count (and optionally delete) candidates missing from the sheet, returns the report"""
+        missing = [doc_id for doc_id in self.stored if doc_id not in self.seen]
+        self.report["missing"] = len(missing)
+        if self.prune:
+            _commit(self.db, [(doc_id, None) for doc_id in missing], self.batch_size, self.max_workers)
+            self.report["removed"] = len(missing)
+        return self.report
+
+
+def _a1_rows(sheet_name, first, last):
+    # Quotes in sheet names are escaped by doubling them
+    return "'{}'!{}:{}".format(sheet_name.replace("'", "''"), first, last)
+
+
+def iter_profile_pages(service, spreadsheet_id, page_size=PAGE_SIZE):
+    """Read the first sheet in fixed-size row ranges and yield the profiles of each page
+
+    Yields (profiles, rows_read, total_rows) so callers can store and display
+    candidates while the rest of the sheet is still being read.
+    """
+    sheet_metadata = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
+    properties = sheet_metadata['sheets'][0]['properties']
+    sheet_name = properties['title']
+    total_rows = properties.get('gridProperties', {}).get('rowCount', 0)
+
+    header = service.spreadsheets().values().get(
+        spreadsheetId=spreadsheet_id,
+        range=_a1_rows(sheet_name, 1, 1)
+    ).execute().get('values', [])
+    if not header:
+        return
+    columns = resolve_columns(header[0])
+
+    for first in range(2, total_rows + 1, page_size):
+        last = min(first + page_size - 1, total_rows)
+        rows = service.spreadsheets().values().get(
+            spreadsheetId=spreadsheet_id,
+            range=_a1_rows(sheet_name, first, last)
+        ).execute().get('values', [])
+        yield build_profiles(rows, columns), last, total_rows
@@ -0,0 +1,226 @@
+import base64
+import collections
+import glob
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+import time
+import uuid
+
+
+DEFAULT_DIRECTORY = os.environ.get(
+    "SNAPSHOT_STORE_DIR",
+    os.path.join(tempfile.gettempdir(), "assessai-snapshots")
+)
+
+# Snapshots are stored at the size the navigator shows them, the only size ever read
+DISPLAY_WIDTH = 640
+
+# Retention: writers start a new segment every SEGMENT_BYTES, and whole segments
+# are deleted, oldest first, once they are older than MAX_AGE or the directory
+# holds more than MAX_BYTES
+SEGMENT_BYTES = 64 * 2**20
+MAX_BYTES = int(float(os.environ.get("SNAPSHOT_STORE_MAX_MB", 1024)) * 2**20)
+MAX_AGE = float(os.environ.get("SNAPSHOT_STORE_MAX_AGE_HOURS", 72)) * 3600
+# Segments written to more recently than this may still be open in another process
+IDLE_GRACE = 300
+
+# Record header: SHA-1 digest of the JPEG followed by its length
+_HEADER = struct.Struct(">20sI")
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+class SnapshotStore:
+    """Content-addressed JPEG snapshot store backed by append-only segment files
+
+    Every process appends to its own segment file, so emotion server workers
+    and Streamlit sessions can share one directory without locking. A snapshot
+    is referenced by the hex SHA-1 of its bytes, identical frames are stored
+    once, and a reader that misses a reference rescans the segments written by
+    other processes. Only these 40 character references go into emotion_data.
+
+    Segments are rotated at segment_bytes. Whole segments are deleted when
+    they are older than max_age seconds or, oldest first, while the directory
+    holds more than max_bytes, so snapshots of past interviews do not pile
+    up. Cleanup runs when a store is created and whenever it rotates.
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, cache_size=64, max_bytes=MAX_BYTES, max_age=MAX_AGE,
+                 segment_bytes=SEGMENT_BYTES, idle_grace=IDLE_GRACE):
+        self.directory = directory
+        self.cache_size = cache_size
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.segment_bytes = segment_bytes
+        self.idle_grace = idle_grace
+        os.makedirs(directory, exist_ok=True)
+        self.pid = os.getpid()
+        self._segment = self._new_segment()
+        self._writer = None
+        self._index = {}
+        self._scanned = {}
+        # Recently viewed snapshots, so scrubbing back and forth never touches disk
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.cleanup()
+
+    def _new_segment(self):
+        return os.path.join(self.directory, f"segment-{self.pid}-{uuid.uuid4().hex[:8]}.blob")
+
+    def put(self, data):
+        """Store JPEG bytes, returns their reference"""
+        digest = hashlib.sha1(data).digest()
+        with self._lock:
+            if digest not in self._index:
+                if self._writer is None:
+                    self._writer = open(self._segment, "ab")
+                offset = self._writer.tell() + _HEADER.size
+                self._writer.write(_HEADER.pack(digest, len(data)) + data)
+                self._writer.flush()
+                self._index[digest] = (self._segment, offset, len(data))
+                self._scanned[self._segment] = offset + len(data)
+                if offset + len(data) >= self.segment_bytes:
+                    self._writer.close()
+                    self._writer = None
+                    self._segment = self._new_segment()
+                    self._cleanup()
+        return digest.hex()
+
+    def put_frame(self, frame, max_width=None, quality=90):
+        """JPEG-encode a BGR frame, downscaled to max_width if wider, and store it"""
+        import cv2
+
+        if max_width and frame.shape[1] > max_width:
+            height = round(frame.shape[0] * max_width / frame.shape[1])
+            frame = cv2.resize(frame, (max_width, height), interpolation=cv2.INTER_AREA)
+        ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            raise ValueError("Could not encode frame as JPEG")
+        return self.put(buffer.tobytes())
+
+    def put_snapshot(self, frame):
+        """Store a frame at display size, returns its reference"""
+        return self.put_frame(frame, DISPLAY_WIDTH)
+
+    def _segments(self):
+        return glob.glob(os.path.join(self.directory, "segment-*.blob"))
+
+    def _forget(self, path):
+        self._scanned.pop(path, None)
+        for digest in [digest for digest, location in self._index.items() if location[0] == path]:
+            del self._index[digest]
+
+    def _cleanup(self):
+        now = time.time()
+        segments = []
+        for path in self._segments():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            segments.append((stat.st_mtime, stat.st_size, path))
+        segments.sort()
+        total = sum(size for _, size, _ in segments)
+        removed = 0
+        for mtime, size, path in segments:
+            if path == self._segment or now - mtime < self.idle_grace:
+                continue
+            if now - mtime <= self.max_age and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Another process cleaned it up first
+                pass
+            total -= size
+            removed += 1
+            self._forget(path)
+        return removed
+
+    def cleanup(self):
+        """Delete expired segments and the oldest ones beyond max_bytes, returns how many were removed"""
+        with self._lock:
+            return self._cleanup()
+
+    def _refresh(self):
+        # Pick up records appended by other processes since the last scan
+        for path in self._segments():
+            position = self._scanned.get(path, 0)
+            try:
+                segment = open(path, "rb")
+            except FileNotFoundError:
+                continue
+            with segment:
+                size = os.fstat(segment.fileno()).st_size
+                segment.seek(position)
+                while position + _HEADER.size <= size:
+                    digest, length = _HEADER.unpack(segment.read(_HEADER.size))
+                    if position + _HEADER.size + length > size:
+                        # Record still being written, read it on a later scan
+                        break
+                    self._index.setdefault(digest, (path, position + _HEADER.size, length))
+                    position += _HEADER.size + length
+                    segment.seek(position)
+            self._scanned[path] = position
+
+    def get(self, ref):
+        """JPEG bytes for a reference, or None if it is unknown"""
+        digest = bytes.fromhex(ref)
+        with self._lock:
+            data = self._cache.get(digest)
+            if data is not None:
+                self._cache.move_to_end(digest)
+                return data
+            location = self._index.get(digest)
+            if location is None:
+                self._refresh()
+                location = self._index.get(digest)
+        if location is None:
+            return None
+        path, offset, length = location
+        try:
+            with open(path, "rb") as segment:
+                segment.seek(offset)
+                data = segment.read(length)
+        except FileNotFoundError:
+            # The segment was removed by retention
+            with self._lock:
+                self._forget(path)
+            return None
+        with self._lock:
+            self._cache[digest] = data
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return data
+
+    def close(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+def get_snapshot_store():
+    """Process-wide store in the default directory"""
+    global _default_store
+    # Forked worker processes must not append to their parent's segment
+    if _default_store is None or _default_store.pid != os.getpid():
+        with _default_lock:
+            if _default_store is None or _default_store.pid != os.getpid():
+                _default_store = SnapshotStore()
+    return _default_store
+
+
+def load_snapshot(entry, store=None):
+    """JPEG bytes of the snapshot for an emotion_data entry, or None"""
+    ref = entry.get("image_ref")
+    if ref:
+        return (store or get_snapshot_store()).get(ref)
+    # Entries recorded before the snapshot store carried base64 JPEGs inline
+    if entry.get("image"):
+        return base64.b64decode(entry["image"])
+    return None
@@ -0,0 +1,58 @@
+import os
+import time
+
+import numpy as np
+
+
+WHISPER_MODEL = os.environ.get("WHISPER_MODEL", "base")
+# Whisper models take 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+_model = None
+_load_ms = None
+
+
+def load_model(name=WHISPER_MODEL):
+    """This process's Whisper model, loaded on first use and kept resident"""
+    global _model, _load_ms
+    if _model is None:
+        from faster_whisper import WhisperModel
+
+        start = time.perf_counter()
+        # int8 weights run several times faster than real time on a laptop CPU
+        _model = WhisperModel(name, device="cpu", compute_type="int8")
+        _load_ms = (time.perf_counter() - start) * 1000
+    return _model
+
+
+def warm_up():
+    """Load the model so the first answer is not slowed down"""
+    load_model()
+
+
+def to_model_audio(audio, sample_rate):
+    """Mono float32 samples in [-1, 1] at SAMPLE_RATE from recorded int16 or float audio"""
+    audio = np.asarray(audio)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    if audio.dtype.kind == "i":
+        audio = audio.astype(np.float32) / np.iinfo(audio.dtype).max
+    audio = audio.astype(np.float32, copy=False)
+    if sample_rate != SAMPLE_RATE and len(audio):
+        positions = np.arange(int(len(audio) * SAMPLE_RATE / sample_rate)) * (sample_rate / SAMPLE_RATE)
+        audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+    return audio
+
+
+def build_transcript(text, audio_s, inference_ms):
+    return {"text": text, "audio_s": audio_s, "inference_ms": inference_ms, "load_ms": _load_ms}
+
+
+def transcribe(audio, sample_rate=SAMPLE_RATE):
+    """Transcript of one recorded answer, with its length in seconds and the inference time"""
+    start = time.perf_counter()
+    samples = to_model_audio(audio, sample_rate)
+    segments, _ = load_model().transcribe(samples, beam_size=1, vad_filter=True)
+    # Segments are decoded lazily, joining them runs the model
+    text = " ".join(segment.text.strip() for segment in segments)
+    return build_transcript(text, len(samples) / SAMPLE_RATE, (time.perf_counter() - start) * 1000)
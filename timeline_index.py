@@ -0,0 +1,128 @@
+import numpy as np
+
+
+class TimelineIndex:
+    """Timestamp-sorted, array-backed view of emotion_data for the timeline navigator
+
+    Nearest-moment and range lookups are binary searches over the timestamp
+    array. Prefix sums answer windowed stress aggregations in O(log n). The
+    index stores sample positions rather than the samples themselves. New
+    samples are appended with amortised growth when they arrive in time order,
+    which is the normal case while an interview is recorded.
+    """
+
+    def __init__(self, entries=None):
+        self._size = 0
+        self._timestamps = np.empty(16, dtype=np.int64)
+        self._order = np.empty(16, dtype=np.int64)
+        self._stress_sum = np.zeros(17, dtype=np.float64)
+        self._peaks_sum = np.zeros(17, dtype=np.int64)
+        self._relaxed_sum = np.zeros(17, dtype=np.int64)
+        self._source = None
+        self._synced = 0
+        if entries is not None:
+            self.sync(entries)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def timestamps(self):
+        return self._timestamps[:self._size]
+
+    def _reserve(self, size):
+        capacity = len(self._timestamps)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        self._timestamps = np.resize(self._timestamps, capacity)
+        self._order = np.resize(self._order, capacity)
+        for name in ("_stress_sum", "_peaks_sum", "_relaxed_sum"):
+            setattr(self, name, np.resize(getattr(self, name), capacity + 1))
+
+    def _append_sorted(self, positions, timestamps, stress):
+        start = self._size
+        end = start + len(positions)
+        self._reserve(end)
+        self._timestamps[start:end] = timestamps
+        self._order[start:end] = positions
+        self._stress_sum[start + 1:end + 1] = self._stress_sum[start] + np.cumsum(stress)
+        self._peaks_sum[start + 1:end + 1] = self._peaks_sum[start] + np.cumsum(stress == 3)
+        self._relaxed_sum[start + 1:end + 1] = self._relaxed_sum[start] + np.cumsum(stress == 1)
+        self._size = end
+
+    def sync(self, entries):
+        """Bring the index up to date with emotion_data, only new samples are processed
+
+        Accepts the emotion_data list of dicts or an EmotionSeries, whose
+        columns are read directly.
+        """
+        if entries is not self._source or len(entries) < self._synced:
+            self._source = entries
+            self._synced = 0
+            self._size = 0
+        start, end = self._synced, len(entries)
+        if start == end:
+            return self
+        if hasattr(entries, "stress_values"):
+            timestamps = entries.timestamps[start:end]
+            stress = entries.stress_values[start:end].astype(np.float64)
+        else:
+            new = entries[start:end]
+            timestamps = np.array([e["timestamp"] for e in new], dtype=np.int64)
+            stress = np.array([e.get("stress_value", 0) for e in new], dtype=np.float64)
+        positions = np.arange(start, end, dtype=np.int64)
+        self._synced = end
+
+        in_order = bool(np.all(timestamps[1:] >= timestamps[:-1]))
+        if in_order and (self._size == 0 or timestamps[0] >= self._timestamps[self._size - 1]):
+            self._append_sorted(positions, timestamps, stress)
+        else:
+            # Out-of-order samples are rare, re-sort everything once
+            all_positions = np.concatenate([self._order[:self._size], positions])
+            all_timestamps = np.concatenate([self.timestamps, timestamps])
+            all_stress = np.concatenate([np.diff(self._stress_sum[:self._size + 1]), stress])
+            order = np.argsort(all_timestamps, kind="stable")
+            self._size = 0
+            self._append_sorted(all_positions[order], all_timestamps[order], all_stress[order])
+        return self
+
+    def nearest(self, timestamp):
+        """Sample closest to a timestamp, the earlier one on a tie"""
+        if not self._size:
+            return None
+        timestamps = self.timestamps
+        position = int(np.searchsorted(timestamps, timestamp))
+        if position == self._size:
+            position -= 1
+        elif position > 0 and timestamp - timestamps[position - 1] <= timestamps[position] - timestamp:
+            position -= 1
+        return self._source[int(self._order[position])]
+
+    def _bounds(self, start, end):
+        timestamps = self.timestamps
+        return (int(np.searchsorted(timestamps, start, side="left")),
+                int(np.searchsorted(timestamps, end, side="right")))
+
+    def between(self, start, end):
+        """Samples with start <= timestamp <= end, in time order"""
+        first, last = self._bounds(start, end)
+        return [self._source[int(i)] for i in self._order[first:last]]
+
+    def window_stats(self, start, end):
+        """Sample count, mean stress, stress peaks and relaxed moments within [start, end]"""
+        first, last = self._bounds(start, end)
+        count = last - first
+        return {
+            "count": count,
+            "mean_stress": float((self._stress_sum[last] - self._stress_sum[first]) / count) if count else None,
+            "stress_peaks": int(self._peaks_sum[last] - self._peaks_sum[first]),
+            "relaxed_moments": int(self._relaxed_sum[last] - self._relaxed_sum[first]),
+        }
+
+    def time_range(self):
+        """First and last timestamp, or None for an empty timeline"""
+        if not self._size:
+            return None
+        return int(self._timestamps[0]), int(self._timestamps[self._size - 1])
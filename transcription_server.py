@@ -0,0 +1,101 @@
+"""Long-lived local speech-to-text service
+
+Loads the Whisper model once per worker process and transcribes recorded
+answers sent by any number of candidate sessions over a local socket.
+
+Usage: python transcription_server.py --workers 2 --port 6020
+"""
+import argparse
+import collections
+import os
+
+from local_service import LocalClient, LocalServer, load_authkey, percentiles
+from speech_to_text import SAMPLE_RATE, transcribe, warm_up
+
+
+DEFAULT_ADDRESS = ("127.0.0.1", int(os.environ.get("TRANSCRIPTION_SERVER_PORT", 6020)))
+AUTHKEY_ENV = "TRANSCRIPTION_SERVER_AUTHKEY"
+
+
+class TranscriptionServer(LocalServer):
+    """Transcribes recorded answers on a warm process pool, each worker holding its own copy of the model
+
+    Up to workers answers are transcribed at once and at most queue_size are
+    admitted, see LocalServer. stats() separates the one-off model load time
+    from the per-answer latency.
+    """
+
+    name = "Transcription server"
+    authkey_env = AUTHKEY_ENV
+    operations = ("transcribe", "stats")
+
+    def __init__(self, address=DEFAULT_ADDRESS, authkey=None, workers=2, queue_size=16,
+                 queue_timeout=10.0, transcribe_fn=transcribe, initializer=warm_up):
+        super().__init__(address, authkey, workers, queue_size, queue_timeout, initializer)
+        self.transcribe_fn = transcribe_fn
+        self._inference = collections.deque(maxlen=10000)
+        self._counts.update({"answers": 0, "audio_s": 0.0, "inference_s": 0.0})
+
+    def transcribe(self, audio, sample_rate=SAMPLE_RATE):
+        result, latency_ms = self._run(self.transcribe_fn, audio, sample_rate)
+        with self._stats_lock:
+            self._counts["answers"] += 1
+            self._counts["audio_s"] += result["audio_s"]
+            self._counts["inference_s"] += result["inference_ms"] / 1000
+            self._latencies.append(latency_ms)
+            self._inference.append(result["inference_ms"])
+        return result
+
+    def stats(self):
+        """Model load time, answer counts and per-answer latency percentiles in milliseconds
+
+        latency covers queueing and the socket round trip on top of inference.
+        realtime_factor is inference time over audio length, below 1 keeps
+        up with speech.
+        """
+        stats = super().stats()
+        with self._stats_lock:
+            stats["latency"] = percentiles(list(self._latencies))
+            stats["inference"] = percentiles(list(self._inference))
+        stats["realtime_factor"] = stats["inference_s"] / stats["audio_s"] if stats["audio_s"] else None
+        return stats
+
+
+class TranscriptionClient(LocalClient):
+    """Connection to a running TranscriptionServer, one per candidate session"""
+
+    authkey_env = AUTHKEY_ENV
+
+    def __init__(self, address=DEFAULT_ADDRESS, authkey=None):
+        super().__init__(address, authkey)
+
+    def transcribe(self, audio, sample_rate=SAMPLE_RATE):
+        """Transcript of a recorded answer (int16 or float samples) as a dict with text, audio_s and inference_ms"""
+        return self._call("transcribe", (audio, sample_rate))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Whisper speech-to-text server")
+    parser.add_argument("--host", default=DEFAULT_ADDRESS[0])
+    parser.add_argument("--port", type=int, default=DEFAULT_ADDRESS[1])
+    parser.add_argument("--workers", type=int, default=2, help="model processes, each holding its own copy of the model")
+    parser.add_argument("--queue-size", type=int, default=16, help="answers admitted at once before callers wait")
+    args = parser.parse_args()
+    try:
+        authkey = load_authkey(AUTHKEY_ENV)
+    except RuntimeError as e:
+        parser.error(str(e))
+
+    server = TranscriptionServer((args.host, args.port), authkey, workers=args.workers, queue_size=args.queue_size)
+    print(f"Loading the speech model in {args.workers} worker(s)...")
+    print(f"Loaded in {server.warm() / 1000:.1f}s, transcription server listening on {args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()